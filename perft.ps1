@@ -0,0 +1,3 @@
+Set-Location .\src
+python perft.py @args
+Set-Location ..
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+# (row, column) offsets, row 0 is the top of the board
+STRAIGHT_DIRECTIONS = {
+    "north": (-1, 0),
+    "south": (1, 0),
+    "east": (0, 1),
+    "west": (0, -1),
+}
+DIAGONAL_DIRECTIONS = {
+    "northEast": (-1, 1),
+    "northWest": (-1, -1),
+    "southEast": (1, 1),
+    "southWest": (1, -1),
+}
+DIRECTIONS = {**STRAIGHT_DIRECTIONS, **DIAGONAL_DIRECTIONS}
+
+# directions in which tile numbers increase, so the nearest blocker on a ray is
+# its lowest set bit rather than its highest
+INCREASING_DIRECTIONS = ("south", "east", "southEast", "southWest")
+
+KNIGHT_OFFSETS = [
+    (-2, 1),
+    (-2, -1),
+    (2, 1),
+    (2, -1),
+    (-1, -2),
+    (1, -2),
+    (-1, 2),
+    (1, 2),
+]
+KING_OFFSETS = [offset for offset in DIRECTIONS.values()]
+PAWN_FORWARD_ROW = {"white": -1, "black": 1}
+
+
+class AttackTables:
+    """
+    AttackTables class holds every leaper attack and slider ray for one board
+    size, indexed by tile number. Each entry is a bitboard. Tables should be
+    fetched through AttackTablesInstance so that they are only computed once per
+    board side length.
+    """
+
+    def __init__(self, sideLength: int) -> None:
+        self.sideLength = sideLength
+        self.numberOfTiles = sideLength * sideLength
+
+        self.knightAttacks: list[int] = [
+            self._leaperAttacks(number, KNIGHT_OFFSETS)
+            for number in range(0, self.numberOfTiles)
+        ]
+        self.kingAttacks: list[int] = [
+            self._leaperAttacks(number, KING_OFFSETS)
+            for number in range(0, self.numberOfTiles)
+        ]
+
+        self.pawnAttacks: dict[str, list[int]] = {}
+        self.pawnPushes: dict[str, list[int]] = {}
+        self.pawnDoublePushes: dict[str, list[int]] = {}
+        for team, forward in PAWN_FORWARD_ROW.items():
+            self.pawnAttacks[team] = [
+                self._leaperAttacks(number, [(forward, 1), (forward, -1)])
+                for number in range(0, self.numberOfTiles)
+            ]
+            self.pawnPushes[team] = [
+                self._leaperAttacks(number, [(forward, 0)])
+                for number in range(0, self.numberOfTiles)
+            ]
+            self.pawnDoublePushes[team] = [
+                self._leaperAttacks(number, [(forward * 2, 0)])
+                for number in range(0, self.numberOfTiles)
+            ]
+
+        self.rays: dict[str, list[int]] = {
+            direction: [
+                self._ray(number, offset) for number in range(0, self.numberOfTiles)
+            ]
+            for direction, offset in DIRECTIONS.items()
+        }
+
+    def _tileNumber(self, row: int, column: int) -> int | None:
+        if 0 <= row < self.sideLength and 0 <= column < self.sideLength:
+            return row * self.sideLength + column
+        return None
+
+    def _leaperAttacks(self, number: int, offsets: list[tuple]) -> int:
+        row, column = divmod(number, self.sideLength)
+        attacks = 0
+        for rowOffset, columnOffset in offsets:
+            target = self._tileNumber(row + rowOffset, column + columnOffset)
+            if target is not None:
+                attacks |= 1 << target
+        return attacks
+
+    def _ray(self, number: int, offset: tuple) -> int:
+        row, column = divmod(number, self.sideLength)
+        ray = 0
+        target = self._tileNumber(row + offset[0], column + offset[1])
+        while target is not None:
+            ray |= 1 << target
+            row, column = divmod(target, self.sideLength)
+            target = self._tileNumber(row + offset[0], column + offset[1])
+        return ray
+
+    def getRayAttacks(self, number: int, direction: str, occupied: int) -> int:
+        """
+        Return the tiles along a ray up to and including the first occupied tile.
+        """
+        ray = self.rays[direction][number]
+        blockers = ray & occupied
+        if not blockers:
+            return ray
+        if direction in INCREASING_DIRECTIONS:
+            blocker = (blockers & -blockers).bit_length() - 1
+        else:
+            blocker = blockers.bit_length() - 1
+        return ray ^ self.rays[direction][blocker]
+
+
+class AttackTablesInstance:
+    """
+    Declare a single instance of the AttackTables class per board side length for
+    the entire application. Uses Singleton design pattern.
+    """
+
+    objs: dict[int, AttackTables] = {}
+
+    @staticmethod
+    def getInstance(sideLength: int) -> AttackTables:
+        if sideLength not in AttackTablesInstance.objs:
+            AttackTablesInstance.objs[sideLength] = AttackTables(sideLength)
+        return AttackTablesInstance.objs[sideLength]
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .AttackTables import (
+    DIAGONAL_DIRECTIONS,
+    DIRECTIONS,
+    STRAIGHT_DIRECTIONS,
+    AttackTablesInstance,
+)
+from .constants.constants import MOBILITY_WEIGHT, PIECE_TYPES, POINTS_VALUES
+from .EvaluationParameters import getDefaultPieceSquareTables
+from .Position import Position
+from .schemas.PositionSetup import PositionSetup
+
+# piece codes of a position array, positive for white and negative for black
+EMPTY = 0
+PIECE_CODES = {pieceType: code for code, pieceType in enumerate(PIECE_TYPES, 1)}
+TEAM_SIGNS = {"white": 1, "black": -1}
+# (team, pieceType) of a Position's squares -> piece code
+SQUARE_CODES = {
+    None: EMPTY,
+    **{
+        (team, pieceType): sign * code
+        for team, sign in TEAM_SIGNS.items()
+        for pieceType, code in PIECE_CODES.items()
+    },
+}
+
+# centipawns lost for every tile next to a king the opponent attacks
+KING_SAFETY_WEIGHT = 5
+
+LEAPER_TYPES = ("Knight", "King", "Pawn")
+# queens slide along both sets of directions
+SLIDER_DIRECTIONS = (
+    (("Rook", "Queen"), STRAIGHT_DIRECTIONS),
+    (("Bishop", "Queen"), DIAGONAL_DIRECTIONS),
+)
+
+
+def encodePosition(position: Position) -> np.ndarray:
+    """
+    Return a position as an array of piece codes, one per tile.
+    """
+    codes = np.zeros(position.numberOfTiles, dtype=np.int8)
+    for number in position.iterateBits(position.getOccupied()):
+        team, pieceType = position.squares[number]
+        codes[number] = TEAM_SIGNS[team] * PIECE_CODES[pieceType]
+    return codes
+
+
+def encodePositions(positions: list[Position]) -> np.ndarray:
+    """
+    Return positions of one board size as an (N, tiles) array of piece codes.
+    """
+    if not positions:
+        return np.zeros((0, 0), dtype=np.int8)
+    return np.stack([encodePosition(position) for position in positions])
+
+
+def encodePositionSetups(setups: list[PositionSetup]) -> np.ndarray:
+    """
+    Return position setups of one board size, as read from position strings,
+    as an (N, tiles) array of piece codes without building their positions.
+    """
+    if not setups:
+        return np.zeros((0, 0), dtype=np.int8)
+    return np.array(
+        [[SQUARE_CODES[occupant] for occupant in setup.squares] for setup in setups],
+        dtype=np.int8,
+    )
+
+
+class BatchEvaluator:
+    """
+    BatchEvaluator class scores many positions of one board size at once with
+    NumPy, for analysis and tuning where positions are counted in thousands.
+
+    Positions are given as an (N, tiles) int8 array of piece codes, see
+    encodePositions(). Each position is scored in centipawns by material,
+    piece-square tables, the number of tiles each team attacks and the
+    opponent's attacks on the tiles around each king. Piece values default to
+    the pieces' points values. Attacks follow Position's rules, so sliders see
+    through the opponent's king. With the king safety weight at 0 and the same
+    piece values and tables, scores are the same as Engine.evaluate().
+    """
+
+    def __init__(
+        self,
+        sideLength: int,
+        pieceValues: dict[str, int] | None = None,
+        pieceSquareTables: dict[str, list[int]] | None = None,
+        mobilityWeight: int = MOBILITY_WEIGHT,
+        kingSafetyWeight: int = KING_SAFETY_WEIGHT,
+    ) -> None:
+        self.sideLength = sideLength
+        self.numberOfTiles = sideLength * sideLength
+        self.mobilityWeight = mobilityWeight
+        self.kingSafetyWeight = kingSafetyWeight
+        tables = AttackTablesInstance.getInstance(sideLength)
+
+        # centipawns per piece code, indexed by code + 6
+        if pieceValues is None:
+            pieceValues = {
+                pieceType: value * 100 for pieceType, value in POINTS_VALUES.items()
+            }
+        self.materialValues = np.zeros(2 * len(PIECE_TYPES) + 1, dtype=np.int32)
+        for pieceType, code in PIECE_CODES.items():
+            value = pieceValues.get(pieceType, 0)
+            self.materialValues[len(PIECE_TYPES) + code] = value
+            self.materialValues[len(PIECE_TYPES) - code] = -value
+
+        # piece-square tables are written from white's side of the board, and
+        # black's are flipped vertically
+        if pieceSquareTables is None:
+            pieceSquareTables = getDefaultPieceSquareTables(sideLength)
+        self.pieceSquareTables = np.zeros(
+            (2 * len(PIECE_TYPES) + 1, self.numberOfTiles), dtype=np.int32
+        )
+        flippedTiles = self._getVerticallyFlippedTiles()
+        for pieceType, table in pieceSquareTables.items():
+            table = np.asarray(table, dtype=np.int32)
+            code = PIECE_CODES[pieceType]
+            self.pieceSquareTables[len(PIECE_TYPES) + code] = table
+            self.pieceSquareTables[len(PIECE_TYPES) - code] = -table[flippedTiles]
+
+        # leaper attacks as matrices with a row per tile of each LEAPER_TYPES
+        # piece, holding the tiles a piece there attacks. Float matrices let
+        # NumPy hand the products to BLAS.
+        self.leaperAttacks = {
+            team: np.concatenate(
+                [
+                    self._toMatrix(tables.knightAttacks),
+                    self._toMatrix(tables.kingAttacks),
+                    self._toMatrix(tables.pawnAttacks[team]),
+                ]
+            )
+            for team in TEAM_SIGNS
+        }
+        self.kingZones = self._toMatrix(tables.kingAttacks) + np.eye(
+            self.numberOfTiles, dtype=np.float32
+        )
+        # direction -> the tile each tile is stepped into from, or the padding
+        # column numberOfTiles off the board
+        self.rayPredecessors = {
+            direction: self._findRayPredecessors(offset)
+            for direction, offset in DIRECTIONS.items()
+        }
+
+    def _getVerticallyFlippedTiles(self) -> np.ndarray:
+        rows, columns = np.divmod(np.arange(self.numberOfTiles), self.sideLength)
+        return (self.sideLength - 1 - rows) * self.sideLength + columns
+
+    def _toMatrix(self, bitboards: list[int]) -> np.ndarray:
+        matrix = np.zeros((self.numberOfTiles, self.numberOfTiles), dtype=np.float32)
+        for number, bitboard in enumerate(bitboards):
+            for target in Position.iterateBits(bitboard):
+                matrix[number, target] = 1
+        return matrix
+
+    def _findRayPredecessors(self, offset: tuple) -> np.ndarray:
+        predecessors = np.full(self.numberOfTiles, self.numberOfTiles, dtype=np.intp)
+        for number in range(0, self.numberOfTiles):
+            row, column = divmod(number, self.sideLength)
+            fromRow, fromColumn = row - offset[0], column - offset[1]
+            if 0 <= fromRow < self.sideLength and 0 <= fromColumn < self.sideLength:
+                predecessors[number] = fromRow * self.sideLength + fromColumn
+        return predecessors
+
+    def getAttackedTiles(self, codes: np.ndarray, team: str) -> np.ndarray:
+        """
+        Return an (N, tiles) boolean array of the tiles a team attacks in every
+        position.
+        """
+        sign = TEAM_SIGNS[team]
+        positionCount = codes.shape[0]
+        leapers = np.concatenate(
+            [codes == sign * PIECE_CODES[pieceType] for pieceType in LEAPER_TYPES],
+            axis=1,
+        )
+        attacked = (leapers.astype(np.float32) @ self.leaperAttacks[team]) > 0
+
+        # sliders see through the opponent's king
+        blockers = (codes != EMPTY) & (codes != -sign * PIECE_CODES["King"])
+        # the last column is a padding tile off the board that rays step in from
+        frontier = np.zeros((positionCount, self.numberOfTiles + 1), dtype=bool)
+        for pieceTypes, directions in SLIDER_DIRECTIONS:
+            sliders = np.logical_or.reduce(
+                [codes == sign * PIECE_CODES[pieceType] for pieceType in pieceTypes]
+            )
+            if not sliders.any():
+                continue
+            for direction in directions:
+                predecessors = self.rayPredecessors[direction]
+                frontier[:, : self.numberOfTiles] = sliders
+                for _ in range(1, self.sideLength):
+                    stepped = frontier[:, predecessors]
+                    if not stepped.any():
+                        break
+                    attacked |= stepped
+                    np.logical_and(
+                        stepped, ~blockers, out=frontier[:, : self.numberOfTiles]
+                    )
+        return attacked
+
+    def evaluate(
+        self, codes: np.ndarray, teams: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Score an (N, tiles) array of positions in centipawns from white's point
+        of view, or from the point of view of each position's team when teams
+        is given as an array of 1 for white and -1 for black.
+        """
+        codes = np.asarray(codes, dtype=np.int8)
+        if codes.ndim == 1:
+            codes = codes[np.newaxis, :]
+        indices = codes.astype(np.intp) + len(PIECE_TYPES)
+
+        scores = self.materialValues[indices].sum(axis=1, dtype=np.int32)
+        scores += self.pieceSquareTables[indices, np.arange(self.numberOfTiles)].sum(
+            axis=1, dtype=np.int32
+        )
+
+        attackedTiles = {
+            team: self.getAttackedTiles(codes, team) for team in TEAM_SIGNS
+        }
+        for team, sign in TEAM_SIGNS.items():
+            scores += sign * self.mobilityWeight * attackedTiles[team].sum(axis=1)
+            if self.kingSafetyWeight:
+                kings = (codes == sign * PIECE_CODES["King"]).astype(np.float32)
+                kingZones = (kings @ self.kingZones) > 0
+                opponentTeam = "black" if team == "white" else "white"
+                threatenedTiles = (kingZones & attackedTiles[opponentTeam]).sum(axis=1)
+                scores -= sign * self.kingSafetyWeight * threatenedTiles
+
+        if teams is not None:
+            scores *= np.asarray(teams, dtype=np.int32)
+        return scores.astype(np.int32)
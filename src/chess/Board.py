@@ -1,16 +1,22 @@
-from typing import Type
+from math import sqrt
+from typing import Literal, Type
 
 from .Bishop import Bishop
-from .constants.BoardConfigSectionKeys import BoardConfigSectionKeys as cfgKeys
+from .constants.constants import SAVE_FILE, TEAMS
 from .engine.SaveLoadMixin import SaveLoadMixin
 from .King import King
 from .Knight import Knight
+from .MoveGenerator import ONGOING, REPETITION, MoveGenerator
 from .Pawn import Pawn
 from .Piece import Piece, TPiece
 from .Player import Player
+from .Position import Position
 from .Queen import Queen
 from .Rook import Rook
+from .SaveFile import writeSaveFile
 from .schemas.MoveRecord import MoveRecord
+from .schemas.SaveData import SaveData
+from .schemas.UndoRecord import UndoRecord
 from .Tile import Tile
 
 
@@ -18,6 +24,7 @@ class Board(SaveLoadMixin):
     def __init__(self, players: dict[str, Player] | None = None) -> None:
         self.tiles = None
         self.pieces = None
+        self.position: Position | None = None
         self.gameWon: bool = False
         self.selectedPiece = None
         self.selectedTile = None
@@ -26,11 +33,34 @@ class Board(SaveLoadMixin):
         self.players: dict[str, Player] | None = players
         self.checkmate: bool = False
         self.moveStack: list = []
+        # (halfmove clock, fullmove number) of the position the move stack starts from
+        self.startingMoveCounters: tuple[int, int] = (0, 1)
+        # hash of every position reached this game, and how often each occurred
+        self.hashHistory: list[int] = []
+        self.hashCounts: dict[int, int] = {}
 
     def setMoveStack(self, moveStack: list[dict]):
         for index in range(0, len(moveStack)):
             self.moveStack.append(MoveRecord(**moveStack[index]))
 
+    def setStartingMoveCounters(self, halfmoveClock: int, fullmoveNumber: int):
+        self.startingMoveCounters = (halfmoveClock, fullmoveNumber)
+
+    def getMoveCounters(self) -> tuple[int, int]:
+        """
+        Return the halfmove clock, moves since the last capture or pawn move,
+        and the fullmove number, counted up after every black move.
+        """
+        halfmoveClock, fullmoveNumber = self.startingMoveCounters
+        for move in self.moveStack:
+            if move.otherPiece is not None or move.piece.type == "Pawn":
+                halfmoveClock = 0
+            else:
+                halfmoveClock += 1
+            if move.piece.getTeam() == "black":
+                fullmoveNumber += 1
+        return halfmoveClock, fullmoveNumber
+
     def addMoveToMoveStack(self, moveDict: dict):
         self.moveStack.append(MoveRecord(**moveDict))
 
@@ -38,6 +68,186 @@ class Board(SaveLoadMixin):
         if self.moveStack:
             return self.moveStack.pop(-1)
 
+    def makeMove(self, piece: Piece, newSpace: Tile) -> UndoRecord:
+        """
+        Move a piece on the board model, capturing any piece on newSpace.
+        Highlights, sprites and sprite groups are left alone, so the move can be
+        reversed cheaply with unmakeMove().
+        """
+        oldSpace: Tile = piece.getSpace()
+        capturedPiece: Piece | None = newSpace.getPiece()
+        undoRecord = UndoRecord(
+            piece=piece,
+            capturedPiece=capturedPiece,
+            oldSpace=oldSpace,
+            newSpace=newSpace,
+            timesMoved=piece.timesMoved,
+            claimedPieces=piece.claimedPieces,
+            wasOnHomeSpace=piece.isOnHomeSpace(),
+            capturedWasOnHomeSpace=(
+                capturedPiece.isOnHomeSpace() if capturedPiece is not None else False
+            ),
+        )
+
+        self.position.makeMove(oldSpace.getNumber(), newSpace.getNumber())
+        oldSpace.removePiece(syncPosition=False)
+        if capturedPiece is not None:
+            newSpace.removePiece(syncPosition=False)
+            capturedPiece.takeOffBoard()
+            piece.setClaimedPieces(piece.claimedPieces + 1)
+        piece.setSpace(newSpace)
+        newSpace.placePiece(piece, syncPosition=False)
+        piece.setTimesMoved(piece.timesMoved + 1)
+
+        return undoRecord
+
+    def unmakeMove(self, undoRecord: UndoRecord):
+        piece = undoRecord.piece
+        capturedPiece = undoRecord.capturedPiece
+        oldSpace = undoRecord.oldSpace
+        newSpace = undoRecord.newSpace
+
+        self.position.unmakeMove(
+            (
+                oldSpace.getNumber(),
+                newSpace.getNumber(),
+                (
+                    (capturedPiece.getTeam(), capturedPiece.type)
+                    if capturedPiece is not None
+                    else None
+                ),
+                undoRecord.wasOnHomeSpace,
+                undoRecord.capturedWasOnHomeSpace,
+            )
+        )
+        newSpace.removePiece(syncPosition=False)
+        piece.setSpace(oldSpace)
+        oldSpace.placePiece(piece, syncPosition=False)
+        if capturedPiece is not None:
+            capturedPiece.setSpace(newSpace)
+            newSpace.placePiece(capturedPiece, syncPosition=False)
+        piece.setTimesMoved(undoRecord.timesMoved)
+        piece.setClaimedPieces(undoRecord.claimedPieces)
+
+    def undoLastMove(self) -> MoveRecord | None:
+        """
+        Pop the last move off the move stack and reverse it on the board model.
+        """
+        lastMove = self.popMoveFromMoveStack()
+        if lastMove is None:
+            return None
+
+        piece: Piece = lastMove.piece
+        capturedPiece: Piece | None = lastMove.otherPiece
+        self._forgetLastPosition()
+        self.unmakeMove(
+            UndoRecord(
+                piece=piece,
+                capturedPiece=capturedPiece,
+                oldSpace=lastMove.oldSpace,
+                newSpace=lastMove.newSpace,
+                timesMoved=piece.timesMoved - 1,
+                claimedPieces=(
+                    piece.claimedPieces - 1
+                    if capturedPiece is not None
+                    else piece.claimedPieces
+                ),
+                wasOnHomeSpace=piece.getHomeSpace() is lastMove.oldSpace,
+                capturedWasOnHomeSpace=(
+                    capturedPiece is not None
+                    and capturedPiece.getHomeSpace() is lastMove.newSpace
+                ),
+            )
+        )
+        if not self.hashHistory:
+            # undoing past the position the history was started from
+            self.resetHashHistory(piece.getTeam())
+        return lastMove
+
+    def commitMove(self, piece: Piece, newSpace: Tile) -> MoveRecord:
+        """
+        Play a legal move for the current player and hand the turn over. The
+        move goes on the move stack, a capture scores its points, and the next
+        player's potential tiles and check are worked out.
+        """
+        otherPiece: Piece | None = newSpace.getPiece()
+        oldSpace: Tile = piece.getSpace()
+        self.makeMove(piece, newSpace)
+        self.addMoveToMoveStack(
+            {
+                "piece": piece,
+                "otherPiece": otherPiece,
+                "oldSpace": oldSpace,
+                "newSpace": newSpace,
+            }
+        )
+        if otherPiece is not None:
+            self.getCurrentPlayer().incrementPoints(otherPiece.getPointsValue())
+        self.changeCurrentPlayer()
+        self.recordPosition()
+        self.deselectPiece()
+        self.makeAllPiecesFindPotentialTiles()
+        self.setIsCheck(self.checkIsThereCheck())
+        return self.moveStack[-1]
+
+    def takeBackMove(self) -> MoveRecord | None:
+        """
+        Undo the last move, taking back the points of its capture, and hand the
+        turn back to the player who made it.
+        """
+        lastMove = self.undoLastMove()
+        if lastMove is None:
+            return None
+        if lastMove.otherPiece is not None:
+            self.getOtherPlayer().decreasePoints(lastMove.otherPiece.getPointsValue())
+        self.changeCurrentPlayer()
+        self.deselectPiece()
+        self.makeAllPiecesFindPotentialTiles()
+        self.setIsCheck(self.checkIsThereCheck())
+        return lastMove
+
+    def getHash(self, team: Literal["black", "white"] | None = None) -> int:
+        """
+        Return the Zobrist hash of the position with the given team to move,
+        or the current player if no team is given.
+        """
+        if team is None:
+            team = self.getCurrentPlayer().getTeam()
+        return self.position.hash ^ self.position.zobristKeys.getSideToMoveKey(team)
+
+    def resetHashHistory(self, team: Literal["black", "white"] | None = None):
+        """
+        Start the repetition history from the current position.
+        """
+        self.hashHistory = []
+        self.hashCounts = {}
+        self.recordPosition(team)
+
+    def recordPosition(self, team: Literal["black", "white"] | None = None):
+        """
+        Add the current position to the repetition history. To be called after
+        a move has been committed and the current player changed.
+        """
+        positionHash = self.getHash(team)
+        self.hashHistory.append(positionHash)
+        self.hashCounts[positionHash] = self.hashCounts.get(positionHash, 0) + 1
+
+    def _forgetLastPosition(self):
+        if self.hashHistory:
+            positionHash = self.hashHistory.pop(-1)
+            self.hashCounts[positionHash] -= 1
+            if not self.hashCounts[positionHash]:
+                del self.hashCounts[positionHash]
+
+    def getRepetitionCount(self) -> int:
+        """
+        Return how many times the current position has occurred this game.
+        """
+        return self.hashCounts.get(self.getHash(), 0)
+
+    def isThreefoldRepetition(self) -> bool:
+        return self.getRepetitionCount() >= 3
+
     def isATileSelected(self) -> bool:
         if self.selectedTile is not None:
             return True
@@ -83,16 +293,38 @@ class Board(SaveLoadMixin):
 
     def setPieces(self, pieces: list[Piece]):
         self.pieces = pieces
+        self.updatePosition()
+
+    def updatePosition(self):
+        """
+        Rebuild the bitboard position from the pieces currently on the board.
+        """
+        self.position.clear()
+        self.position.placePieces(
+            [
+                (
+                    piece.getSpace().getNumber(),
+                    piece.getTeam(),
+                    piece.type,
+                    piece.isOnHomeSpace(),
+                )
+                for piece in self.getPiecesOnBoard()
+            ]
+        )
 
     def makeAllPiecesFindPotentialTiles(self):
-        for tile in self.tiles:
-            tile.resetCanBeReachedByAPiece()
-        piecesOnBoard = self.filterForPiecesOnBoard(self._getPiecesNotThisType(King))
-        for piece in piecesOnBoard:
-            piece.findAndRememberPotentialTiles()
-        for _repeat in range(0, 2):
-            for king in self.getKings():
-                king.findAndRememberPotentialTiles()
+        # attacks are kept up to date by the tiles as pieces are placed and removed
+        moveGenerators = {team: MoveGenerator(self.position, team) for team in TEAMS}
+        for piece in self.pieces:
+            piece.findAndRememberPotentialTiles(
+                moveGenerators[piece.getTeam()], self.tiles
+            )
+
+    def getPointsValues(self) -> dict[str, int]:
+        """
+        Return the points value of every type of piece in the game.
+        """
+        return {piece.type: piece.getPointsValue() for piece in self.pieces}
 
     def getCurrentPlayersKing(self) -> King:
         kings: list[King] = self.getKings()
@@ -109,6 +341,18 @@ class Board(SaveLoadMixin):
         king = self.getCurrentPlayersKing()
         return king.getSpace().getCanBeReachedByAPiece(king.getOpponentTeam())
 
+    def getGameStatus(
+        self,
+    ) -> Literal["checkmate", "stalemate", "repetition", "ongoing"]:
+        """
+        Return the status of the game for the current player.
+        """
+        team = self.getCurrentPlayer().getTeam()
+        gameStatus = MoveGenerator(self.position, team).getGameStatus()
+        if gameStatus == ONGOING and self.isThreefoldRepetition():
+            return REPETITION
+        return gameStatus
+
     def isInCheck(self) -> bool:
         return self.checkmate
 
@@ -155,6 +399,9 @@ class Board(SaveLoadMixin):
 
     def setTiles(self, tiles: list[Tile]):
         self.tiles = tiles
+        self.position = Position(int(sqrt(len(tiles))))
+        for tile in tiles:
+            tile.setPosition(self.position)
 
     def highlightPotentialTiles(self):
         if self.isAPieceSelected():
@@ -199,76 +446,30 @@ class Board(SaveLoadMixin):
         self._currentPlayerIndex = (self._currentPlayerIndex + 1) % numberOfPlayers
         self.currentPlayer = players[self._currentPlayerIndex]
 
-    def save(self, **kwargs):
-        config = self.getParser()
-
-        sections = [
-            cfgKeys.TILES,
-            cfgKeys.KNIGHTS,
-            cfgKeys.ROOKS,
-            cfgKeys.PAWNS,
-            cfgKeys.BISHOPS,
-            cfgKeys.QUEENS,
-            cfgKeys.KINGS,
-            cfgKeys.PLAYERS,
-            cfgKeys.BOARD,
-            cfgKeys.MOVES,
-        ]
-        for section in sections:
-            if config.has_section(section):
-                config.remove_section(section)
-            config.add_section(section)
-
-        knights: list[Knight] = self.getKnights()
-        rooks: list[Rook] = self.getRooks()
-        pawns: list[Pawn] = self.getPawns()
-        bishops: list[Bishop] = self.getBishops()
-        queens: list[Queen] = self.getQueens()
-        kings: list[King] = self.getKings()
-
-        config.set(cfgKeys.TILES, "length", len(self.tiles))
-        config.set(cfgKeys.KNIGHTS, "length", len(knights))
-        config.set(cfgKeys.ROOKS, "length", len(rooks))
-        config.set(cfgKeys.PAWNS, "length", len(pawns))
-        config.set(cfgKeys.BISHOPS, "length", len(bishops))
-        config.set(cfgKeys.QUEENS, "length", len(queens))
-        config.set(cfgKeys.KINGS, "length", len(kings))
-        config.set(cfgKeys.PLAYERS, "length", len(self.players.values()))
-        config.set(cfgKeys.BOARD, "length", 1)
-        config.set(cfgKeys.MOVES, "length", len(self.moveStack))
-
-        boardState = {"currentPlayer": str(self.getCurrentPlayer().getName())}
-        config.set(cfgKeys.BOARD, "0", boardState)
-
-        for number in range(0, len(knights)):
-            knights[number].save(number=number)
-        for number in range(0, len(rooks)):
-            rooks[number].save(number=number)
-        for number in range(0, len(pawns)):
-            pawns[number].save(number=number)
-        for number in range(0, len(bishops)):
-            bishops[number].save(number=number)
-        for number in range(0, len(queens)):
-            queens[number].save(number=number)
-        for number in range(0, len(kings)):
-            kings[number].save(number=number)
-
-        for number in range(0, len(self.players.values())):
-            [p for p in self.players.values()][number].save(number=number)
-
-        for number in range(0, len(self.moveStack)):
-            move: MoveRecord = self.moveStack[number]
-            moveRecordState = {
-                "piece": move.piece.getObjectName(),
-                "otherPiece": (
-                    move.otherPiece.getObjectName()
+    def getSaveState(self) -> SaveData:
+        pieces = self.pieces
+        pieceIndices = {id(piece): index for index, piece in enumerate(pieces)}
+        moves = [
+            (
+                pieceIndices[id(move.piece)],
+                (
+                    pieceIndices[id(move.otherPiece)]
                     if move.otherPiece is not None
                     else None
                 ),
-                "oldSpace": move.oldSpace.getNumber(),
-                "newSpace": move.newSpace.getNumber(),
-            }
-            config.set(cfgKeys.MOVES, f"{number}", moveRecordState)
-
-        with open("save.cfg", "w") as configFile:
-            config.write(configFile)
+                move.oldSpace.getNumber(),
+                move.newSpace.getNumber(),
+            )
+            for move in self.moveStack
+        ]
+        return SaveData(
+            numberOfTiles=len(self.tiles),
+            pieces=[piece.getSaveState() for piece in pieces],
+            players=[player.getSaveState() for player in self.players.values()],
+            currentPlayer=self.getCurrentPlayer().getName(),
+            moves=moves,
+            startingMoveCounters=self.startingMoveCounters,
+        )
+
+    def save(self, fileName: str = SAVE_FILE):
+        writeSaveFile(fileName, self.getSaveState())
@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from .Board import Board
 from .Piece import Piece
 from .Player import Player
+from .SaveJournal import replayJournal
 from .Tile import Tile
 
 
@@ -35,6 +36,14 @@ class BoardBuilder(ABC):
     def setMoveStack(self, moveStack: list[dict]):
         pass
 
+    @abstractmethod
+    def setJournalRecords(self, records: list[tuple[int, int, int]]):
+        pass
+
+    @abstractmethod
+    def setMoveCounters(self, halfmoveClock: int, fullmoveNumber: int):
+        pass
+
 
 class StandardBoardBuilder(BoardBuilder):
 
@@ -61,10 +70,19 @@ class StandardBoardBuilder(BoardBuilder):
     def setMoveStack(self, moveStack: list[dict]):
         self.board.setMoveStack(moveStack)
 
+    def setJournalRecords(self, records: list[tuple[int, int, int]]):
+        self.journalRecords = records
+
+    def setMoveCounters(self, halfmoveClock: int, fullmoveNumber: int):
+        self.board.setStartingMoveCounters(halfmoveClock, fullmoveNumber)
+
     def reset(self):
         self.board = Board()
+        self.journalRecords = []
 
     def getBoard(self):
         board = self.board
+        board.resetHashHistory()
+        replayJournal(board, self.journalRecords)
         self.reset()
         return board
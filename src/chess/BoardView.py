@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from .Board import Board
+from .engine.SpriteIndex import SpriteIndex
+from .Piece import Piece
+from .PieceSprite import PieceSprite
+from .TileSprite import TileSprite
+
+
+class BoardView:
+    """
+    BoardView class holds the sprites drawing a board: one per tile, laid out
+    at the given screen coordinates, and one per piece. The board itself knows
+    nothing of them, so it can be created and played without a display.
+    """
+
+    def __init__(self, board: Board, tileCoords: list, tileWidth: float) -> None:
+        self.board = board
+        self.tileCoords = tileCoords
+        self.tileWidth = tileWidth
+        self.tileSprites: list[TileSprite] = []
+        for tile, coord in zip(board.getTiles(), tileCoords):
+            tileSprite = TileSprite(tile)
+            tileSprite.resizeSprite(tileWidth)
+            tileSprite.setCoord(coord)
+            self.tileSprites.append(tileSprite)
+
+        self.pieceSprites: dict[Piece, PieceSprite] = {}
+        for piece in board.getPieces():
+            pieceSprite = PieceSprite(piece, tileCoords)
+            pieceSprite.resizeSprite(tileWidth)
+            if piece.getIsOnBoard():
+                pieceSprite.jumpToSpace()
+            self.pieceSprites[piece] = pieceSprite
+
+    def getSprites(self) -> list:
+        """
+        Return the tile sprites and the sprites of the pieces on the board.
+        """
+        return [
+            *self.tileSprites,
+            *(
+                pieceSprite
+                for piece, pieceSprite in self.pieceSprites.items()
+                if piece.getIsOnBoard()
+            ),
+        ]
+
+    def getPieceSprite(self, piece: Piece) -> PieceSprite:
+        return self.pieceSprites[piece]
+
+    def getSpritesOnTile(self, number: int) -> list:
+        """
+        Return the sprites of a tile and of the piece on it, tile first.
+        """
+        tile = self.board.getTiles()[number]
+        if tile.getPiece() is None:
+            return [self.tileSprites[number]]
+        return [self.tileSprites[number], self.pieceSprites[tile.getPiece()]]
+
+    def createSpriteIndex(self, sprites: list | None = None) -> SpriteIndex:
+        """
+        Return a SpriteIndex finding the board's sprites from the tile grid,
+        along with any other sprites shown with the board.
+        """
+        spriteIndex = SpriteIndex(sprites)
+        spriteIndex.addGrid(
+            self.tileCoords[0],
+            self.tileWidth,
+            int(len(self.tileSprites) ** 0.5),
+            self.getSpritesOnTile,
+        )
+        return spriteIndex
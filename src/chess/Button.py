@@ -42,6 +42,7 @@ class Button(SpriteImage):
             self.hover_image = disableImage
             self.highlighted_image = disableImage
             self.enabled = False
+        self.createStateImages()
 
     def getFileName(self):
         return self.fileName
@@ -1,8 +1,7 @@
-import os.path
-
 from .Button import Button
 from .constants.constants import windowSize
 from .constants.TriggerKey import TriggerKey
+from .SaveFile import findSaveFile
 
 windowCentre = (windowSize[0] * 0.5, windowSize[1] * 0.5)
 
@@ -28,7 +27,7 @@ class ButtonDirector:
             ]
         )
 
-        if not os.path.isfile("save.cfg"):
+        if findSaveFile() is None:
             loadButton.changeEnableState(enableButton=False)
 
         return [newButton, loadButton]
@@ -1,24 +1,24 @@
-import configparser
 from math import sqrt
 from typing import Type
 
-from .Bishop import Bishop
 from .Board import Board
 from .BoardBuilder import BoardBuilder
 from .BoardConfig import BoardConfig
-from .constants.BoardConfigSectionKeys import BoardConfigSectionKeys as cfgKeys
-from .constants.constants import PLAYER_1, PLAYER_2, windowSize
+from .constants.constants import COMPUTER_PLAYERS, PLAYER_1, PLAYER_2, windowSize
 from .King import King
 from .Knight import Knight
 from .Pawn import Pawn
 from .Piece import TPiece
 from .Player import Player
-from .Queen import Queen
-from .Rook import Rook
+from .SaveFile import PIECE_CLASSES, findSaveFile, readSaveFile
+from .SaveJournal import SaveJournalInstance, readJournalFile
+from .schemas.PositionSetup import PositionSetup
 from .Tile import Tile
 
 boardDistanceEdgeToCentre = windowSize[1] * 0.4
 windowCentre = (windowSize[0] * 0.5, windowSize[1] * 0.5)
+# the player of each team, as created by _createPlayers()
+TEAM_PLAYERS = {"white": PLAYER_1, "black": PLAYER_2}
 
 
 class Director:
@@ -29,7 +29,14 @@ class Director:
     """
 
     def __init__(self) -> None:
-        pass
+        # players moved by the engine in the boards created from now on
+        self.computerPlayers: tuple[str, ...] = COMPUTER_PLAYERS
+
+    def setComputerPlayers(self, computerPlayers: tuple[str, ...]):
+        self.computerPlayers = computerPlayers
+
+    def getComputerPlayers(self) -> tuple[str, ...]:
+        return self.computerPlayers
 
     def _getTileSpriteWidth(self, lengthTiles):
         """
@@ -40,10 +47,6 @@ class Director:
         sideLength = int(sqrt(lengthTiles))
         return (boardDistanceEdgeToCentre * 2) / (sideLength)
 
-    def _resizeSprites(self, sprites, width):
-        for sprite in sprites:
-            sprite.resizeSprite(width)
-
     def _getTileCoords(self, numberOfTiles, tileWidth) -> list:
         """
         Generate tile coordinates relative to the screen size.
@@ -69,18 +72,13 @@ class Director:
 
         return tileCoords
 
-    def _setTileCoords(self, tiles: list[Tile]):
+    def getTileLayout(self, numberOfTiles) -> tuple[list, float]:
         """
-        Set coordinates for every tile.
+        Return the screen coordinates of every tile and how wide tiles are, for
+        the sprites drawing a board of this many tiles.
         """
-
-        tileWidth = self._getTileSpriteWidth(len(tiles))
-        self._resizeSprites(tiles, tileWidth)
-
-        tileCoords = self._getTileCoords(len(tiles), tileWidth)
-        tileCoords_iter = iter(tileCoords)
-        for tile in tiles:
-            tile.setCoord(next(tileCoords_iter))
+        tileWidth = self._getTileSpriteWidth(numberOfTiles)
+        return self._getTileCoords(numberOfTiles, tileWidth), tileWidth
 
     def _linkTiles(self, tiles: list[Tile]):
         """
@@ -92,58 +90,22 @@ class Director:
         ), f"Number of tiles is not square number. Number {len(tiles)}"
 
         sideLength = int(sqrt(len(tiles)))
-        numberOfTiles = len(tiles)
-
-        def _validVerticalIndex(index, total):
-            isIndexInBounds = (index >= 0) and (index < total)
-            return isIndexInBounds
-
-        def _validEastIndex(index, newIndex, total):
-            sideLength = sqrt(total)
-            if (index % sideLength) == sideLength - 1:
-                if (newIndex % sideLength) == 0:
-                    return False
-            return True
-
-        def _validWestIndex(index, newIndex, total):
-            sideLength = sqrt(total)
-            if (index % sideLength) == 0:
-                if (newIndex % sideLength) == sideLength - 1:
-                    return False
-            return True
-
-        n = numberOfTiles
-        for tileIndex in range(0, n):
-            northIndex = tileIndex - sideLength
-            northTile = (
-                tiles[northIndex] if _validVerticalIndex(northIndex, n) else None
-            )
-
-            southIndex = tileIndex + sideLength
-            southTile = (
-                tiles[southIndex] if _validVerticalIndex(southIndex, n) else None
-            )
+        lastIndex = sideLength - 1
 
-            eastIndex = tileIndex + 1
-            eastTile = (
-                tiles[eastIndex] if _validEastIndex(tileIndex, eastIndex, n) else None
+        for tileIndex, tile in enumerate(tiles):
+            row, column = divmod(tileIndex, sideLength)
+            tile.linkSpace(tiles[tileIndex - sideLength] if row > 0 else None, "north")
+            tile.linkSpace(
+                tiles[tileIndex + sideLength] if row < lastIndex else None, "south"
             )
-
-            westIndex = tileIndex - 1
-            westTile = (
-                tiles[westIndex] if _validWestIndex(tileIndex, westIndex, n) else None
-            )
-
-            tiles[tileIndex].linkSpace(northTile, "north")
-            tiles[tileIndex].linkSpace(southTile, "south")
-            tiles[tileIndex].linkSpace(eastTile, "east")
-            tiles[tileIndex].linkSpace(westTile, "west")
+            tile.linkSpace(tiles[tileIndex + 1] if column < lastIndex else None, "east")
+            tile.linkSpace(tiles[tileIndex - 1] if column > 0 else None, "west")
 
     def _createTiles(self, numberOfTiles) -> list[Tile]:
         assert (
             numberOfTiles % sqrt(numberOfTiles) == 0
         ), f"Number of tiles is not square number. Number {numberOfTiles}"
-        sideLength = sqrt(numberOfTiles)
+        sideLength = int(sqrt(numberOfTiles))
         tiles = []
         colours = {
             True: "white",
@@ -218,12 +180,6 @@ class Director:
 
                 pieces.append(knight)
 
-        width = self._getTileSpriteWidth(len(tiles))
-        self._resizeSprites(pieces, width)
-
-        for piece in pieces:
-            piece.setCoord(piece.getSpace().getCoord())
-
         return pieces
 
     def _createPiecesFromConfig(
@@ -249,117 +205,28 @@ class Director:
                 piece.setSpace(tiles[tileNumber])
                 tiles[tileNumber].placePiece(piece)
 
-                if pConfig["class"] is Pawn:
-                    piece: Pawn = piece
-                    piece.setHomeSpace(tiles[tileNumber])
-
-            pieces.append(piece)
-
-        width = self._getTileSpriteWidth(len(tiles))
-        self._resizeSprites(pieces, width)
-
-        for piece in pieces:
-            if piece.getIsOnBoard():
-                piece.setCoord(piece.getSpace().getCoord())
-
-        return pieces
-
-    def _createKnightsFromSaveData(
-        self, tiles: list[Tile], knightsSaveData: list[dict]
-    ) -> list[Knight]:
-        return self._createPiecesFromSaveData(
-            tiles=tiles,
-            pieceClass=Knight,
-            piecesSaveData=knightsSaveData,
-        )
-
-    def _createRooksFromSaveData(
-        self, tiles: list[Tile], rooksSaveData: list[dict]
-    ) -> list[Rook]:
-        return self._createPiecesFromSaveData(
-            tiles=tiles,
-            pieceClass=Rook,
-            piecesSaveData=rooksSaveData,
-        )
-
-    def _createPawnsFromSaveData(
-        self, tiles: list[Tile], pawnsSaveData: list[dict]
-    ) -> list[Pawn]:
-        pawns: list[Pawn] = self._createPiecesFromSaveData(
-            tiles=tiles,
-            pieceClass=Pawn,
-            piecesSaveData=pawnsSaveData,
-        )
-        for pConfig in pawnsSaveData:
-            pawn = next(p for p in pawns if p.getObjectName() == pConfig["objectName"])
-            pawn.setHomeSpace(tiles[pConfig["homeSpace"]])
-
-        return pawns
-
-    def _createBishopsFromSaveData(
-        self, tiles: list[Tile], bishopsSaveData: list[dict]
-    ) -> list[Bishop]:
-        return self._createPiecesFromSaveData(
-            tiles=tiles,
-            pieceClass=Bishop,
-            piecesSaveData=bishopsSaveData,
-        )
-
-    def _createQueensFromSaveData(
-        self, tiles: list[Tile], queensSaveData: list[dict]
-    ) -> list[Queen]:
-        return self._createPiecesFromSaveData(
-            tiles=tiles,
-            pieceClass=Queen,
-            piecesSaveData=queensSaveData,
-        )
-
-    def _createKingsFromSaveData(
-        self, tiles: list[Tile], kingsSaveData: list[dict]
-    ) -> list[King]:
-        return self._createPiecesFromSaveData(
-            tiles=tiles,
-            pieceClass=King,
-            piecesSaveData=kingsSaveData,
-        )
-
-    def _createPiecesFromSaveData(
-        self, tiles: list[Tile], pieceClass: Type[TPiece], piecesSaveData: list[dict]
-    ) -> list[TPiece]:
-        pieces: list[TPiece] = []
-        for pConfig in piecesSaveData:
-            piece = pieceClass(
-                playerName=pConfig["playerName"],
-                fileName=pConfig["fileName"],
-                team=pConfig["team"],
-                objectName=pConfig["objectName"],
-            )
-            piece.setTimesMoved(pConfig["timesMoved"])
-            piece.setClaimedPieces(pConfig["claimedPieces"])
-
-            tileNumber: int | None = (
-                pConfig["space"] if (pConfig["space"] is not None) else None
-            )
-
-            if tileNumber is not None:
-                piece.setSpace(tiles[tileNumber])
-                tiles[tileNumber].placePiece(piece)
+            # saved pawns remember their home, new ones start on it
+            homeSpace = pConfig.get("homeSpace", tileNumber)
+            if pConfig["class"] is Pawn and homeSpace is not None:
+                piece: Pawn = piece
+                piece.setHomeSpace(tiles[homeSpace])
 
             pieces.append(piece)
 
-        width = self._getTileSpriteWidth(len(tiles))
-        self._resizeSprites(pieces, width)
-
-        for piece in pieces:
-            if piece.getIsOnBoard():
-                piece.setCoord(piece.getSpace().getCoord())
-
         return pieces
 
     def _createPlayers(self) -> dict[str, Player]:
         return {
-            PLAYER_1: Player(name=PLAYER_1, team="white"),
-            PLAYER_2: Player(name=PLAYER_2, team="black"),
+            PLAYER_1: Player(
+                name=PLAYER_1,
+                team="white",
+                isComputer=PLAYER_1 in self.computerPlayers,
+            ),
+            PLAYER_2: Player(
+                name=PLAYER_2,
+                team="black",
+                isComputer=PLAYER_2 in self.computerPlayers,
+            ),
         }
 
     def _createPlayersFromSaveData(self, playersSaveData) -> dict[str, Player]:
@@ -367,44 +234,29 @@ class Director:
         for playerConfig in playersSaveData:
             name: str = playerConfig["name"]
             team: str = playerConfig["team"]
-            player = Player(name=name, team=team)
+            # saves from before computer players existed only hold human players
+            isComputer: bool = playerConfig.get("isComputer", False)
+            player = Player(name=name, team=team, isComputer=isComputer)
             points: int = playerConfig["points"]
             player.incrementPoints(points=points)
             playersDict[name] = player
         return playersDict
 
-    def _getCurrentPlayerFromSaveData(self, boardSaveData):
-        boardConfig = boardSaveData[0]
-        currentPlayer: str = boardConfig["currentPlayer"]
-        return currentPlayer
-
     def _getMoveStackFromSaveData(
         self,
-        movesSaveData,
+        movesSaveData: list[tuple[int, int | None, int, int]],
         tiles: list[Tile],
         pieces: list[TPiece],
     ):
-        moveRecordStack = []
-        for movesConfig in movesSaveData:
-            moveRecordStack.append(
-                {
-                    "piece": next(
-                        p for p in pieces if p.getObjectName() == movesConfig["piece"]
-                    ),
-                    "otherPiece": (
-                        next(
-                            p
-                            for p in pieces
-                            if p.getObjectName() == movesConfig["otherPiece"]
-                        )
-                        if movesConfig["otherPiece"] is not None
-                        else None
-                    ),
-                    "oldSpace": tiles[movesConfig["oldSpace"]],
-                    "newSpace": tiles[movesConfig["newSpace"]],
-                }
-            )
-        return moveRecordStack
+        return [
+            {
+                "piece": pieces[piece],
+                "otherPiece": pieces[otherPiece] if otherPiece is not None else None,
+                "oldSpace": tiles[oldSpace],
+                "newSpace": tiles[newSpace],
+            }
+            for piece, otherPiece, oldSpace, newSpace in movesSaveData
+        ]
 
     def createStandardBoard(self, boardBuilder: BoardBuilder):
         # self.createNewStandardBoardWithKnightsOnly(boardBuilder=boardBuilder)
@@ -418,7 +270,6 @@ class Director:
         print("createNewStandardBoardWithKnightsOnly")
         tiles = self._createTiles(100)
         self._linkTiles(tiles)
-        self._setTileCoords(tiles)
 
         knights = self._createKnights(tiles)
 
@@ -435,7 +286,6 @@ class Director:
         print("createNewStandardBoardFromConfig")
         tiles = self._createTiles(64)
         self._linkTiles(tiles)
-        self._setTileCoords(tiles)
 
         pieceConfigs = BoardConfig.getPieceConfigs()
 
@@ -447,61 +297,79 @@ class Director:
         boardBuilder.setPieces(pieces)
         boardBuilder.setPlayers(players)
 
-    def _getSectionLength(self, config, section):
-        return int(config.get(section, "length"))
-
-    def _loadSectionData(self, config, section):
-        length = self._getSectionLength(config, section)
-        saveData = []
-        for number in range(0, int(length)):
-            dictionaryStr = config.get(section, f"{number}")
-            saveData.append(eval(dictionaryStr))
-        return saveData
-
-    def createStandardBoardFromSaveData(self, boardBuilder: BoardBuilder):
+    def createStandardBoardFromSaveData(
+        self, boardBuilder: BoardBuilder, fileName: str | None = None
+    ):
+        """
+        Create a board from a save file, binary or .cfg, and the moves
+        journalled after it. Without a file name the game's own save is
+        loaded.
+        """
         print("createStandardBoardFromSaveData")
-        config = configparser.RawConfigParser()
-        config.read("save.cfg")
+        if fileName is None:
+            fileName = findSaveFile()
+        saveData = readSaveFile(fileName)
 
-        numberOfTiles = self._getSectionLength(config, cfgKeys.TILES)
-        tiles = self._createTiles(numberOfTiles)
+        tiles = self._createTiles(saveData.numberOfTiles)
         self._linkTiles(tiles)
-        self._setTileCoords(tiles)
-
-        knightsSaveData = self._loadSectionData(config, cfgKeys.KNIGHTS)
-        knights = self._createKnightsFromSaveData(tiles, knightsSaveData)
-
-        rooksSaveData = self._loadSectionData(config, cfgKeys.ROOKS)
-        rooks = self._createRooksFromSaveData(tiles, rooksSaveData)
 
-        pawnsSaveData = self._loadSectionData(config, cfgKeys.PAWNS)
-        pawns = self._createPawnsFromSaveData(tiles, pawnsSaveData)
+        pieces = self._createPiecesFromConfig(tiles, saveData.pieces)
+        players = self._createPlayersFromSaveData(saveData.players)
+        moveStack = self._getMoveStackFromSaveData(saveData.moves, tiles, pieces)
 
-        bishopsSaveData = self._loadSectionData(config, cfgKeys.BISHOPS)
-        bishops = self._createBishopsFromSaveData(tiles, bishopsSaveData)
-
-        queensSaveData = self._loadSectionData(config, cfgKeys.QUEENS)
-        queens = self._createQueensFromSaveData(tiles, queensSaveData)
-
-        kingsSaveData = self._loadSectionData(config, cfgKeys.KINGS)
-        kings = self._createKingsFromSaveData(tiles, kingsSaveData)
-
-        playersSaveData = self._loadSectionData(config, cfgKeys.PLAYERS)
-        players = self._createPlayersFromSaveData(playersSaveData)
+        boardBuilder.setTiles(tiles)
+        boardBuilder.setPieces(pieces)
+        boardBuilder.setPlayers(players)
+        boardBuilder.setCurrentPlayer(saveData.currentPlayer)
+        boardBuilder.setMoveStack(moveStack)
+        boardBuilder.setMoveCounters(*saveData.startingMoveCounters)
+        boardBuilder.setJournalRecords(readJournalFile(fileName))
 
-        boardSaveData = self._loadSectionData(config, cfgKeys.BOARD)
-        currentPlayer = self._getCurrentPlayerFromSaveData(boardSaveData)
+    def createBoardFromPositionSetup(
+        self, boardBuilder: BoardBuilder, setup: PositionSetup
+    ):
+        """
+        Create a board from a position read from a position string. Pieces are
+        named after their type and tile, as in the standard configuration.
+        """
+        print("createBoardFromPositionSetup")
+        tiles = self._createTiles(setup.sideLength * setup.sideLength)
+        self._linkTiles(tiles)
 
-        pieces = [*knights, *rooks, *pawns, *bishops, *queens, *kings]
+        pawnHomes = set(setup.pawnHomes)
+        pieceConfigs = []
+        for number, occupant in enumerate(setup.squares):
+            if occupant is None:
+                continue
+            team, pieceType = occupant
+            pConfig = {
+                "class": PIECE_CLASSES[pieceType],
+                "fileName": f"{pieceType.lower()}_{team}",
+                "playerName": TEAM_PLAYERS[team],
+                "objectName": f"{pieceType.lower()}_{number}",
+                "space": number,
+                "team": team,
+                "timesMoved": 0,
+                "claimedPieces": 0,
+                "isOnBoard": True,
+            }
+            if pieceType == "Pawn":
+                pConfig["homeSpace"] = number if number in pawnHomes else None
+            pieceConfigs.append(pConfig)
 
-        movesSaveData = self._loadSectionData(config, cfgKeys.MOVES)
-        moveStack = self._getMoveStackFromSaveData(movesSaveData, tiles, pieces)
+        pieces = self._createPiecesFromConfig(tiles, pieceConfigs)
+        players = self._createPlayers()
 
         boardBuilder.setTiles(tiles)
         boardBuilder.setPieces(pieces)
         boardBuilder.setPlayers(players)
-        boardBuilder.setCurrentPlayer(currentPlayer)
-        boardBuilder.setMoveStack(moveStack)
+        boardBuilder.setCurrentPlayer(TEAM_PLAYERS[setup.team])
+        boardBuilder.setMoveCounters(setup.halfmoveClock, setup.fullmoveNumber)
 
     def exportSaveFile(self, board: Board):
-        board.save()
+        """
+        Save the game and wait until it is on disk.
+        """
+        journal = SaveJournalInstance.getInstance()
+        journal.compact(board)
+        journal.flush()
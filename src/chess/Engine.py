@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+from threading import get_ident
+from time import perf_counter
+from typing import Literal
+
+from .constants.constants import MOBILITY_WEIGHT
+from .EvaluationParameters import EvaluationParametersInstance, flipTileNumber
+from .MoveGenerator import MoveGenerator
+from .Position import Position
+from .schemas.SearchResult import SearchResult
+
+MATE_SCORE = 1_000_000
+INFINITY = MATE_SCORE + 1
+MAX_DEPTH = 64
+
+# transposition table entry flags
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+# one engine per settings and thread, so transposition tables survive between
+# the searches a worker runs without ever being shared by two searches
+_workerEngines: dict[tuple, Engine] = {}
+
+
+def searchInWorker(
+    pointsValues: dict[str, int],
+    timeBudgetMs: int,
+    position: Position,
+    team: Literal["black", "white"],
+) -> SearchResult:
+    """
+    Search a position from a WorkerPool thread or process.
+    """
+    key = (tuple(sorted(pointsValues.items())), timeBudgetMs, get_ident())
+    if key not in _workerEngines:
+        _workerEngines[key] = Engine(pointsValues, timeBudgetMs)
+    return _workerEngines[key].search(position, team)
+
+
+class Engine:
+    """
+    Engine class picks moves for a computer player. It runs an alpha-beta
+    (negamax) search with iterative deepening until the time budget runs out,
+    ordering moves by the transposition table, captures of the most valuable
+    piece by the least valuable attacker, then killer moves. Leaf positions
+    are resolved with a quiescence search over captures before being scored.
+
+    Positions are scored by material and piece-square tables, plus the number
+    of tiles each team attacks. Both come from the tuned EvaluationParameters
+    of the board size when there are some, otherwise from each piece's points
+    value and a bonus for central knights and bishops. The transposition table
+    is kept between searches, so one Engine should be used for all of a
+    player's moves.
+    """
+
+    def __init__(
+        self,
+        pointsValues: dict[str, int],
+        timeBudgetMs: int = 1000,
+        maxDepth: int = MAX_DEPTH,
+        transpositionTableSize: int = 200_000,
+    ) -> None:
+        self.pointsValues = pointsValues
+        # centipawns per piece type, and per team piece type -> tile -> centipawns,
+        # for the board size being searched
+        self.pieceValues: dict[str, int] = {}
+        self.pieceSquareTables: dict[str, dict[str, list[int]]] = {}
+        self.evaluationSideLength: int | None = None
+        self.timeBudgetMs = timeBudgetMs
+        self.maxDepth = maxDepth
+        self.transpositionTableSize = transpositionTableSize
+        # position hash -> (depth, score, flag, best move)
+        self.transpositionTable: dict[int, tuple] = {}
+        self.killerMoves: list[list[tuple[int, int]]] = []
+
+        self.position: Position | None = None
+        self.nodes = 0
+        self.deadline = 0.0
+        self._rootBestMove: tuple[int, int] | None = None
+
+    def search(
+        self, position: Position, team: Literal["black", "white"]
+    ) -> SearchResult:
+        """
+        Find the best move for a team within the time budget. The search runs on
+        a copy of the position, so the position passed in is never changed.
+        """
+        start = perf_counter()
+        self.position = position.copy()
+        self._loadEvaluationParameters(position.sideLength)
+        self.nodes = 0
+        self.deadline = start + self.timeBudgetMs / 1000
+        self.killerMoves = [[] for _ in range(0, self.maxDepth + 1)]
+        if len(self.transpositionTable) > self.transpositionTableSize:
+            self.transpositionTable.clear()
+
+        moves = MoveGenerator(self.position, team).generateLegalMoves()
+        bestMove = self._orderMoves(moves, None, 0)[0] if moves else None
+        bestScore = 0
+        completedDepth = 0
+        # with a single reply there is nothing to think about
+        if len(moves) > 1:
+            for depth in range(1, self.maxDepth + 1):
+                try:
+                    score = self._negamax(team, depth, -INFINITY, INFINITY, 0)
+                except SearchTimeout:
+                    break
+                bestMove, bestScore, completedDepth = self._rootBestMove, score, depth
+                if abs(score) >= MATE_SCORE - MAX_DEPTH:
+                    break
+
+        seconds = perf_counter() - start
+        return SearchResult(
+            bestMove=bestMove,
+            score=bestScore,
+            depth=completedDepth,
+            nodes=self.nodes,
+            seconds=seconds,
+            nodesPerSecond=self.nodes / seconds if seconds > 0 else 0.0,
+        )
+
+    def _countNode(self):
+        self.nodes += 1
+        if not self.nodes & 127 and perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def _negamax(
+        self,
+        team: Literal["black", "white"],
+        depth: int,
+        alpha: int,
+        beta: int,
+        ply: int,
+    ) -> int:
+        if depth <= 0:
+            return self._quiescence(team, alpha, beta, ply)
+        self._countNode()
+
+        position = self.position
+        key = position.hash ^ position.zobristKeys.getSideToMoveKey(team)
+        tableMove = None
+        entry = self.transpositionTable.get(key)
+        if entry is not None:
+            entryDepth, entryScore, entryFlag, tableMove = entry
+            if entryDepth >= depth and ply > 0:
+                score = self._scoreFromTable(entryScore, ply)
+                if entryFlag == EXACT:
+                    return score
+                if entryFlag == LOWER_BOUND and score >= beta:
+                    return score
+                if entryFlag == UPPER_BOUND and score <= alpha:
+                    return score
+
+        moveGenerator = MoveGenerator(position, team)
+        moves = moveGenerator.generateLegalMoves()
+        if not moves:
+            return -MATE_SCORE + ply if moveGenerator.isInCheck() else 0
+
+        originalAlpha = alpha
+        opponentTeam = position.getOpponentTeam(team)
+        bestScore = -INFINITY
+        bestMove = None
+        for move in self._orderMoves(moves, tableMove, ply):
+            isCapture = position.squares[move[1]] is not None
+            undoRecord = position.makeMove(*move)
+            score = -self._negamax(opponentTeam, depth - 1, -beta, -alpha, ply + 1)
+            position.unmakeMove(undoRecord)
+
+            if score > bestScore:
+                bestScore = score
+                bestMove = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not isCapture:
+                    self._rememberKillerMove(move, ply)
+                break
+
+        if bestScore <= originalAlpha:
+            flag = UPPER_BOUND
+        elif bestScore >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.transpositionTable[key] = (
+            depth,
+            self._scoreToTable(bestScore, ply),
+            flag,
+            bestMove,
+        )
+        if ply == 0:
+            self._rootBestMove = bestMove
+        return bestScore
+
+    def _quiescence(
+        self, team: Literal["black", "white"], alpha: int, beta: int, ply: int
+    ) -> int:
+        """
+        Play out captures until the position is quiet, so a position is never
+        scored in the middle of an exchange.
+        """
+        self._countNode()
+        standPat = self.evaluate(team)
+        if standPat >= beta:
+            return standPat
+        if standPat > alpha:
+            alpha = standPat
+
+        position = self.position
+        opponentTeam = position.getOpponentTeam(team)
+        captures = MoveGenerator(position, team).generateLegalCaptures()
+        for move in self._orderMoves(captures, None, ply):
+            undoRecord = position.makeMove(*move)
+            score = -self._quiescence(opponentTeam, -beta, -alpha, ply + 1)
+            position.unmakeMove(undoRecord)
+
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _orderMoves(
+        self, moves: list[tuple[int, int]], tableMove: tuple | None, ply: int
+    ) -> list[tuple[int, int]]:
+        squares = self.position.squares
+        pieceValues = self.pieceValues
+        killerMoves = self.killerMoves[ply] if ply < len(self.killerMoves) else []
+
+        def moveOrder(move: tuple[int, int]) -> int:
+            if move == tableMove:
+                return -INFINITY
+            captured = squares[move[1]]
+            if captured is not None:
+                # most valuable victim, then least valuable attacker
+                return (
+                    -10 * pieceValues.get(captured[1], 0)
+                    + pieceValues.get(squares[move[0]][1], 0) // 100
+                )
+            if move in killerMoves:
+                return 0
+            return 1
+
+        return sorted(moves, key=moveOrder)
+
+    def _rememberKillerMove(self, move: tuple[int, int], ply: int):
+        killerMoves = self.killerMoves[ply]
+        if move not in killerMoves:
+            killerMoves.insert(0, move)
+            del killerMoves[2:]
+
+    @staticmethod
+    def _scoreToTable(score: int, ply: int) -> int:
+        # mate scores are stored relative to the position, not the root
+        if score >= MATE_SCORE - MAX_DEPTH:
+            return score + ply
+        if score <= -MATE_SCORE + MAX_DEPTH:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _scoreFromTable(score: int, ply: int) -> int:
+        if score >= MATE_SCORE - MAX_DEPTH:
+            return score - ply
+        if score <= -MATE_SCORE + MAX_DEPTH:
+            return score + ply
+        return score
+
+    def _loadEvaluationParameters(self, sideLength: int):
+        if sideLength == self.evaluationSideLength:
+            return
+        parameters = EvaluationParametersInstance.getInstance()
+        self.pieceValues = parameters.getPieceValues(sideLength, self.pointsValues)
+        pieceSquareTables = parameters.getPieceSquareTables(sideLength)
+        # tables of zeros are left out so evaluate() skips them
+        self.pieceSquareTables = {
+            "white": {
+                pieceType: table
+                for pieceType, table in pieceSquareTables.items()
+                if any(table)
+            },
+        }
+        self.pieceSquareTables["black"] = {
+            pieceType: [
+                table[flipTileNumber(number, sideLength)]
+                for number in range(0, sideLength * sideLength)
+            ]
+            for pieceType, table in self.pieceSquareTables["white"].items()
+        }
+        self.evaluationSideLength = sideLength
+
+    def evaluate(self, team: Literal["black", "white"]) -> int:
+        """
+        Score the position in centipawns from the point of view of a team.
+        """
+        position = self.position
+        score = 0
+        for pieceTeam, sign in ((team, 1), (position.getOpponentTeam(team), -1)):
+            pieces = position.teams[pieceTeam]
+            teamScore = MOBILITY_WEIGHT * position.attackedTiles[pieceTeam].bit_count()
+            for pieceType, value in self.pieceValues.items():
+                teamScore += (
+                    value * (pieces & position.pieceTypes[pieceType]).bit_count()
+                )
+            for pieceType, table in self.pieceSquareTables[pieceTeam].items():
+                for number in position.iterateBits(
+                    pieces & position.pieceTypes[pieceType]
+                ):
+                    teamScore += table[number]
+            score += sign * teamScore
+        return score
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import os
+
+from .constants.constants import (
+    CENTRALISED_PIECE_TYPES,
+    CENTRE_WEIGHT,
+    EVALUATION_PARAMETERS_FILE,
+    PIECE_TYPES,
+)
+
+
+def getDefaultPieceSquareTables(sideLength: int) -> dict[str, list[int]]:
+    """
+    Return the untuned piece-square tables: a bonus for how central knights and
+    bishops are, growing by CENTRE_WEIGHT a tile from 0 on the edge.
+    """
+    centreBonuses = []
+    for number in range(0, sideLength * sideLength):
+        row, column = divmod(number, sideLength)
+        distance = abs(2 * row - (sideLength - 1)) + abs(2 * column - (sideLength - 1))
+        centreBonuses.append(CENTRE_WEIGHT * ((2 * (sideLength - 1) - distance) // 2))
+    return {
+        pieceType: (
+            list(centreBonuses)
+            if pieceType in CENTRALISED_PIECE_TYPES
+            else [0] * (sideLength * sideLength)
+        )
+        for pieceType in PIECE_TYPES
+    }
+
+
+def flipTileNumber(number: int, sideLength: int) -> int:
+    """
+    Return the tile mirrored across the middle row, where a black piece reads
+    a piece-square table written from white's side of the board.
+    """
+    row, column = divmod(number, sideLength)
+    return (sideLength - 1 - row) * sideLength + column
+
+
+class EvaluationParameters:
+    """
+    EvaluationParameters class holds the piece values, in centipawns, and the
+    piece-square tables the engine scores positions with, per board side length.
+    Tables are written from white's side of the board. Board sizes missing from
+    the parameter file use the pieces' points values and the default tables.
+
+    The parameter file is written by tune.py.
+    """
+
+    def __init__(self, fileName: str = EVALUATION_PARAMETERS_FILE) -> None:
+        self.fileName = fileName
+        # side length -> {"pieceValues": ..., "pieceSquareTables": ...}
+        self.parameters: dict[int, dict] = {}
+
+    def load(self):
+        if not os.path.exists(self.fileName):
+            return
+        with open(self.fileName, "r") as parametersFile:
+            self.parameters = {
+                int(sideLength): parameters
+                for sideLength, parameters in json.load(parametersFile).items()
+            }
+
+    def save(self):
+        with open(self.fileName, "w") as parametersFile:
+            json.dump(
+                {str(key): value for key, value in sorted(self.parameters.items())},
+                parametersFile,
+                indent=1,
+            )
+
+    def isTuned(self, sideLength: int) -> bool:
+        return sideLength in self.parameters
+
+    def getPieceValues(
+        self, sideLength: int, pointsValues: dict[str, int]
+    ) -> dict[str, int]:
+        pieceValues = {
+            pieceType: value * 100 for pieceType, value in pointsValues.items()
+        }
+        if sideLength in self.parameters:
+            pieceValues.update(self.parameters[sideLength]["pieceValues"])
+        return pieceValues
+
+    def getPieceSquareTables(self, sideLength: int) -> dict[str, list[int]]:
+        pieceSquareTables = getDefaultPieceSquareTables(sideLength)
+        if sideLength in self.parameters:
+            pieceSquareTables.update(self.parameters[sideLength]["pieceSquareTables"])
+        return pieceSquareTables
+
+    def setParameters(
+        self,
+        sideLength: int,
+        pieceValues: dict[str, int],
+        pieceSquareTables: dict[str, list[int]],
+    ):
+        self.parameters[sideLength] = {
+            "pieceValues": pieceValues,
+            "pieceSquareTables": pieceSquareTables,
+        }
+
+
+class EvaluationParametersInstance:
+    """
+    Declare a single instance of the EvaluationParameters class for the entire
+    application, loaded from the parameter file the first time it is asked for.
+    Uses Singleton design pattern.
+    """
+
+    obj = None
+
+    @staticmethod
+    def getInstance():
+        if not EvaluationParametersInstance.obj:
+            EvaluationParametersInstance.obj = EvaluationParameters()
+            EvaluationParametersInstance.obj.load()
+        return EvaluationParametersInstance.obj
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from .Board import Board
+from .BoardBuilder import StandardBoardBuilder
+from .constants.constants import SAVE_FILE
+from .Director import Director
+from .Player import Player
+from .PositionString import formatPositionString, getPositionSetup, parsePositionString
+from .schemas.MoveRecord import MoveRecord
+
+GAME_MODES = ("standard", "knights")
+
+
+class Game:
+    """
+    Game class plays a game on the board model alone, without pygame, a window
+    or sprites, for scripts, tests and the engine's tooling. Moves are given as
+    (from, to) tile numbers and checked against the current player's legal
+    moves.
+    """
+
+    def __init__(self, board: Board) -> None:
+        self.board = board
+
+    @staticmethod
+    def newGame(mode: Literal["standard", "knights"] = "standard") -> Game:
+        if mode not in GAME_MODES:
+            raise ValueError(f"Unknown game mode {mode}, expected one of {GAME_MODES}")
+        boardBuilder = StandardBoardBuilder()
+        director = Director()
+        if mode == "knights":
+            director.createNewStandardBoardWithKnightsOnly(boardBuilder)
+        else:
+            director.createNewStandardBoardFromConfig(boardBuilder)
+        return Game(boardBuilder.getBoard())
+
+    @staticmethod
+    def load(fileName: str | None = None) -> Game:
+        boardBuilder = StandardBoardBuilder()
+        Director().createStandardBoardFromSaveData(boardBuilder, fileName)
+        board = boardBuilder.getBoard()
+        board.setIsCheck(board.checkIsThereCheck())
+        return Game(board)
+
+    @staticmethod
+    def fromPositionString(text: str) -> Game:
+        """
+        Start a game from a position string, see chess.PositionString.
+        """
+        boardBuilder = StandardBoardBuilder()
+        Director().createBoardFromPositionSetup(boardBuilder, parsePositionString(text))
+        board = boardBuilder.getBoard()
+        board.setIsCheck(board.checkIsThereCheck())
+        return Game(board)
+
+    def getPositionString(self) -> str:
+        halfmoveClock, fullmoveNumber = self.board.getMoveCounters()
+        return formatPositionString(
+            getPositionSetup(
+                self.board.position,
+                self.board.getCurrentPlayer().getTeam(),
+                halfmoveClock,
+                fullmoveNumber,
+            )
+        )
+
+    def getBoard(self) -> Board:
+        return self.board
+
+    def getCurrentPlayer(self) -> Player:
+        return self.board.getCurrentPlayer()
+
+    def getLegalMoves(self) -> list[tuple[int, int]]:
+        """
+        Return the current player's legal moves as (from, to) tile numbers.
+        """
+        return [
+            (piece.getSpace().getNumber(), space.getNumber())
+            for piece in self.board.getCurrentPlayersPiecesOnBoard()
+            for space in piece.getPotentialSpaces()
+        ]
+
+    def move(self, fromNumber: int, toNumber: int) -> MoveRecord:
+        """
+        Play the current player's piece on one tile to another. Raises
+        ValueError if it is not a legal move.
+        """
+        tiles = self.board.getTiles()
+        piece = tiles[fromNumber].getPiece()
+        if piece is None:
+            raise ValueError(f"No piece on tile {fromNumber}")
+        if piece.getPlayerName() != self.getCurrentPlayer().getName():
+            raise ValueError(f"Piece on tile {fromNumber} is not the current player's")
+        if tiles[toNumber] not in piece.getPotentialSpaces():
+            raise ValueError(f"Illegal move from tile {fromNumber} to {toNumber}")
+        self.board.deselectPiece()
+        return self.board.commitMove(piece, tiles[toNumber])
+
+    def undo(self) -> MoveRecord | None:
+        """
+        Take back the last move, returning None if no move is left to undo.
+        """
+        return self.board.takeBackMove()
+
+    def getStatus(
+        self,
+    ) -> Literal["checkmate", "stalemate", "repetition", "ongoing"]:
+        return self.board.getGameStatus()
+
+    def isInCheck(self) -> bool:
+        return self.board.isInCheck()
+
+    def save(self, fileName: str = SAVE_FILE):
+        self.board.save(fileName)
@@ -1,6 +1,8 @@
 from typing import Literal
 
+from .constants.constants import POINTS_VALUES
 from .Piece import Piece
+from .Position import Position
 from .Space import Space
 
 
@@ -8,9 +10,6 @@ class King(Piece):
     def __init__(
         self,
         fileName: str = "king_white",
-        relativeDir: str = "chess/data/piece/",
-        scale: int = 0.47,
-        coord: list = [0, 0],
         playerName: str = "defaultPlayerName",
         objectName: str = "defaultPieceName",
         space: Space | None = None,
@@ -19,9 +18,6 @@ class King(Piece):
         Piece.__init__(
             self=self,
             fileName=fileName,
-            relativeDir=relativeDir,
-            scale=scale,
-            coord=coord,
             playerName=playerName,
             objectName=objectName,
             space=space,
@@ -29,40 +25,7 @@ class King(Piece):
         )
 
     def getPointsValue(self) -> int:
-        return 999
+        return POINTS_VALUES["King"]
 
-    def findAndRememberPotentialTiles(self):
-        paths = [
-            ["north", "east"],
-            ["north", "west"],
-            ["south", "east"],
-            ["south", "west"],
-            ["north"],
-            ["south"],
-            ["east"],
-            ["west"],
-        ]
-        potentialSpaces: list[Space] = []
-        if self.getIsOnBoard():
-            for path in paths:
-                space = self.getSpace()
-                for direction in path:
-                    space = space.getAdjacentSpace(direction)
-                    if space is None:
-                        break
-                if space is not None:
-                    space.updateCanBeReachedByAPiece(self.getTeam())
-                    if space.isOccupied():
-                        otherPiece: Piece = space.getPiece()
-                        if otherPiece.getTeam() != self.getTeam():
-                            potentialSpaces.append(space)
-                    else:
-                        potentialSpaces.append(space)
-
-        potentialSpaces = [
-            space
-            for space in potentialSpaces
-            if not space.getCanBeReachedByAPiece(self.getOpponentTeam())
-        ]
-
-        self.potentialSpaces = potentialSpaces
+    def findPotentialTargets(self, position: Position) -> int:
+        return position.getKingTargets(self.getSpace().getNumber(), self.getTeam())
@@ -1,6 +1,8 @@
 from typing import Literal
 
+from .constants.constants import POINTS_VALUES
 from .Piece import Piece
+from .Position import Position
 from .Space import Space
 
 
@@ -8,9 +10,6 @@ class Knight(Piece):
     def __init__(
         self,
         fileName: str = "knight_white",
-        relativeDir: str = "chess/data/piece/",
-        scale: int = 0.47,
-        coord: list = [0, 0],
         playerName: str = "defaultPlayerName",
         objectName: str = "defaultPieceName",
         space: Space | None = None,
@@ -19,9 +18,6 @@ class Knight(Piece):
         Piece.__init__(
             self=self,
             fileName=fileName,
-            relativeDir=relativeDir,
-            scale=scale,
-            coord=coord,
             playerName=playerName,
             objectName=objectName,
             space=space,
@@ -29,34 +25,7 @@ class Knight(Piece):
         )
 
     def getPointsValue(self) -> int:
-        return 3
+        return POINTS_VALUES["Knight"]
 
-    def findAndRememberPotentialTiles(self):
-        paths = [
-            ["north", "north", "east"],
-            ["north", "north", "west"],
-            ["south", "south", "east"],
-            ["south", "south", "west"],
-            ["west", "west", "north"],
-            ["west", "west", "south"],
-            ["east", "east", "north"],
-            ["east", "east", "south"],
-        ]
-        potentialSpaces: list[Space] = []
-        if self.getIsOnBoard():
-            for path in paths:
-                space = self.getSpace()
-                for direction in path:
-                    space = space.getAdjacentSpace(direction)
-                    if space is None:
-                        break
-                if space is not None:
-                    space.updateCanBeReachedByAPiece(self.getTeam())
-                    if space.isOccupied():
-                        otherPiece: Piece = space.getPiece()
-                        if otherPiece.getTeam() != self.getTeam():
-                            potentialSpaces.append(space)
-                    else:
-                        potentialSpaces.append(space)
-
-        self.potentialSpaces = potentialSpaces
+    def findPotentialTargets(self, position: Position) -> int:
+        return position.getKnightTargets(self.getSpace().getNumber(), self.getTeam())
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from .AttackTables import DIAGONAL_DIRECTIONS, DIRECTIONS, INCREASING_DIRECTIONS
+from .Position import Position
+
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+REPETITION = "repetition"
+ONGOING = "ongoing"
+
+
+class MoveGenerator:
+    """
+    MoveGenerator emits only legal moves for one team. The pieces giving check,
+    the rays pinned pieces are confined to and the tiles the king may not step
+    onto are worked out once when the generator is created, so every piece's
+    legal targets are a couple of bitwise masks away from its pseudo-legal ones.
+    A MoveGenerator describes a single position and should be recreated after
+    the position changes.
+    """
+
+    def __init__(self, position: Position, team: Literal["black", "white"]) -> None:
+        self.position = position
+        self.team = team
+        self.opponentTeam = position.getOpponentTeam(team)
+
+        self.kingNumber: int | None = None
+        self.checkers = 0
+        # tiles a non-king piece must move to when the king is in check
+        self.checkMask = position.allTiles
+        # pinned piece tile number -> tiles it may move along
+        self.pinRays: dict[int, int] = {}
+        self.kingDanger = position.getAttackedTiles(self.opponentTeam)
+
+        kings = position.getPieces(team, "King")
+        if kings:
+            self.kingNumber = (kings & -kings).bit_length() - 1
+            self._findCheckersAndPins()
+
+    def _findCheckersAndPins(self):
+        position = self.position
+        tables = position.tables
+        king = self.kingNumber
+        occupied = position.getOccupied()
+        friends = position.teams[self.team]
+        enemies = position.teams[self.opponentTeam]
+
+        self.checkers = enemies & (
+            (tables.knightAttacks[king] & position.pieceTypes["Knight"])
+            | (tables.pawnAttacks[self.team][king] & position.pieceTypes["Pawn"])
+            | (tables.kingAttacks[king] & position.pieceTypes["King"])
+        )
+        checkMask = self.checkers
+
+        queens = position.pieceTypes["Queen"]
+        for direction in DIRECTIONS:
+            if direction in DIAGONAL_DIRECTIONS:
+                sliders = enemies & (position.pieceTypes["Bishop"] | queens)
+            else:
+                sliders = enemies & (position.pieceTypes["Rook"] | queens)
+            if not sliders & tables.rays[direction][king]:
+                continue
+
+            seen = tables.getRayAttacks(king, direction, occupied)
+            blocker = self._nearest(seen & occupied, direction)
+            if blocker is None:
+                continue
+            if (1 << blocker) & sliders:
+                self.checkers |= 1 << blocker
+                checkMask |= seen
+            elif (1 << blocker) & friends:
+                beyond = tables.getRayAttacks(blocker, direction, occupied)
+                pinner = self._nearest(beyond & occupied, direction)
+                if pinner is not None and (1 << pinner) & sliders:
+                    self.pinRays[blocker] = seen | beyond
+
+        checkerCount = self.checkers.bit_count()
+        if checkerCount == 1:
+            self.checkMask = checkMask
+        elif checkerCount > 1:
+            self.checkMask = 0
+
+    @staticmethod
+    def _nearest(tiles: int, direction: str) -> int | None:
+        if not tiles:
+            return None
+        if direction in INCREASING_DIRECTIONS:
+            return (tiles & -tiles).bit_length() - 1
+        return tiles.bit_length() - 1
+
+    def isInCheck(self) -> bool:
+        return bool(self.checkers)
+
+    def filterTargets(self, number: int, targets: int) -> int:
+        """
+        Narrow a piece's pseudo-legal targets down to the moves that do not leave
+        its own king attacked.
+        """
+        if number == self.kingNumber:
+            return targets & ~self.kingDanger
+        targets &= self.checkMask
+        if number in self.pinRays:
+            targets &= self.pinRays[number]
+        return targets
+
+    def getLegalTargets(self, number: int) -> int:
+        return self.filterTargets(number, self.position.getTargets(number))
+
+    def generateLegalMoves(self) -> list[tuple[int, int]]:
+        """
+        Return every legal move of the team as (fromNumber, toNumber) pairs.
+        """
+        moves = []
+        pieces = self.position.teams[self.team]
+        if self.checkMask == 0 and self.kingNumber is not None:
+            pieces = 1 << self.kingNumber
+        for number in self.position.iterateBits(pieces):
+            for target in self.position.iterateBits(self.getLegalTargets(number)):
+                moves.append((number, target))
+        return moves
+
+    def generateLegalCaptures(self) -> list[tuple[int, int]]:
+        """
+        Return every legal move of the team that takes an opponent's piece.
+        """
+        moves = []
+        position = self.position
+        enemies = position.teams[self.opponentTeam]
+        pieces = position.teams[self.team]
+        if self.checkMask == 0 and self.kingNumber is not None:
+            pieces = 1 << self.kingNumber
+        for number in position.iterateBits(pieces):
+            captures = self.getLegalTargets(number) & enemies
+            for target in position.iterateBits(captures):
+                moves.append((number, target))
+        return moves
+
+    def hasLegalMove(self) -> bool:
+        """
+        Whether the team has at least one legal move. Stops at the first one found,
+        looking at the king first since it is the only piece that can move out of
+        a double check.
+        """
+        position = self.position
+        if self.kingNumber is not None and self.getLegalTargets(self.kingNumber):
+            return True
+        if self.checkMask == 0:
+            return False
+        for number in position.iterateBits(position.teams[self.team]):
+            if number != self.kingNumber and self.getLegalTargets(number):
+                return True
+        return False
+
+    def getGameStatus(self) -> Literal["checkmate", "stalemate", "ongoing"]:
+        """
+        Return whether the team to move has been checkmated or stalemated, or if
+        the game goes on.
+        """
+        if self.hasLegalMove():
+            return ONGOING
+        if self.isInCheck():
+            return CHECKMATE
+        return STALEMATE
@@ -1,6 +1,8 @@
 from typing import Literal
 
+from .constants.constants import POINTS_VALUES
 from .Piece import Piece
+from .Position import Position
 from .Space import Space
 
 
@@ -8,9 +10,6 @@ class Pawn(Piece):
     def __init__(
         self,
         fileName: str = "pawn_white",
-        relativeDir: str = "chess/data/piece/",
-        scale: int = 0.47,
-        coord: list = [0, 0],
         playerName: str = "defaultPlayerName",
         objectName: str = "defaultPieceName",
         space: Space | None = None,
@@ -19,9 +18,6 @@ class Pawn(Piece):
         Piece.__init__(
             self=self,
             fileName=fileName,
-            relativeDir=relativeDir,
-            scale=scale,
-            coord=coord,
             playerName=playerName,
             objectName=objectName,
             space=space,
@@ -33,96 +29,21 @@ class Pawn(Piece):
     def setHomeSpace(self, homeSpace: Space) -> bool:
         self._homeSpace = homeSpace
 
-    def getPointsValue(self) -> int:
-        return 1
-
-    def findAndRememberPotentialTiles(self):
-        potentialSpaces: list[Space] = []
-        normalPathBeginning = {
-            "black": [
-                ["south", "south"],
-            ],
-            "white": [
-                ["north", "north"],
-            ],
-        }
-        normalPath = {
-            "black": [
-                ["south"],
-            ],
-            "white": [
-                ["north"],
-            ],
-        }
-        attackPath = {
-            "black": [
-                ["south", "east"],
-                ["south", "west"],
-            ],
-            "white": [
-                ["north", "east"],
-                ["north", "west"],
-            ],
-        }
+    def getHomeSpace(self) -> Space | None:
+        return self._homeSpace
 
-        if self._homeSpace is self.getSpace():
-            for path in normalPathBeginning[self.getTeam()]:
-                space = self.getSpace()
-                for direction in path:
-                    space = space.getAdjacentSpace(direction)
-                    if space is None:
-                        break
-                if space is not None:
-                    if space.isOccupied():
-                        break
-                    else:
-                        potentialSpaces.append(space)
+    def isOnHomeSpace(self) -> bool:
+        return self._homeSpace is not None and self._homeSpace is self.getSpace()
 
-        for path in normalPath[self.getTeam()]:
-            space = self.getSpace()
-            for direction in path:
-                space = space.getAdjacentSpace(direction)
-                if space is None:
-                    break
-            if space is not None:
-                if space.isOccupied():
-                    break
-                else:
-                    potentialSpaces.append(space)
-
-        for path in attackPath[self.getTeam()]:
-            space = self.getSpace()
-            for direction in path:
-                space = space.getAdjacentSpace(direction)
-                if space is None:
-                    break
-            if space is not None:
-                space.updateCanBeReachedByAPiece(self.getTeam())
-                if space.isOccupied():
-                    otherPiece: Piece = space.getPiece()
-                    if otherPiece.getTeam() != self.getTeam():
-                        potentialSpaces.append(space)
+    def getPointsValue(self) -> int:
+        return POINTS_VALUES["Pawn"]
 
-        self.potentialSpaces = potentialSpaces
+    def findPotentialTargets(self, position: Position) -> int:
+        return position.getPawnTargets(self.getSpace().getNumber(), self.getTeam())
 
-    def save(self, **kwargs):
-        config = self.getParser()
-        pieceState = {
-            "fileName": self.fileName,
-            "playerName": self.playerName,
-            "objectName": self.objectName,
-            "space": (
-                self.space.getNumber()
-                if (self.space is not None and self.isOnBoard)
-                else None
-            ),
-            "team": self.team,
-            "timesMoved": self.timesMoved,
-            "claimedPieces": self.claimedPieces,
-            "isOnBoard": self.isOnBoard,
-            "homeSpace": self._homeSpace.getNumber(),
-        }
-        # config.set("knights", f"{kwargs['number']}", pieceState)
-        config.set(
-            str(type(self).__name__).lower() + "s", f"{kwargs['number']}", pieceState
+    def getSaveState(self) -> dict:
+        pieceState = super().getSaveState()
+        pieceState["homeSpace"] = (
+            self._homeSpace.getNumber() if self._homeSpace is not None else None
         )
+        return pieceState
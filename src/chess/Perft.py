@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Literal
+
+from .MoveGenerator import MoveGenerator
+from .Position import Position
+
+
+class Perft:
+    """
+    Perft class counts the leaf nodes of the legal move tree of a position to a
+    fixed depth. The counts only depend on the rules, so they catch move
+    generation bugs, and the time taken to find them measures its speed.
+    """
+
+    def __init__(self, position: Position) -> None:
+        self.position = position
+
+    def perft(self, team: Literal["black", "white"], depth: int) -> int:
+        if depth == 0:
+            return 1
+
+        position = self.position
+        moves = MoveGenerator(position, team).generateLegalMoves()
+        # the leaves do not need to be played out, only counted
+        if depth == 1:
+            return len(moves)
+
+        opponentTeam = position.getOpponentTeam(team)
+        nodes = 0
+        for fromNumber, toNumber in moves:
+            undoRecord = position.makeMove(fromNumber, toNumber)
+            nodes += self.perft(opponentTeam, depth - 1)
+            position.unmakeMove(undoRecord)
+        return nodes
+
+    def divide(
+        self, team: Literal["black", "white"], depth: int
+    ) -> dict[tuple[int, int], int]:
+        """
+        Return the perft count below every legal move of the position, keyed by
+        (fromNumber, toNumber).
+        """
+        position = self.position
+        opponentTeam = position.getOpponentTeam(team)
+        counts = {}
+        for fromNumber, toNumber in MoveGenerator(position, team).generateLegalMoves():
+            undoRecord = position.makeMove(fromNumber, toNumber)
+            counts[(fromNumber, toNumber)] = self.perft(opponentTeam, depth - 1)
+            position.unmakeMove(undoRecord)
+        return counts
+
+    def measure(self, team: Literal["black", "white"], depth: int) -> dict:
+        """
+        Run perft and return the node count with the nodes searched per second.
+        """
+        start = perf_counter()
+        nodes = self.perft(team, depth)
+        seconds = perf_counter() - start
+        return {
+            "nodes": nodes,
+            "seconds": seconds,
+            "nodesPerSecond": nodes / seconds if seconds > 0 else 0.0,
+        }
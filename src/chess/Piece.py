@@ -3,18 +3,23 @@ from __future__ import annotations
 from abc import abstractmethod
 from typing import Literal, TypeVar
 
+from .engine.HighlightMixin import HighlightMixin
 from .engine.SaveLoadMixin import SaveLoadMixin
-from .engine.SpriteImage import SpriteImage
+from .MoveGenerator import MoveGenerator
+from .Position import Position
 from .Space import Space
 
 
-class Piece(SpriteImage, SaveLoadMixin):
+class Piece(HighlightMixin, SaveLoadMixin):
+    """
+    Piece class is the model of a piece: who owns it, the space it stands on
+    and where it can move. It is drawn by a PieceSprite and does not depend on
+    pygame. fileName names the piece's image for the sprite and the save file.
+    """
+
     def __init__(
         self,
         fileName: str = "knight_white",
-        relativeDir: str = "chess/data/piece/",
-        scale: int = 0.47,
-        coord: list = [0, 0],
         playerName: str = "defaultPlayerName",
         objectName: str = "defaultPieceName",
         space: Space | None = None,
@@ -23,8 +28,7 @@ class Piece(SpriteImage, SaveLoadMixin):
         if type(self) is Piece:
             raise Exception("Piece class is an abstract class")
 
-        self._layer = 3
-        SpriteImage.__init__(self, fileName, relativeDir, -1, scale, coord)
+        self.fileName = fileName
         self.objectName = objectName
         self.playerName = playerName
         self.space = None
@@ -39,10 +43,8 @@ class Piece(SpriteImage, SaveLoadMixin):
         if space is not None:
             self.setSpace(space)
 
-        self.movementSpeed = 50
-
         self.type: str = type(self).__name__
-        self.potentialSpaces: list[Space] | None = None
+        self.potentialSpaces: list[Space] = []
 
         self.opponentTeam = ""
         if self.team == "black":
@@ -58,9 +60,45 @@ class Piece(SpriteImage, SaveLoadMixin):
         pass
 
     @abstractmethod
-    def findAndRememberPotentialTiles(self):
+    def findPotentialTargets(self, position: Position) -> int:
+        """
+        Return a bitboard of the tile numbers this piece can move to.
+        """
         pass
 
+    def findAndRememberPotentialTiles(
+        self, moveGenerator: MoveGenerator, tiles: list[Space]
+    ):
+        """
+        Remember the tiles this piece can legally move to.
+        """
+        potentialSpaces: list[Space] = []
+        if self.getIsOnBoard():
+            targets = moveGenerator.filterTargets(
+                self.getSpace().getNumber(),
+                self.findPotentialTargets(moveGenerator.position),
+            )
+            potentialSpaces = [
+                tiles[number] for number in moveGenerator.position.iterateBits(targets)
+            ]
+
+        self.potentialSpaces = potentialSpaces
+
+    def canReachIgnoringCheck(self, position: Position, space: Space) -> bool:
+        """
+        Whether the piece could move to a space if its own king's safety was
+        not taken into account.
+        """
+        if not self.getIsOnBoard():
+            return False
+        return bool(self.findPotentialTargets(position) >> space.getNumber() & 1)
+
+    def getHomeSpace(self) -> Space | None:
+        return None
+
+    def isOnHomeSpace(self) -> bool:
+        return False
+
     def highlightTiles(self, highlight: bool = False):
         for space in self.potentialSpaces:
             if highlight:
@@ -99,7 +137,6 @@ class Piece(SpriteImage, SaveLoadMixin):
         if not newSpace.isOccupied():
             self.isOnBoard = True
             self.space = newSpace
-            self.findAndRememberPotentialTiles()
             return True
         return False
 
@@ -113,55 +150,9 @@ class Piece(SpriteImage, SaveLoadMixin):
         self.isOnBoard = False
         self.space = None
 
-    def update(self):
-        super().update()
-
-    def move(self, newSpace: Space, updatePosition=True) -> bool:
-        if newSpace.isHighlighted():
-            if not newSpace.isOccupied():
-                if self.getIsOnBoard():
-                    self.highlightTiles(highlight=False)
-
-                    # remove piece from space
-                    self.getSpace().removePiece()
-
-                # place piece on new space
-                self.setSpace(newSpace)
-                newSpace.placePiece(self)
-
-            else:
-                otherPiece: Piece = newSpace.getPiece()
-
-                if otherPiece.getTeam() == self.getTeam():
-                    return False
-
-                otherPiece.takeOffBoard()
-                if updatePosition:
-                    otherPiece.kill()
-
-                if self.getIsOnBoard():
-                    self.highlightTiles(highlight=False)
-
-                    # remove pieces from spaces
-                    newSpace.removePiece()
-                    self.getSpace().removePiece()
-
-                # place piece on new space
-                self.setSpace(newSpace)
-                newSpace.placePiece(self)
-
-                self.claimedPieces += 1
-
-            if updatePosition:
-                self.updatePosition(self.getSpace().getCoord())
-
-            self.timesMoved += 1
-            return True
-        return False
-
-    def save(self, **kwargs):
-        config = self.getParser()
-        pieceState = {
+    def getSaveState(self) -> dict:
+        return {
+            "class": type(self),
             "fileName": self.fileName,
             "playerName": self.playerName,
             "objectName": self.objectName,
@@ -175,10 +166,6 @@ class Piece(SpriteImage, SaveLoadMixin):
             "claimedPieces": self.claimedPieces,
             "isOnBoard": self.isOnBoard,
         }
-        # config.set("knights", f"{kwargs['number']}", pieceState)
-        config.set(
-            str(type(self).__name__).lower() + "s", f"{kwargs['number']}", pieceState
-        )
 
 
 TPiece = TypeVar("TPiece", bound=Piece)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from .engine.SpriteImage import SpriteImage
+from .Piece import Piece
+
+
+class PieceSprite(SpriteImage):
+    """
+    PieceSprite class draws a piece, sliding it to the tile its piece stands on
+    and removing itself from the screen once the piece is taken.
+    """
+
+    def __init__(
+        self,
+        piece: Piece,
+        tileCoords: list,
+        relativeDir: str = "chess/data/piece/",
+        scale: int = 0.47,
+    ) -> None:
+        self._layer = 3
+        SpriteImage.__init__(self, piece.getfileName(), relativeDir, -1, scale)
+        self.piece = piece
+        self.tileCoords = tileCoords
+        self.movementSpeed = 50
+
+    def getPiece(self) -> Piece:
+        return self.piece
+
+    def jumpToSpace(self):
+        """
+        Place the sprite on its piece's tile without animating the move there.
+        """
+        self.setCoord(self.tileCoords[self.piece.getSpace().getNumber()])
+
+    def isHighlighted(self) -> bool:
+        return self.piece.isHighlighted()
+
+    def update(self):
+        if not self.piece.getIsOnBoard():
+            self.kill()
+            return
+        self.updatePosition(self.tileCoords[self.piece.getSpace().getNumber()])
+        super().update()
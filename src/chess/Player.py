@@ -1,6 +1,5 @@
 from typing import Literal
 
-from .constants.BoardConfigSectionKeys import BoardConfigSectionKeys as cfgKeys
 from .engine.SaveLoadMixin import SaveLoadMixin
 
 
@@ -10,10 +9,12 @@ class Player(SaveLoadMixin):
         name: str,
         points: int = 0,
         team: Literal["black", "white"] = "default",
+        isComputer: bool = False,
     ):
         self.name: str = name
         self.points: int = points
         self.team = team
+        self.isComputer = isComputer
 
     def incrementPoints(self, points: int):
         self.points += points
@@ -30,11 +31,13 @@ class Player(SaveLoadMixin):
     def getTeam(self) -> Literal["black", "white"]:
         return self.team
 
-    def save(self, **kwargs):
-        config = self.getParser()
-        playerState = {
+    def isComputerPlayer(self) -> bool:
+        return self.isComputer
+
+    def getSaveState(self) -> dict:
+        return {
             "name": self.name,
             "team": self.team,
             "points": self.points,
+            "isComputer": self.isComputer,
         }
-        config.set(cfgKeys.PLAYERS, f"{kwargs['number']}", playerState)
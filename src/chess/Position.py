@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+from typing import Iterator, Literal
+
+from .AttackTables import (
+    DIAGONAL_DIRECTIONS,
+    DIRECTIONS,
+    STRAIGHT_DIRECTIONS,
+    AttackTables,
+    AttackTablesInstance,
+)
+from .constants.constants import PIECE_TYPES, TEAMS
+from .ZobristKeys import ZobristKeys, ZobristKeysInstance
+
+
+class Position:
+    """
+    Position class is a headless representation of the pieces on a board. Occupancy
+    is stored per team and per piece type as integer bitboards, where bit n is set
+    when tile n is occupied. Tile 0 is the top left corner of the board, so moving
+    "north" subtracts sideLength from a tile number. Attack geometry comes from
+    the AttackTables shared by every board of the same size.
+    """
+
+    def __init__(self, sideLength: int) -> None:
+        self.sideLength = sideLength
+        self.numberOfTiles = sideLength * sideLength
+        self.allTiles = (1 << self.numberOfTiles) - 1
+        self.tables: AttackTables = AttackTablesInstance.getInstance(sideLength)
+        self.zobristKeys: ZobristKeys = ZobristKeysInstance.getInstance(sideLength)
+
+        self.teams: dict[str, int] = {}
+        self.pieceTypes: dict[str, int] = {}
+        self.pawnHomes = 0
+        self.squares: list[tuple[str, str] | None] = []
+        self.pieceAttacks: list[int] = []
+        self.attackCounts: dict[str, list[int]] = {}
+        self.attackedTiles: dict[str, int] = {}
+        # Zobrist hash of the pieces and pawn home tiles, without the side to move
+        self.hash = 0
+        self._targetFinders = self._createTargetFinders()
+        self.clear()
+
+    def clear(self):
+        self.teams = {team: 0 for team in TEAMS}
+        self.pieceTypes = {pieceType: 0 for pieceType in PIECE_TYPES}
+        self.pawnHomes = 0
+        # (team, pieceType) of the piece on each tile
+        self.squares = [None] * self.numberOfTiles
+        # tiles attacked by the piece on each tile
+        self.pieceAttacks = [0] * self.numberOfTiles
+        # number of a team's pieces attacking each tile
+        self.attackCounts = {team: [0] * self.numberOfTiles for team in TEAMS}
+        self.attackedTiles = {team: 0 for team in TEAMS}
+        self.hash = 0
+
+    def copy(self) -> Position:
+        """
+        Return an independent copy of the position, which can be searched or
+        handed to another thread without touching this one.
+        """
+        position = Position.__new__(Position)
+        position.__dict__.update(self.__dict__)
+        position.teams = dict(self.teams)
+        position.pieceTypes = dict(self.pieceTypes)
+        position.squares = list(self.squares)
+        position.pieceAttacks = list(self.pieceAttacks)
+        position.attackCounts = {
+            team: list(counts) for team, counts in self.attackCounts.items()
+        }
+        position.attackedTiles = dict(self.attackedTiles)
+        position._targetFinders = position._createTargetFinders()
+        return position
+
+    def _createTargetFinders(self) -> dict:
+        return {
+            "Pawn": self.getPawnTargets,
+            "Knight": self.getKnightTargets,
+            "Bishop": self.getBishopTargets,
+            "Rook": self.getRookTargets,
+            "Queen": self.getQueenTargets,
+            "King": self.getKingTargets,
+        }
+
+    @staticmethod
+    def iterateBits(bitboard: int) -> Iterator[int]:
+        """
+        Yield the tile numbers of every set bit, lowest tile number first.
+        """
+        while bitboard:
+            lowestBit = bitboard & -bitboard
+            yield lowestBit.bit_length() - 1
+            bitboard ^= lowestBit
+
+    @staticmethod
+    def getOpponentTeam(team: Literal["black", "white"]) -> str:
+        return "black" if team == "white" else "white"
+
+    def placePiece(
+        self,
+        number: int,
+        team: Literal["black", "white"],
+        pieceType: str,
+        onHomeSpace: bool = False,
+    ):
+        if self.squares[number] is not None:
+            self.removePiece(number)
+
+        affectedSliders = self._findSlidersAttacking(1 << number)
+        for sliderNumber in affectedSliders:
+            self._removeAttacks(sliderNumber)
+
+        self._setOccupant(number, (team, pieceType), onHomeSpace)
+
+        for sliderNumber in affectedSliders:
+            self._addAttacks(sliderNumber)
+        self._addAttacks(number)
+
+    def placePieces(self, occupants: list[tuple[int, str, str, bool]]):
+        """
+        Set up an empty position from (number, team, pieceType, onHomeSpace)
+        tuples. Attacks are worked out once every piece is on the board, rather
+        than updating sliders as each piece is placed.
+        """
+        for number, team, pieceType, onHomeSpace in occupants:
+            self._setOccupant(number, (team, pieceType), onHomeSpace)
+        for number in self.iterateBits(self.getOccupied()):
+            self._addAttacks(number)
+
+    def removePiece(self, number: int):
+        if self.squares[number] is None:
+            return
+
+        affectedSliders = self._findSlidersAttacking(1 << number)
+        for sliderNumber in affectedSliders:
+            self._removeAttacks(sliderNumber)
+        self._removeAttacks(number)
+
+        self._clearOccupant(number)
+
+        for sliderNumber in affectedSliders:
+            self._addAttacks(sliderNumber)
+
+    def makeMove(self, fromNumber: int, toNumber: int) -> tuple:
+        """
+        Move the piece on fromNumber to toNumber, capturing whatever is there.
+        Returns a compact undo record to pass to unmakeMove().
+        """
+        moved = self.squares[fromNumber]
+        captured = self.squares[toNumber]
+        movedOnHomeSpace = bool(self.pawnHomes >> fromNumber & 1)
+        capturedOnHomeSpace = bool(self.pawnHomes >> toNumber & 1)
+
+        affectedSliders = [
+            number
+            for number in self._findSlidersAttacking(1 << fromNumber | 1 << toNumber)
+            if number != fromNumber and number != toNumber
+        ]
+        for sliderNumber in affectedSliders:
+            self._removeAttacks(sliderNumber)
+        self._removeAttacks(fromNumber)
+        if captured is not None:
+            self._removeAttacks(toNumber)
+            self._clearOccupant(toNumber)
+
+        # pawns only move forward, so a moved pawn never lands on its home tile
+        self._clearOccupant(fromNumber)
+        self._setOccupant(toNumber, moved, False)
+
+        self._addAttacks(toNumber)
+        for sliderNumber in affectedSliders:
+            self._addAttacks(sliderNumber)
+
+        return (fromNumber, toNumber, captured, movedOnHomeSpace, capturedOnHomeSpace)
+
+    def unmakeMove(self, undoRecord: tuple):
+        """
+        Reverse a move made with makeMove().
+        """
+        fromNumber, toNumber, captured, movedOnHomeSpace, capturedOnHomeSpace = (
+            undoRecord
+        )
+        moved = self.squares[toNumber]
+
+        affectedSliders = [
+            number
+            for number in self._findSlidersAttacking(1 << fromNumber | 1 << toNumber)
+            if number != toNumber
+        ]
+        for sliderNumber in affectedSliders:
+            self._removeAttacks(sliderNumber)
+        self._removeAttacks(toNumber)
+
+        self._clearOccupant(toNumber)
+        self._setOccupant(fromNumber, moved, movedOnHomeSpace)
+        if captured is not None:
+            self._setOccupant(toNumber, captured, capturedOnHomeSpace)
+            self._addAttacks(toNumber)
+
+        self._addAttacks(fromNumber)
+        for sliderNumber in affectedSliders:
+            self._addAttacks(sliderNumber)
+
+    def _setOccupant(self, number: int, occupant: tuple, onHomeSpace: bool):
+        team, pieceType = occupant
+        bit = 1 << number
+        self.teams[team] |= bit
+        self.pieceTypes[pieceType] |= bit
+        self.hash ^= self.zobristKeys.pieceKeys[occupant][number]
+        if onHomeSpace:
+            self.pawnHomes |= bit
+            self.hash ^= self.zobristKeys.pawnHomeKeys[number]
+        self.squares[number] = occupant
+
+    def _clearOccupant(self, number: int):
+        occupant = self.squares[number]
+        team, pieceType = occupant
+        bit = 1 << number
+        self.teams[team] &= ~bit
+        self.pieceTypes[pieceType] &= ~bit
+        self.hash ^= self.zobristKeys.pieceKeys[occupant][number]
+        if self.pawnHomes & bit:
+            self.pawnHomes &= ~bit
+            self.hash ^= self.zobristKeys.pawnHomeKeys[number]
+        self.squares[number] = None
+
+    def _findSlidersAttacking(self, tiles: int) -> list[int]:
+        """
+        Return the tile numbers of sliding pieces whose rays reach any of the given
+        tiles. These are the only pieces whose attacks change when the tiles are
+        vacated or occupied.
+        """
+        pieceTypes = self.pieceTypes
+        sliders = pieceTypes["Rook"] | pieceTypes["Bishop"] | pieceTypes["Queen"]
+        return [
+            number
+            for number in self.iterateBits(sliders)
+            if self.pieceAttacks[number] & tiles
+        ]
+
+    def _findPieceAttacks(self, number: int) -> int:
+        team, pieceType = self.squares[number]
+        if pieceType == "Knight":
+            return self.tables.knightAttacks[number]
+        if pieceType == "King":
+            return self.tables.kingAttacks[number]
+        if pieceType == "Pawn":
+            return self.tables.pawnAttacks[team][number]
+
+        # sliding pieces see through the opponent's king
+        opponentKing = self.getPieces(self.getOpponentTeam(team), "King")
+        occupied = self.getOccupied() & ~opponentKing
+        if pieceType == "Rook":
+            return self._slide(1 << number, STRAIGHT_DIRECTIONS, occupied)
+        if pieceType == "Bishop":
+            return self._slide(1 << number, DIAGONAL_DIRECTIONS, occupied)
+        return self._slide(1 << number, DIRECTIONS, occupied)
+
+    def _addAttacks(self, number: int):
+        team = self.squares[number][0]
+        attacks = self._findPieceAttacks(number)
+        self.pieceAttacks[number] = attacks
+
+        attackCounts = self.attackCounts[team]
+        newlyAttacked = 0
+        for target in self.iterateBits(attacks):
+            if not attackCounts[target]:
+                newlyAttacked |= 1 << target
+            attackCounts[target] += 1
+        self.attackedTiles[team] |= newlyAttacked
+
+    def _removeAttacks(self, number: int):
+        team = self.squares[number][0]
+        attacks = self.pieceAttacks[number]
+        self.pieceAttacks[number] = 0
+
+        attackCounts = self.attackCounts[team]
+        noLongerAttacked = 0
+        for target in self.iterateBits(attacks):
+            attackCounts[target] -= 1
+            if not attackCounts[target]:
+                noLongerAttacked |= 1 << target
+        self.attackedTiles[team] &= ~noLongerAttacked
+
+    def getOccupied(self) -> int:
+        return self.teams["white"] | self.teams["black"]
+
+    def getTeamAt(self, number: int) -> str | None:
+        occupant = self.squares[number]
+        return occupant[0] if occupant is not None else None
+
+    def getPieceTypeAt(self, number: int) -> str | None:
+        occupant = self.squares[number]
+        return occupant[1] if occupant is not None else None
+
+    def getPieces(self, team: Literal["black", "white"], pieceType: str) -> int:
+        return self.teams[team] & self.pieceTypes[pieceType]
+
+    def isAttacked(self, number: int, team: Literal["black", "white"]) -> bool:
+        return bool(self.attackCounts[team][number])
+
+    def getKnightAttacks(self, knights: int) -> int:
+        knightAttacks = self.tables.knightAttacks
+        attacks = 0
+        for number in self.iterateBits(knights):
+            attacks |= knightAttacks[number]
+        return attacks
+
+    def getKingAttacks(self, kings: int) -> int:
+        kingAttacks = self.tables.kingAttacks
+        attacks = 0
+        for number in self.iterateBits(kings):
+            attacks |= kingAttacks[number]
+        return attacks
+
+    def getPawnAttacks(self, pawns: int, team: Literal["black", "white"]) -> int:
+        pawnAttacks = self.tables.pawnAttacks[team]
+        attacks = 0
+        for number in self.iterateBits(pawns):
+            attacks |= pawnAttacks[number]
+        return attacks
+
+    def _slide(self, sliders: int, directions: dict, occupied: int) -> int:
+        """
+        Return the tiles every slider can see along each direction, up to and
+        including the first occupied tile.
+        """
+        getRayAttacks = self.tables.getRayAttacks
+        attacks = 0
+        for number in self.iterateBits(sliders):
+            for direction in directions:
+                attacks |= getRayAttacks(number, direction, occupied)
+        return attacks
+
+    def getAttackedTiles(self, team: Literal["black", "white"]) -> int:
+        """
+        Return every tile a team's pieces can reach, including tiles defended by
+        the team. Sliding pieces see through the opponent's king so that the king
+        cannot step back along the line it is being attacked on.
+        """
+        return self.attackedTiles[team]
+
+    def getTargets(self, number: int) -> int:
+        """
+        Return the tiles the piece on a tile could move to if its own king's
+        safety is ignored. Empty tiles have no targets.
+        """
+        occupant = self.squares[number]
+        if occupant is None:
+            return 0
+        team, pieceType = occupant
+        return self._targetFinders[pieceType](number, team)
+
+    def getKnightTargets(self, number: int, team: Literal["black", "white"]) -> int:
+        return self.tables.knightAttacks[number] & ~self.teams[team]
+
+    def getKingTargets(self, number: int, team: Literal["black", "white"]) -> int:
+        return (
+            self.tables.kingAttacks[number]
+            & ~self.teams[team]
+            & ~self.getAttackedTiles(self.getOpponentTeam(team))
+        )
+
+    def getPawnTargets(self, number: int, team: Literal["black", "white"]) -> int:
+        empty = ~self.getOccupied()
+        targets = self.tables.pawnPushes[team][number] & empty
+        # a pawn cannot jump over the piece in front of it
+        if targets and self.pawnHomes >> number & 1:
+            targets |= self.tables.pawnDoublePushes[team][number] & empty
+        enemies = self.teams[self.getOpponentTeam(team)]
+        return targets | (self.tables.pawnAttacks[team][number] & enemies)
+
+    def getRookTargets(self, number: int, team: Literal["black", "white"]) -> int:
+        return (
+            self._slide(1 << number, STRAIGHT_DIRECTIONS, self.getOccupied())
+            & ~self.teams[team]
+        )
+
+    def getBishopTargets(self, number: int, team: Literal["black", "white"]) -> int:
+        return (
+            self._slide(1 << number, DIAGONAL_DIRECTIONS, self.getOccupied())
+            & ~self.teams[team]
+        )
+
+    def getQueenTargets(self, number: int, team: Literal["black", "white"]) -> int:
+        return self.getRookTargets(number, team) | self.getBishopTargets(number, team)
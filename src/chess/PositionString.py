@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, Literal
+
+from .Position import Position
+from .schemas.PositionSetup import PositionSetup
+
+# A position string is a FEN-like line of five fields, for boards of any size:
+#   placement       rows from the top of the board (black's side) separated by
+#                   "/", a letter per piece, upper case for white, and the
+#                   number of empty tiles between them
+#   side to move    "w" or "b"
+#   pawn homes      the tiles of pawns still on their home tile, such as
+#                   "a2b2c2", or "-"
+#   halfmove clock  moves since the last capture or pawn move
+#   fullmove number starting at 1, counted up after every black move
+# Tiles are named by file letter and rank, rank 1 being the bottom row.
+# The standard start is
+#   rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w a7b7c7d7e7f7g7h7a2b2c2d2e2f2g2h2 0 1
+PIECE_LETTERS = {
+    "P": "Pawn",
+    "N": "Knight",
+    "B": "Bishop",
+    "R": "Rook",
+    "Q": "Queen",
+    "K": "King",
+}
+# letter -> (team, pieceType) of the piece it stands for
+OCCUPANTS = {
+    **{letter: ("white", pieceType) for letter, pieceType in PIECE_LETTERS.items()},
+    **{
+        letter.lower(): ("black", pieceType)
+        for letter, pieceType in PIECE_LETTERS.items()
+    },
+}
+LETTERS = {occupant: letter for letter, occupant in OCCUPANTS.items()}
+TEAM_LETTERS = {"w": "white", "b": "black"}
+TEAMS_TO_LETTERS = {team: letter for letter, team in TEAM_LETTERS.items()}
+# file letters run out after z
+MAX_SIDE_LENGTH = 26
+
+PLACEMENT_TOKENS = re.compile(r"\d+|\D")
+PAWN_HOMES = re.compile(r"(?:[a-z]\d+)+")
+TILE_NAMES = re.compile(r"([a-z])(\d+)")
+
+
+@lru_cache(maxsize=4096)
+def _parseRow(row: str) -> tuple:
+    """
+    Return the occupants of a row of the placement, None for an empty tile.
+    Rows repeat a lot between positions, so they are parsed once.
+    """
+    squares = []
+    for token in PLACEMENT_TOKENS.findall(row):
+        occupant = OCCUPANTS.get(token)
+        if occupant is not None:
+            squares.append(occupant)
+        elif token.isdigit():
+            squares.extend((None,) * int(token))
+        else:
+            raise ValueError(f"Unknown piece {token} in row {row}")
+    return tuple(squares)
+
+
+@lru_cache(maxsize=4096)
+def _formatRow(squares: tuple) -> str:
+    row = []
+    emptyTiles = 0
+    for occupant in squares:
+        if occupant is None:
+            emptyTiles += 1
+            continue
+        if emptyTiles:
+            row.append(str(emptyTiles))
+            emptyTiles = 0
+        row.append(LETTERS[occupant])
+    if emptyTiles:
+        row.append(str(emptyTiles))
+    return "".join(row)
+
+
+def getTileName(number: int, sideLength: int) -> str:
+    row, column = divmod(number, sideLength)
+    return f"{chr(ord('a') + column)}{sideLength - row}"
+
+
+def getTileNumber(tileName: str, sideLength: int) -> int:
+    match = TILE_NAMES.fullmatch(tileName)
+    if match is None:
+        raise ValueError(f"{tileName} is not a tile name")
+    column = ord(match.group(1)) - ord("a")
+    row = sideLength - int(match.group(2))
+    if not (0 <= column < sideLength and 0 <= row < sideLength):
+        raise ValueError(f"{tileName} is not on a {sideLength}x{sideLength} board")
+    return row * sideLength + column
+
+
+def parsePositionString(text: str) -> PositionSetup:
+    """
+    Read a position string, raising ValueError if it is not one. The notation
+    is checked, and that each team has one king and the side not to move is
+    not in check, as a game cannot be played otherwise, but not whether the
+    position could arise in a game.
+    """
+    fields = text.split()
+    if len(fields) != 5:
+        raise ValueError(f"Position string needs 5 fields, got {len(fields)}: {text}")
+    placement, teamLetter, pawnHomesField, halfmoveClock, fullmoveNumber = fields
+
+    rows = placement.split("/")
+    sideLength = len(rows)
+    if sideLength > MAX_SIDE_LENGTH:
+        raise ValueError(f"Boards are at most {MAX_SIDE_LENGTH} tiles wide")
+    squares = []
+    for row in rows:
+        rowSquares = _parseRow(row)
+        if len(rowSquares) != sideLength:
+            raise ValueError(f"Row {row} is not {sideLength} tiles long")
+        squares.extend(rowSquares)
+    for team in TEAMS_TO_LETTERS:
+        kings = squares.count((team, "King"))
+        if kings != 1:
+            raise ValueError(f"The {team} team needs one king, not {kings}")
+
+    if teamLetter not in TEAM_LETTERS:
+        raise ValueError(f"Side to move is w or b, not {teamLetter}")
+
+    pawnHomes = []
+    if pawnHomesField != "-":
+        if PAWN_HOMES.fullmatch(pawnHomesField) is None:
+            raise ValueError(f"{pawnHomesField} is not a list of tiles")
+        for column, rank in TILE_NAMES.findall(pawnHomesField):
+            number = getTileNumber(column + rank, sideLength)
+            if squares[number] is None or squares[number][1] != "Pawn":
+                raise ValueError(f"There is no pawn on home tile {column}{rank}")
+            pawnHomes.append(number)
+        pawnHomes.sort()
+
+    if not (halfmoveClock.isdigit() and fullmoveNumber.isdigit()):
+        raise ValueError(
+            f"Move counters {halfmoveClock} {fullmoveNumber} are not numbers"
+        )
+    if int(fullmoveNumber) < 1:
+        raise ValueError("The fullmove number starts at 1")
+
+    setup = PositionSetup(
+        sideLength=sideLength,
+        squares=squares,
+        team=TEAM_LETTERS[teamLetter],
+        pawnHomes=pawnHomes,
+        halfmoveClock=int(halfmoveClock),
+        fullmoveNumber=int(fullmoveNumber),
+    )
+    # the side that just moved cannot have left its king attacked
+    position = createPosition(setup)
+    opponentTeam = position.getOpponentTeam(setup.team)
+    if position.attackedTiles[setup.team] & position.getPieces(opponentTeam, "King"):
+        raise ValueError(f"The {opponentTeam} king is in check but it is not to move")
+    return setup
+
+
+def formatPositionString(setup: PositionSetup) -> str:
+    sideLength = setup.sideLength
+    squares = setup.squares
+    placement = "/".join(
+        _formatRow(tuple(squares[start : start + sideLength]))
+        for start in range(0, sideLength * sideLength, sideLength)
+    )
+    pawnHomes = "".join(
+        getTileName(number, sideLength) for number in sorted(setup.pawnHomes)
+    )
+    return (
+        f"{placement} {TEAMS_TO_LETTERS[setup.team]} {pawnHomes or '-'} "
+        f"{setup.halfmoveClock} {setup.fullmoveNumber}"
+    )
+
+
+def parsePositionStrings(texts: Iterable[str]) -> list[PositionSetup]:
+    return [parsePositionString(text) for text in texts]
+
+
+def formatPositionStrings(setups: Iterable[PositionSetup]) -> list[str]:
+    return [formatPositionString(setup) for setup in setups]
+
+
+def getPositionSetup(
+    position: Position,
+    team: Literal["black", "white"],
+    halfmoveClock: int = 0,
+    fullmoveNumber: int = 1,
+) -> PositionSetup:
+    return PositionSetup(
+        sideLength=position.sideLength,
+        squares=list(position.squares),
+        team=team,
+        pawnHomes=list(Position.iterateBits(position.pawnHomes)),
+        halfmoveClock=halfmoveClock,
+        fullmoveNumber=fullmoveNumber,
+    )
+
+
+def createPosition(setup: PositionSetup) -> Position:
+    """
+    Return the bitboard position of a setup, for the engine and analysis,
+    without building a Board.
+    """
+    position = Position(setup.sideLength)
+    pawnHomes = set(setup.pawnHomes)
+    position.placePieces(
+        [
+            (number, occupant[0], occupant[1], number in pawnHomes)
+            for number, occupant in enumerate(setup.squares)
+            if occupant is not None
+        ]
+    )
+    return position
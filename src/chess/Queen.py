@@ -1,7 +1,8 @@
 from typing import Literal
 
-from .King import King
+from .constants.constants import POINTS_VALUES
 from .Piece import Piece
+from .Position import Position
 from .Space import Space
 
 
@@ -9,9 +10,6 @@ class Queen(Piece):
     def __init__(
         self,
         fileName: str = "queen_white",
-        relativeDir: str = "chess/data/piece/",
-        scale: int = 0.47,
-        coord: list = [0, 0],
         playerName: str = "defaultPlayerName",
         objectName: str = "defaultPieceName",
         space: Space | None = None,
@@ -20,9 +18,6 @@ class Queen(Piece):
         Piece.__init__(
             self=self,
             fileName=fileName,
-            relativeDir=relativeDir,
-            scale=scale,
-            coord=coord,
             playerName=playerName,
             objectName=objectName,
             space=space,
@@ -30,53 +25,7 @@ class Queen(Piece):
         )
 
     def getPointsValue(self) -> int:
-        return 9
+        return POINTS_VALUES["Queen"]
 
-    def findAndRememberPotentialTiles(self):
-        paths = [
-            ["north", "east"],
-            ["north", "west"],
-            ["south", "east"],
-            ["south", "west"],
-            ["north"],
-            ["south"],
-            ["east"],
-            ["west"],
-        ]
-        potentialSpaces: list[Space] = []
-        for path in paths:
-            space = self.getSpace()
-            while space is not None:
-                for direction in path:
-                    space = space.getAdjacentSpace(direction)
-                    if space is None:
-                        break
-                if space is not None:
-                    if space.isOccupied():
-                        otherPiece: Piece = space.getPiece()
-                        if otherPiece.getTeam() != self.getTeam():
-                            potentialSpaces.append(space)
-                        break
-                    else:
-                        potentialSpaces.append(space)
-
-        for path in paths:
-            space = self.getSpace()
-            while space is not None:
-                for direction in path:
-                    space = space.getAdjacentSpace(direction)
-                    if space is None:
-                        break
-                if space is not None:
-                    space.updateCanBeReachedByAPiece(self.getTeam())
-                    if space.isOccupied():
-                        otherPiece: Piece = space.getPiece()
-                        if (
-                            otherPiece.getTeam() != self.getTeam()
-                            and type(otherPiece) is King
-                        ):
-                            pass
-                        else:
-                            break
-
-        self.potentialSpaces = potentialSpaces
+    def findPotentialTargets(self, position: Position) -> int:
+        return position.getQueenTargets(self.getSpace().getNumber(), self.getTeam())
@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import ast
+import configparser
+import os
+import struct
+
+from .Bishop import Bishop
+from .constants.BoardConfigSectionKeys import BoardConfigSectionKeys as cfgKeys
+from .constants.constants import LEGACY_SAVE_FILE, PIECE_TYPES, SAVE_FILE, TEAMS
+from .King import King
+from .Knight import Knight
+from .Pawn import Pawn
+from .Queen import Queen
+from .Rook import Rook
+from .schemas.SaveData import SaveData
+
+# Version 2 layout, little endian, every table fixed width:
+#   header  magic, version, tiles, players, current player, pieces, moves,
+#           starting halfmove clock, starting fullmove number
+#   players name, team, isComputer, points
+#   pieces  type, team, player, isOnBoard, space, homeSpace, timesMoved,
+#           claimedPieces, objectName
+#   moves   piece, otherPiece, oldSpace, newSpace
+# Teams and piece types are indices into TEAMS and PIECE_TYPES, players and
+# pieces are indices into their tables. A piece's file name is its type and
+# team, so it is not stored. The move counters are those the game started
+# from, see Board.getMoveCounters(). Version 1 headers end at moves, and those
+# games started from (0, 1).
+MAGIC = b"KCSV"
+VERSION = 2
+HEADER = struct.Struct("<4sBHBBHIII")
+VERSION_1_HEADER = struct.Struct("<4sBHBBHI")
+PLAYER = struct.Struct("<16sB?i")
+PIECE = struct.Struct("<BBB?HHIH16s")
+MOVE = struct.Struct("<HHHH")
+# space, homeSpace and otherPiece when there is none
+NONE = 0xFFFF
+
+PIECE_CLASSES = {
+    "Pawn": Pawn,
+    "Knight": Knight,
+    "Bishop": Bishop,
+    "Rook": Rook,
+    "Queen": Queen,
+    "King": King,
+}
+# .cfg piece sections, in the order they were written
+LEGACY_PIECE_SECTIONS = {
+    cfgKeys.KNIGHTS: Knight,
+    cfgKeys.ROOKS: Rook,
+    cfgKeys.PAWNS: Pawn,
+    cfgKeys.BISHOPS: Bishop,
+    cfgKeys.QUEENS: Queen,
+    cfgKeys.KINGS: King,
+}
+
+
+def _encodeName(name: str) -> bytes:
+    encoded = name.encode("utf-8")
+    if len(encoded) > 16:
+        raise ValueError(f"{name} is longer than 16 bytes")
+    return encoded
+
+
+def _decodeName(name: bytes) -> str:
+    return name.rstrip(b"\0").decode("utf-8")
+
+
+def _encodeTile(number: int | None) -> int:
+    return NONE if number is None else number
+
+
+def _decodeTile(number: int) -> int | None:
+    return None if number == NONE else number
+
+
+def encodeSaveData(saveData: SaveData) -> bytes:
+    playerIndices = {
+        player["name"]: index for index, player in enumerate(saveData.players)
+    }
+    buffer = bytearray(
+        HEADER.size
+        + PLAYER.size * len(saveData.players)
+        + PIECE.size * len(saveData.pieces)
+        + MOVE.size * len(saveData.moves)
+    )
+    HEADER.pack_into(
+        buffer,
+        0,
+        MAGIC,
+        VERSION,
+        saveData.numberOfTiles,
+        len(saveData.players),
+        playerIndices[saveData.currentPlayer],
+        len(saveData.pieces),
+        len(saveData.moves),
+        *saveData.startingMoveCounters,
+    )
+    offset = HEADER.size
+    for player in saveData.players:
+        PLAYER.pack_into(
+            buffer,
+            offset,
+            _encodeName(player["name"]),
+            TEAMS.index(player["team"]),
+            player["isComputer"],
+            player["points"],
+        )
+        offset += PLAYER.size
+    for pConfig in saveData.pieces:
+        PIECE.pack_into(
+            buffer,
+            offset,
+            PIECE_TYPES.index(pConfig["class"].__name__),
+            TEAMS.index(pConfig["team"]),
+            playerIndices[pConfig["playerName"]],
+            pConfig["isOnBoard"],
+            _encodeTile(pConfig["space"]),
+            _encodeTile(pConfig.get("homeSpace")),
+            pConfig["timesMoved"],
+            pConfig["claimedPieces"],
+            _encodeName(pConfig["objectName"]),
+        )
+        offset += PIECE.size
+    for piece, otherPiece, oldSpace, newSpace in saveData.moves:
+        MOVE.pack_into(
+            buffer, offset, piece, _encodeTile(otherPiece), oldSpace, newSpace
+        )
+        offset += MOVE.size
+    return bytes(buffer)
+
+
+def decodeSaveData(data: bytes | memoryview) -> SaveData:
+    data = memoryview(data)
+    if len(data) < VERSION_1_HEADER.size or data[:4] != MAGIC:
+        raise ValueError("Not a save file")
+    version = data[4]
+    if version == VERSION:
+        header = HEADER
+    elif version == 1:
+        header = VERSION_1_HEADER
+    else:
+        raise ValueError(f"Save file version {version} is not supported")
+    if len(data) < header.size:
+        raise ValueError("Save file is truncated or corrupt")
+    (
+        _magic,
+        _version,
+        numberOfTiles,
+        playerCount,
+        currentPlayerIndex,
+        pieceCount,
+        moveCount,
+        *startingMoveCounters,
+    ) = header.unpack_from(data, 0)
+    if len(data) != (
+        header.size
+        + PLAYER.size * playerCount
+        + PIECE.size * pieceCount
+        + MOVE.size * moveCount
+    ):
+        raise ValueError("Save file is truncated or corrupt")
+
+    offset = header.size
+    end = offset + PLAYER.size * playerCount
+    players = [
+        {
+            "name": _decodeName(name),
+            "team": TEAMS[team],
+            "points": points,
+            "isComputer": isComputer,
+        }
+        for name, team, isComputer, points in PLAYER.iter_unpack(data[offset:end])
+    ]
+
+    offset, end = end, end + PIECE.size * pieceCount
+    pieces = []
+    for (
+        typeIndex,
+        teamIndex,
+        playerIndex,
+        isOnBoard,
+        space,
+        homeSpace,
+        timesMoved,
+        claimedPieces,
+        objectName,
+    ) in PIECE.iter_unpack(data[offset:end]):
+        pieceType = PIECE_TYPES[typeIndex]
+        team = TEAMS[teamIndex]
+        pConfig = {
+            "class": PIECE_CLASSES[pieceType],
+            "fileName": f"{pieceType.lower()}_{team}",
+            "playerName": players[playerIndex]["name"],
+            "objectName": _decodeName(objectName),
+            "space": _decodeTile(space),
+            "team": team,
+            "timesMoved": timesMoved,
+            "claimedPieces": claimedPieces,
+            "isOnBoard": isOnBoard,
+        }
+        if pieceType == "Pawn":
+            pConfig["homeSpace"] = _decodeTile(homeSpace)
+        pieces.append(pConfig)
+
+    offset, end = end, end + MOVE.size * moveCount
+    moves = [
+        (piece, _decodeTile(otherPiece), oldSpace, newSpace)
+        for piece, otherPiece, oldSpace, newSpace in MOVE.iter_unpack(data[offset:end])
+    ]
+
+    return SaveData(
+        numberOfTiles=numberOfTiles,
+        pieces=pieces,
+        players=players,
+        currentPlayer=players[currentPlayerIndex]["name"],
+        moves=moves,
+        startingMoveCounters=tuple(startingMoveCounters) or (0, 1),
+    )
+
+
+def decodeConfigSaveData(text: str) -> SaveData:
+    """
+    Read a save in the .cfg format saves were written in before the binary
+    format, where every section entry is a dictionary literal.
+    """
+    config = configparser.RawConfigParser()
+    config.read_string(text)
+
+    def _loadSectionData(section: str) -> list[dict]:
+        length = int(config.get(section, "length"))
+        return [
+            ast.literal_eval(config.get(section, f"{number}"))
+            for number in range(0, length)
+        ]
+
+    pieces = []
+    for section, pieceClass in LEGACY_PIECE_SECTIONS.items():
+        for pConfig in _loadSectionData(section):
+            pConfig["class"] = pieceClass
+            pieces.append(pConfig)
+    pieceIndices = {
+        pConfig["objectName"]: index for index, pConfig in enumerate(pieces)
+    }
+
+    players = [
+        {
+            "name": playerConfig["name"],
+            "team": playerConfig["team"],
+            "points": playerConfig["points"],
+            # saves from before computer players existed only hold human players
+            "isComputer": playerConfig.get("isComputer", False),
+        }
+        for playerConfig in _loadSectionData(cfgKeys.PLAYERS)
+    ]
+
+    moves = [
+        (
+            pieceIndices[movesConfig["piece"]],
+            (
+                pieceIndices[movesConfig["otherPiece"]]
+                if movesConfig["otherPiece"] is not None
+                else None
+            ),
+            movesConfig["oldSpace"],
+            movesConfig["newSpace"],
+        )
+        for movesConfig in _loadSectionData(cfgKeys.MOVES)
+    ]
+
+    return SaveData(
+        numberOfTiles=int(config.get(cfgKeys.TILES, "length")),
+        pieces=pieces,
+        players=players,
+        currentPlayer=_loadSectionData(cfgKeys.BOARD)[0]["currentPlayer"],
+        moves=moves,
+        startingMoveCounters=(0, 1),
+    )
+
+
+def readSaveFile(fileName: str) -> SaveData:
+    """
+    Read a save file, binary or .cfg, telling them apart by the magic number.
+    """
+    with open(fileName, "rb") as saveFile:
+        data = saveFile.read()
+    if data[:4] == MAGIC:
+        return decodeSaveData(data)
+    return decodeConfigSaveData(data.decode("utf-8"))
+
+
+def replaceFile(fileName: str, data: bytes):
+    """
+    Write a file through a temporary file renamed over it once it is on disk,
+    so a crash midway leaves the old file rather than half of the new one.
+    """
+    temporaryFileName = f"{fileName}.tmp"
+    with open(temporaryFileName, "wb") as saveFile:
+        saveFile.write(data)
+        saveFile.flush()
+        os.fsync(saveFile.fileno())
+    os.replace(temporaryFileName, fileName)
+
+
+def writeSaveFile(fileName: str, saveData: SaveData) -> bytes:
+    """
+    Write a binary save file, returning the bytes written.
+    """
+    data = encodeSaveData(saveData)
+    replaceFile(fileName, data)
+    return data
+
+
+def findSaveFile() -> str | None:
+    """
+    Return the save file to load: the binary save, or a .cfg save left from
+    before the binary format, or None when there is neither.
+    """
+    for fileName in (SAVE_FILE, LEGACY_SAVE_FILE):
+        if os.path.isfile(fileName):
+            return fileName
+    return None
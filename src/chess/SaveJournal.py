@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import traceback
+import zlib
+from time import perf_counter
+
+from .Board import Board
+from .constants.constants import JOURNAL_COMPACTION_RECORDS, SAVE_FILE
+from .engine.Profiler import SAVE, Profiler, ProfilerInstance
+from .SaveFile import replaceFile, writeSaveFile
+from .schemas.MoveRecord import MoveRecord
+from .schemas.SaveData import SaveData
+
+# A journal holds the moves and undos made since its save file was written, so
+# a turn appends one record instead of rewriting the save:
+#   header  magic, version, CRC-32 of the save file the journal follows
+#   records kind, fromNumber, toNumber, check
+# A journal whose CRC does not match its save file was left behind by an older
+# save and is ignored. Reading stops at the first short or damaged record, as
+# left by a crash in the middle of an append.
+JOURNAL_MAGIC = b"KCJL"
+JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct("<4sBxxxI")
+RECORD_BODY = struct.Struct("<BxHH")
+RECORD = struct.Struct("<BxHHH")
+CHECK = struct.Struct("<H")
+MOVE_RECORD = 1
+UNDO_RECORD = 2
+
+
+def getJournalFileName(saveFileName: str) -> str:
+    return os.path.splitext(saveFileName)[0] + ".kcj"
+
+
+def _getCheck(body: bytes | memoryview) -> int:
+    return zlib.crc32(body) & 0xFFFF
+
+
+def readJournalFile(saveFileName: str) -> list[tuple[int, int, int]]:
+    """
+    Return the (kind, fromNumber, toNumber) records journalled after a save
+    file was written, or an empty list when it has no journal.
+    """
+    journalFileName = getJournalFileName(saveFileName)
+    if not os.path.isfile(journalFileName):
+        return []
+    with open(saveFileName, "rb") as saveFile:
+        checksum = zlib.crc32(saveFile.read())
+    with open(journalFileName, "rb") as journalFile:
+        data = memoryview(journalFile.read())
+
+    if len(data) < JOURNAL_HEADER.size:
+        return []
+    magic, version, saveChecksum = JOURNAL_HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        return []
+    if saveChecksum != checksum:
+        return []
+
+    records = []
+    end = len(data) - (len(data) - JOURNAL_HEADER.size) % RECORD.size
+    for offset in range(JOURNAL_HEADER.size, end, RECORD.size):
+        kind, fromNumber, toNumber, check = RECORD.unpack_from(data, offset)
+        if kind not in (MOVE_RECORD, UNDO_RECORD):
+            break
+        if check != _getCheck(data[offset : offset + RECORD_BODY.size]):
+            break
+        records.append((kind, fromNumber, toNumber))
+    return records
+
+
+def replayJournal(board: Board, records: list[tuple[int, int, int]]) -> int:
+    """
+    Play journalled moves and undos on a board loaded from the journal's save
+    file. Stops at the first record the board does not allow, and returns how
+    many records were replayed.
+    """
+    tiles = board.getTiles()
+    for replayed, (kind, fromNumber, toNumber) in enumerate(records):
+        if kind == UNDO_RECORD:
+            if board.takeBackMove() is None:
+                return replayed
+            continue
+
+        if fromNumber >= len(tiles) or toNumber >= len(tiles):
+            return replayed
+        piece = tiles[fromNumber].getPiece()
+        if piece is None:
+            return replayed
+        if piece.getPlayerName() != board.getCurrentPlayer().getName():
+            return replayed
+        if tiles[toNumber] not in piece.getPotentialSpaces():
+            return replayed
+        board.commitMove(piece, tiles[toNumber])
+    return len(records)
+
+
+class SaveJournal:
+    """
+    SaveJournal class keeps the save file up to date after every turn by
+    appending a fixed-size record to a journal, whatever the length of the
+    game. Every compactionRecords records, or when the game being saved
+    changes, the save file is rewritten from the board and the journal starts
+    over empty.
+
+    Files are written on a thread of the journal's own, so turns never wait
+    for the disk. Writes queued while the thread is busy are coalesced: a save
+    replaces everything queued before it, as it holds those turns, and records
+    queued together are appended in one write. Every write is fsynced before
+    it counts as done, and its latency is recorded by the profiler.
+
+    Loading replays the journal on the save file, see readJournalFile() and
+    replayJournal().
+    """
+
+    def __init__(
+        self,
+        saveFileName: str = SAVE_FILE,
+        compactionRecords: int = JOURNAL_COMPACTION_RECORDS,
+        profiler: Profiler | None = None,
+    ) -> None:
+        self.saveFileName = saveFileName
+        self.journalFileName = getJournalFileName(saveFileName)
+        self.compactionRecords = compactionRecords
+        self.profiler = profiler or ProfilerInstance.getInstance()
+        # the board the save file and journal follow
+        self.board: Board | None = None
+        self.recordCount = 0
+
+        # queued writes, shared with the writer thread
+        self.condition = threading.Condition()
+        self.pendingSave: SaveData | None = None
+        self.pendingRecords: list[bytes] = []
+        self.isWriting = False
+        self.thread: threading.Thread | None = None
+        # only used by the writer thread
+        self.journalFile: int | None = None
+
+    def recordMove(self, board: Board, move: MoveRecord):
+        """
+        To be called after a move has been committed to the board.
+        """
+        self._record(
+            board, MOVE_RECORD, move.oldSpace.getNumber(), move.newSpace.getNumber()
+        )
+
+    def recordUndo(self, board: Board):
+        """
+        To be called after a move has been taken back.
+        """
+        self._record(board, UNDO_RECORD, 0, 0)
+
+    def _record(self, board: Board, kind: int, fromNumber: int, toNumber: int):
+        # the compacted save already holds the turn being recorded
+        if board is not self.board or self.recordCount >= self.compactionRecords:
+            self.compact(board)
+            return
+        body = RECORD_BODY.pack(kind, fromNumber, toNumber)
+        with self.condition:
+            self.pendingRecords.append(body + CHECK.pack(_getCheck(body)))
+            self._startWriting()
+        self.recordCount += 1
+
+    def compact(self, board: Board):
+        """
+        Queue a rewrite of the save file from the board, after which the
+        journal starts over empty. A crash between writing the two leaves a
+        journal that no longer matches the save file, which loading ignores.
+        """
+        # the save state is built from fresh objects, so the board can carry
+        # on changing while it is written
+        saveData = board.getSaveState()
+        with self.condition:
+            self.pendingSave = saveData
+            self.pendingRecords = []
+            self._startWriting()
+        self.board = board
+        self.recordCount = 0
+
+    def flush(self):
+        """
+        Wait until every queued write is on disk.
+        """
+        with self.condition:
+            while self.pendingSave is not None or self.pendingRecords or self.isWriting:
+                self.condition.wait()
+
+    def close(self):
+        self.flush()
+        with self.condition:
+            if self.journalFile is not None:
+                os.close(self.journalFile)
+                self.journalFile = None
+        self.board = None
+
+    def _startWriting(self):
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self._writeQueued, name="SaveJournal", daemon=True
+            )
+            self.thread.start()
+        self.condition.notify_all()
+
+    def _writeQueued(self):
+        while True:
+            with self.condition:
+                while self.pendingSave is None and not self.pendingRecords:
+                    self.condition.wait()
+                saveData, records = self.pendingSave, self.pendingRecords
+                self.pendingSave, self.pendingRecords = None, []
+                self.isWriting = True
+
+            start = perf_counter()
+            try:
+                if saveData is not None:
+                    self._writeSave(saveData)
+                if records:
+                    self._appendRecords(records)
+            except OSError as error:
+                print(f"Saving the game failed: {error}")
+            except Exception:
+                # keep the writer alive, a dead one would leave flush() waiting
+                print("Saving the game failed unexpectedly:")
+                traceback.print_exc()
+            finally:
+                self.profiler.record(SAVE, perf_counter() - start)
+                with self.condition:
+                    self.isWriting = False
+                    self.condition.notify_all()
+
+    def _writeSave(self, saveData: SaveData):
+        if self.journalFile is not None:
+            os.close(self.journalFile)
+            self.journalFile = None
+        data = writeSaveFile(self.saveFileName, saveData)
+        replaceFile(
+            self.journalFileName,
+            JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, zlib.crc32(data)),
+        )
+        self.journalFile = os.open(
+            self.journalFileName,
+            os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0),
+        )
+
+    def _appendRecords(self, records: list[bytes]):
+        # without a journal file the save failed, and the records are lost
+        if self.journalFile is None:
+            return
+        os.write(self.journalFile, b"".join(records))
+        os.fsync(self.journalFile)
+
+
+class SaveJournalInstance:
+    """
+    Declare a single instance of the SaveJournal class for the entire
+    application. Uses Singleton design pattern.
+    """
+
+    obj = None
+
+    @staticmethod
+    def getInstance():
+        if not SaveJournalInstance.obj:
+            SaveJournalInstance.obj = SaveJournal()
+        return SaveJournalInstance.obj
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import random
+from math import log10, sqrt
+from time import perf_counter
+from typing import Literal
+
+from .constants.constants import POINTS_VALUES
+from .Engine import MAX_DEPTH, Engine
+from .MoveGenerator import CHECKMATE, ONGOING, REPETITION, MoveGenerator
+from .StartingPositions import StartingPositions
+
+MOVE_LIMIT = "move limit"
+WHITE_WINS = "1-0"
+BLACK_WINS = "0-1"
+DRAW = "1/2-1/2"
+
+SETUPS = {
+    "standard": StartingPositions.createStandardPosition,
+    "knights": StartingPositions.createKnightsOnlyPosition,
+}
+
+# z score of a two sided 95% confidence interval
+Z_95 = 1.96
+
+# random plies played from a setup before the engines take over, as the engines
+# are deterministic and would otherwise play the same game every time
+OPENING_PLIES = 4
+# seeds tried per opening wanted before giving up on finding distinct openings
+OPENING_ATTEMPTS = 100
+
+
+class EngineConfig:
+    """
+    Settings of one engine taking part in self-play, written on the command line
+    as name:timeBudgetMs or name:timeBudgetMs:maxDepth.
+    """
+
+    def __init__(self, name: str, timeBudgetMs: int, maxDepth: int = MAX_DEPTH):
+        self.name = name
+        self.timeBudgetMs = timeBudgetMs
+        self.maxDepth = maxDepth
+
+    @staticmethod
+    def fromString(configString: str) -> EngineConfig:
+        parts = configString.split(":")
+        if len(parts) not in (2, 3):
+            raise ValueError(
+                f"Engine config {configString} is not name:timeBudgetMs[:maxDepth]"
+            )
+        maxDepth = int(parts[2]) if len(parts) == 3 else MAX_DEPTH
+        return EngineConfig(parts[0], int(parts[1]), maxDepth)
+
+    def createEngine(self) -> Engine:
+        return Engine(POINTS_VALUES, self.timeBudgetMs, self.maxDepth)
+
+
+def createOpening(
+    setup: str, openingNumber: int, openingPlies: int = OPENING_PLIES
+) -> list[tuple[int, int]]:
+    """
+    Return random legal plies from the start of a setup. The opening number
+    seeds the choice of moves, so an opening can be played again, such as with
+    the colours swapped.
+    """
+    randomMoves = random.Random(f"{setup}:{openingNumber}")
+    position = SETUPS[setup]()
+    team: Literal["black", "white"] = "white"
+    moves: list[tuple[int, int]] = []
+    while len(moves) < openingPlies:
+        legalMoves = MoveGenerator(position, team).generateLegalMoves()
+        if not legalMoves:
+            break
+        move = randomMoves.choice(legalMoves)
+        position.makeMove(*move)
+        moves.append(move)
+        team = position.getOpponentTeam(team)
+    return moves
+
+
+def createOpenings(
+    setup: str, count: int, openingPlies: int = OPENING_PLIES
+) -> list[tuple[int, list[tuple[int, int]]]]:
+    """
+    Return count (openingNumber, moves) openings of a setup that end in
+    different positions with the game still going. Openings reaching a position
+    already taken, by the same moves or not, are skipped. Raises ValueError if
+    the setup does not have count such openings.
+    """
+    openings = []
+    positionHashes = set()
+    for openingNumber in range(0, count * OPENING_ATTEMPTS):
+        if len(openings) == count:
+            break
+        moves = createOpening(setup, openingNumber, openingPlies)
+        position = SETUPS[setup]()
+        team: Literal["black", "white"] = "white"
+        for move in moves:
+            position.makeMove(*move)
+            team = position.getOpponentTeam(team)
+        positionHash = position.hash ^ position.zobristKeys.getSideToMoveKey(team)
+        if positionHash in positionHashes:
+            continue
+        if MoveGenerator(position, team).getGameStatus() != ONGOING:
+            continue
+        positionHashes.add(positionHash)
+        openings.append((openingNumber, moves))
+
+    if len(openings) < count:
+        raise ValueError(
+            f"Found {len(openings)} distinct {openingPlies} ply openings of {setup}, "
+            f"{count} are needed"
+        )
+    return openings
+
+
+def playGame(
+    gameNumber: int,
+    setup: str,
+    whiteConfig: EngineConfig,
+    blackConfig: EngineConfig,
+    maxPlies: int,
+    openingNumber: int | None = None,
+    opening: list[tuple[int, int]] | None = None,
+) -> dict:
+    """
+    Play one engine against engine game from the start of a setup, after the
+    plies of an opening, and return a record of it that can be written out as
+    JSON. The record's moves include the opening.
+    """
+    position = SETUPS[setup]()
+    engines = {"white": whiteConfig.createEngine(), "black": blackConfig.createEngine()}
+    team: Literal["black", "white"] = "white"
+    moves: list[tuple[int, int]] = []
+    moveTimesMs: list[float] = []
+    nodes = 0
+    hashCounts: dict[int, int] = {}
+
+    start = perf_counter()
+    for move in opening or []:
+        positionHash = position.hash ^ position.zobristKeys.getSideToMoveKey(team)
+        hashCounts[positionHash] = hashCounts.get(positionHash, 0) + 1
+        position.makeMove(*move)
+        moves.append(tuple(move))
+        team = position.getOpponentTeam(team)
+
+    while True:
+        positionHash = position.hash ^ position.zobristKeys.getSideToMoveKey(team)
+        hashCounts[positionHash] = hashCounts.get(positionHash, 0) + 1
+
+        gameStatus = MoveGenerator(position, team).getGameStatus()
+        if gameStatus == ONGOING and hashCounts[positionHash] >= 3:
+            gameStatus = REPETITION
+        if gameStatus == ONGOING and len(moves) >= maxPlies:
+            gameStatus = MOVE_LIMIT
+        if gameStatus != ONGOING:
+            break
+
+        searchResult = engines[team].search(position, team)
+        position.makeMove(*searchResult.bestMove)
+        moves.append(searchResult.bestMove)
+        moveTimesMs.append(round(searchResult.seconds * 1000, 2))
+        nodes += searchResult.nodes
+        team = position.getOpponentTeam(team)
+
+    if gameStatus == CHECKMATE:
+        result = BLACK_WINS if team == "white" else WHITE_WINS
+    else:
+        result = DRAW
+
+    return {
+        "game": gameNumber,
+        "setup": setup,
+        "white": whiteConfig.name,
+        "black": blackConfig.name,
+        "opening": openingNumber,
+        "openingPlies": len(opening or []),
+        "result": result,
+        "reason": gameStatus,
+        "plies": len(moves),
+        "nodes": nodes,
+        "seconds": round(perf_counter() - start, 3),
+        "moves": moves,
+        "moveTimesMs": moveTimesMs,
+    }
+
+
+def playGameFromArguments(arguments: tuple) -> dict:
+    """
+    playGame() taking a single tuple, as handed out by a multiprocessing pool.
+    """
+    return playGame(*arguments)
+
+
+def getWilsonInterval(successes: int, trials: int) -> tuple[float, float]:
+    """
+    Return the 95% Wilson score interval of a proportion.
+    """
+    if trials == 0:
+        return (0.0, 1.0)
+    proportion = successes / trials
+    denominator = 1 + Z_95**2 / trials
+    centre = (proportion + Z_95**2 / (2 * trials)) / denominator
+    margin = (
+        Z_95
+        * sqrt(proportion * (1 - proportion) / trials + Z_95**2 / (4 * trials**2))
+        / denominator
+    )
+    return (max(0.0, centre - margin), min(1.0, centre + margin))
+
+
+def getEloDifference(score: float) -> float:
+    # a clean sweep either way has no finite Elo difference, clamp it
+    score = min(max(score, 0.001), 0.999)
+    return 400 * log10(score / (1 - score))
+
+
+def getGameScore(gameRecord: dict, engineName: str) -> float:
+    if gameRecord["result"] == DRAW:
+        return 0.5
+    if (gameRecord["result"] == WHITE_WINS) == (gameRecord["white"] == engineName):
+        return 1.0
+    return 0.0
+
+
+def summariseResults(gameRecords: list[dict], engineName: str) -> dict:
+    """
+    Count the wins, draws and losses of an engine over a set of games, with 95%
+    confidence intervals for each rate, its score and its Elo difference to the
+    opponent.
+
+    The games of an opening, one with each colour assignment, are not
+    independent of each other, so the score interval is taken over the mean
+    scores of openings rather than of games. Games without an opening count as
+    openings of their own.
+    """
+    wins = draws = losses = 0
+    openingScores: dict[tuple, list[float]] = {}
+    for gameRecord in gameRecords:
+        gameScore = getGameScore(gameRecord, engineName)
+        if gameScore == 0.5:
+            draws += 1
+        elif gameScore == 1.0:
+            wins += 1
+        else:
+            losses += 1
+        if gameRecord.get("opening") is None:
+            openingKey = ("game", gameRecord["game"])
+        else:
+            openingKey = (gameRecord["setup"], gameRecord["opening"])
+        openingScores.setdefault(openingKey, []).append(gameScore)
+
+    games = wins + draws + losses
+    summary = {
+        "games": games,
+        "openings": len(openingScores),
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "winRate": getWilsonInterval(wins, games),
+        "drawRate": getWilsonInterval(draws, games),
+        "lossRate": getWilsonInterval(losses, games),
+    }
+    if games == 0:
+        return summary
+
+    score = (wins + draws / 2) / games
+    openingMeans = [sum(scores) / len(scores) for scores in openingScores.values()]
+    openings = len(openingMeans)
+    meanScore = sum(openingMeans) / openings
+    variance = sum((mean - meanScore) ** 2 for mean in openingMeans) / openings
+    margin = Z_95 * sqrt(variance / openings)
+    summary["score"] = score
+    summary["scoreInterval"] = (max(0.0, score - margin), min(1.0, score + margin))
+    summary["elo"] = getEloDifference(score)
+    summary["eloInterval"] = tuple(
+        getEloDifference(bound) for bound in summary["scoreInterval"]
+    )
+    return summary
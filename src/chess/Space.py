@@ -3,21 +3,20 @@ from __future__ import annotations
 from abc import abstractmethod
 from typing import Literal
 
-from .engine.SpriteImage import SpriteImage
-
-
-class Space(SpriteImage):
-    def __init__(
-        self,
-        fileName: str | None = None,
-        relativeDir: str = "chess/data/",
-        scale: int = 1,
-        coord: list = [0, 0],
-        number: int = 0,
-    ):
+from .engine.HighlightMixin import HighlightMixin
+from .Position import Position
+
+
+class Space(HighlightMixin):
+    """
+    Space class is the model of a square of the board, linked to its neighbours
+    and holding at most one piece. It is drawn by a TileSprite and does not
+    depend on pygame.
+    """
+
+    def __init__(self, number: int = 0):
         if type(self) is Space:
             raise Exception("Space class is an abstract class")
-        SpriteImage.__init__(self, fileName, relativeDir, None, scale, coord)
 
         self.north = None
         self.south = None
@@ -26,33 +25,29 @@ class Space(SpriteImage):
 
         self.occupied = False
         self.number = number
-
-        self.canBeReachedByAPiece: dict = {
-            "black": False,
-            "white": False,
-        }
+        self.position: Position | None = None
 
     @abstractmethod
-    def placePiece(self, piece) -> bool:
+    def placePiece(self, piece, syncPosition: bool = True) -> bool:
         pass
 
     @abstractmethod
-    def removePiece(self) -> bool:
+    def removePiece(self, syncPosition: bool = True) -> bool:
         pass
 
     @abstractmethod
     def getPiece(self):
         pass
 
-    def resetCanBeReachedByAPiece(self):
-        self.canBeReachedByAPiece["black"] = False
-        self.canBeReachedByAPiece["white"] = False
-
-    def updateCanBeReachedByAPiece(self, team: Literal["black", "white"]):
-        self.canBeReachedByAPiece[team] = True
-
     def getCanBeReachedByAPiece(self, team: Literal["black", "white"]) -> bool:
-        return self.canBeReachedByAPiece[team]
+        return self.position.isAttacked(self.number, team)
+
+    def setPosition(self, position: Position):
+        """
+        Keep the board's Position in step with pieces placed on and removed from
+        this space.
+        """
+        self.position = position
 
     def getNumber(self) -> int:
         return self.number
@@ -88,6 +83,3 @@ class Space(SpriteImage):
             space = self.west
 
         return space
-
-    def update(self):
-        super().update()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from .BoardConfig import BoardConfig
+from .Pawn import Pawn
+from .Position import Position
+
+
+class StartingPositions:
+    """
+    Build the starting positions of the game modes the Director offers as bare
+    Positions, without creating tiles or piece sprites. Used by headless tools
+    that play or analyse games without a display. White moves first in both.
+    """
+
+    @staticmethod
+    def createStandardPosition() -> Position:
+        position = Position(8)
+        for pieceConfig in BoardConfig.getPieceConfigs():
+            if pieceConfig["space"] is None or not pieceConfig["isOnBoard"]:
+                continue
+            pieceClass = pieceConfig["class"]
+            position.placePiece(
+                pieceConfig["space"],
+                pieceConfig["team"],
+                pieceClass.__name__,
+                onHomeSpace=pieceClass is Pawn,
+            )
+        return position
+
+    @staticmethod
+    def createKnightsOnlyPosition(numberOfTiles: int = 100) -> Position:
+        """
+        Same layout as Director.createNewStandardBoardWithKnightsOnly(): each
+        team fills its two home rows with knights, with its king in the corner.
+        """
+        sideLength = int(numberOfTiles**0.5)
+        position = Position(sideLength)
+        for number in range(0, sideLength * 2):
+            pieceType = "King" if number == 0 else "Knight"
+            position.placePiece(number, "black", pieceType)
+        for number in range(numberOfTiles - 1, numberOfTiles - sideLength * 2 - 1, -1):
+            pieceType = "King" if number == numberOfTiles - 1 else "Knight"
+            position.placePiece(number, "white", pieceType)
+        return position
@@ -1,11 +1,13 @@
 from abc import ABC, abstractmethod
+from time import perf_counter
 
 import pygame as pg
 
 from .BoardBuilder import StandardBoardBuilder
+from .BoardView import BoardView
 from .Button import Button
 from .ButtonDirector import ButtonDirector
-from .constants.constants import windowSize
+from .constants.constants import COMPUTER_OPPONENT, windowSize
 from .constants.TriggerKey import TriggerKey
 from .Director import Director
 from .engine.BackgroundSet import (
@@ -21,10 +23,15 @@ from .engine.CurrentPlayerSurface import (
 from .engine.Display import DisplayInstance
 from .engine.EventManager import EventManagerInstance, Events
 from .engine.Notification import NotificationInstance
+from .engine.Profiler import EVENTS, FRAME, TURNS, ProfilerInstance
 from .engine.SpriteGroup import SpriteGroup
-from .Piece import Piece
-from .Tile import Tile
+from .engine.SpriteIndex import SpriteIndex
+from .engine.WorkerPool import WorkerPoolInstance
+from .EvaluationParameters import EvaluationParametersInstance
+from .PieceSprite import PieceSprite
+from .TileSprite import TileSprite
 from .Turn import (
+    ComputerMoveTurn,
     IsBoardInCheckMateTurn,
     MovePieceCheckTurn,
     MovePieceTurn,
@@ -32,6 +39,11 @@ from .Turn import (
     UndoTurn,
 )
 
+# shows and hides the frame timings overlay
+PROFILER_OVERLAY_KEY = pg.K_F3
+# on the select mode screen, chooses between two players and the computer
+COMPUTER_OPPONENT_KEY = pg.K_c
+
 
 class State(ABC):
     def __init__(self):
@@ -66,19 +78,25 @@ class InitialiseState(State):
     startScreenBackground = None
     selectModeBackground = None
     board = None
+    boardView = None
     gameSprites = None
     startScreenSprites = None
     selectModeSprites = None
+    gameSpriteIndex = None
+    startScreenSpriteIndex = None
+    selectModeSpriteIndex = None
     selectPieceTurn = None
     movePieceTurn = None
     isBoardInCheckMateTurn = None
     movePieceCheckTurn = None
     undoTurn = None
+    computerMoveTurn = None
+    workerPool = None
+    profiler = None
+    evaluationParameters = None
     isInCheck = False
     boardCreated = False
 
-    updateTheDisplay = True
-
     @staticmethod
     def initialise():
         s = InitialiseState
@@ -96,6 +114,12 @@ class InitialiseState(State):
 
         s.eventManager = EventManagerInstance.getInstance()
 
+        s.workerPool = WorkerPoolInstance.getInstance()
+        # frame phase timings, shown by the display's overlay
+        s.profiler = ProfilerInstance.getInstance()
+        # tuned engine evaluation, if tune.py has written a parameter file
+        s.evaluationParameters = EvaluationParametersInstance.getInstance()
+
         s.notification = NotificationInstance.getInstance()
         s.notification.setup(pg.font.Font)
 
@@ -129,6 +153,7 @@ class InitialiseState(State):
                 *s.buttonDirector.createStartButtons(),
             ]
         )
+        s.startScreenSpriteIndex = SpriteIndex(s.startScreenSprites.sprites())
 
         s.selectModeSprites = SpriteGroup(
             [
@@ -136,6 +161,7 @@ class InitialiseState(State):
                 *s.buttonDirector.createBackButton(),
             ]
         )
+        s.selectModeSpriteIndex = SpriteIndex(s.selectModeSprites.sprites())
 
         s.boardBuilder.reset()
 
@@ -153,47 +179,65 @@ class GameRunningState(InitialiseState):
     @staticmethod
     def run() -> dict:
         s = InitialiseState
+        frameStart = perf_counter()
         s.display.setBackgroundSet(s.playingBackground.getSet())
         s.display.setBackground(s.playingBackground.getBackground())
-        s.display.setSprites(s.gameSprites)
-        if s.updateTheDisplay:
-            s.display.updateDisplay()
+        s.display.setSprites(s.gameSprites, s.gameSpriteIndex)
+        s.display.updateDisplay()
         s.display.clear()
 
+        # starts a search in the worker pool if it is the computer's turn
+        with s.profiler.measure(TURNS):
+            s.computerMoveTurn.execute()
+
+        eventsStart = perf_counter()
         for event in pg.event.get():
             if event.type == pg.QUIT:
+                s.workerPool.shutdown()
                 s.director.exportSaveFile(s.board)
                 return {
                     "quit": True,
                     "nextState": None,
                 }
+            if event.type == pg.KEYDOWN and event.key == PROFILER_OVERLAY_KEY:
+                s.display.toggleProfilerOverlay()
             if event.type == pg.MOUSEBUTTONDOWN:
                 pos = pg.mouse.get_pos()
-                clickedSprites = [
-                    spr for spr in s.display.getSprites() if spr.rect.collidepoint(pos)
-                ]
+                clickedSprites = s.display.getSpritesAt(pos)
                 for sprite in clickedSprites:
                     sprite.pressDown()
             if event.type == pg.MOUSEBUTTONUP:
+                # click latency counts from here, the turn's own work included
+                clickTime = perf_counter()
                 pos = pg.mouse.get_pos()
-                clickedSprites = [
-                    spr for spr in s.display.getSprites() if spr.rect.collidepoint(pos)
-                ]
+                clickedSprites = s.display.getSpritesAt(pos)
                 for sprite in clickedSprites:
                     sprite.stopPressDown()
-                    if isinstance(sprite, Piece):
-                        s.selectPieceTurn.execute(sprite)
-                    elif isinstance(sprite, Tile):
-                        if s.isInCheck:
-                            print("movePieceCheckTurn")
-                            s.movePieceCheckTurn.execute(sprite)
-                        else:
-                            print("movePieceTurn")
-                            s.movePieceTurn.execute(sprite)
+                    isComputersTurn = s.board.getCurrentPlayer().isComputerPlayer()
+                    if isinstance(sprite, PieceSprite) and not isComputersTurn:
+                        s.profiler.markClick(clickTime)
+                        with s.profiler.measure(TURNS):
+                            s.selectPieceTurn.execute(sprite.getPiece())
+                    elif isinstance(sprite, TileSprite) and not isComputersTurn:
+                        s.profiler.markClick(clickTime)
+                        with s.profiler.measure(TURNS):
+                            if s.isInCheck:
+                                print("movePieceCheckTurn")
+                                s.movePieceCheckTurn.execute(sprite.getTile())
+                            else:
+                                print("movePieceTurn")
+                                s.movePieceTurn.execute(sprite.getTile())
                     elif isinstance(sprite, Button):
                         if sprite.getFileName() == TriggerKey.UNDO:
-                            s.undoTurn.execute()
+                            # the computer's search is for the position being undone
+                            s.computerMoveTurn.cancel()
+                            with s.profiler.measure(TURNS):
+                                s.undoTurn.execute()
+                                # take back the computer's reply too, or it is replayed
+                                if s.board.getCurrentPlayer().isComputerPlayer():
+                                    s.undoTurn.execute()
                         elif sprite.getFileName() == TriggerKey.BACK:
+                            s.computerMoveTurn.cancel()
                             s.director.exportSaveFile(s.board)
                             return {
                                 "quit": False,
@@ -212,11 +256,16 @@ class GameRunningState(InitialiseState):
                 s.currentPlayerSurface.setCurrentPlayer(
                     s.board.getCurrentPlayer().getName()
                 )
+                # checkmate is looked for by CHECK_EVENT, look for the other endings
+                if not s.board.isInCheck():
+                    with s.profiler.measure(TURNS):
+                        s.isBoardInCheckMateTurn.execute()
             if event.type == Events.CHECK_EVENT:
                 print("Events.CHECK_EVENT")
                 s.isInCheck = True
                 s.notification.push("Check!")
-                s.isBoardInCheckMateTurn.execute()
+                with s.profiler.measure(TURNS):
+                    s.isBoardInCheckMateTurn.execute()
 
             if event.type == Events.STOP_CHECK_EVENT:
                 print("Events.STOP_CHECK_EVENT")
@@ -224,7 +273,9 @@ class GameRunningState(InitialiseState):
 
             if event.type == Events.UNDO_MOVE_REPLACE_SPRITE_EVENT:
                 print("Events.UNDO_MOVE_REPLACE_SPRITE_EVENT")
-                s.gameSprites.addSprites([event.dict.get("otherPiece")])
+                pieceSprite = s.boardView.getPieceSprite(event.dict.get("otherPiece"))
+                pieceSprite.jumpToSpace()
+                s.gameSprites.addSprites([pieceSprite])
                 playerName = event.dict.get("playerName")
                 points: int = event.dict.get("points")
                 s.playerSurfacesDict[playerName].incrementPoints(-points)
@@ -232,15 +283,19 @@ class GameRunningState(InitialiseState):
             if event.type == Events.UNDO_MOVE_EVENT:
                 print("Events.UNDO_MOVE_EVENT")
 
-            if event.type == Events.FREEZE_DISPLAY_EVENT:
-                print("Events.FREEZE_DISPLAY_EVENT")
-                s.updateTheDisplay = False
-
-            if event.type == Events.STOP_FREEZE_DISPLAY_EVENT:
-                print("Events.STOP_FREEZE_DISPLAY_EVENT")
-                s.updateTheDisplay = True
-
+            if event.type == Events.COMPUTER_MOVE_FOUND_EVENT:
+                print("Events.COMPUTER_MOVE_FOUND_EVENT")
+                if event.dict.get("error") is not None:
+                    print(event.dict.get("error"))
+                with s.profiler.measure(TURNS):
+                    s.computerMoveTurn.playMove(
+                        event.dict.get("result"), event.dict.get("positionHash")
+                    )
+
+        s.profiler.record(EVENTS, perf_counter() - eventsStart)
+        s.profiler.record(FRAME, perf_counter() - frameStart)
         s.clock.tick(60)
+        s.workerPool.poll()
         s.eventManager.listen()
 
         return {
@@ -258,30 +313,30 @@ class StartScreenState(InitialiseState):
     @staticmethod
     def run() -> dict:
         s = InitialiseState
+        frameStart = perf_counter()
         s.display.setBackgroundSet(s.startScreenBackground.getSet())
         s.display.setBackground(s.startScreenBackground.getBackground())
-        s.display.setSprites(s.startScreenSprites)
+        s.display.setSprites(s.startScreenSprites, s.startScreenSpriteIndex)
         s.display.updateDisplay()
         s.display.clear()
 
+        eventsStart = perf_counter()
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 return {
                     "quit": True,
                     "nextState": None,
                 }
+            if event.type == pg.KEYDOWN and event.key == PROFILER_OVERLAY_KEY:
+                s.display.toggleProfilerOverlay()
             if event.type == pg.MOUSEBUTTONDOWN:
                 pos = pg.mouse.get_pos()
-                clickedSprites = [
-                    spr for spr in s.display.getSprites() if spr.rect.collidepoint(pos)
-                ]
+                clickedSprites = s.display.getSpritesAt(pos)
                 for sprite in clickedSprites:
                     sprite.pressDown()
             if event.type == pg.MOUSEBUTTONUP:
                 pos = pg.mouse.get_pos()
-                clickedSprites = [
-                    spr for spr in s.display.getSprites() if spr.rect.collidepoint(pos)
-                ]
+                clickedSprites = s.display.getSpritesAt(pos)
                 for sprite in clickedSprites:
                     sprite.stopPressDown()
                     if isinstance(sprite, Button):
@@ -289,6 +344,9 @@ class StartScreenState(InitialiseState):
 
                         # New game
                         if sprite.getFileName() == TriggerKey.NEW:
+                            s.notification.push(
+                                "Press C to choose whether the computer plays"
+                            )
                             return {
                                 "quit": False,
                                 "nextState": SelectModeScreenState,
@@ -305,14 +363,19 @@ class StartScreenState(InitialiseState):
 
                             s.board = s.boardBuilder.getBoard()
 
+                            s.boardView = BoardView(
+                                s.board,
+                                *s.director.getTileLayout(len(s.board.getTiles())),
+                            )
+
+                            buttons = [
+                                *s.buttonDirector.createUndoButton(),
+                                *s.buttonDirector.createBackButton(),
+                            ]
                             s.gameSprites = SpriteGroup(
-                                [
-                                    *s.board.getTiles(),
-                                    *s.board.getPieces(),
-                                    *s.buttonDirector.createUndoButton(),
-                                    *s.buttonDirector.createBackButton(),
-                                ]
+                                [*s.boardView.getSprites(), *buttons]
                             )
+                            s.gameSpriteIndex = s.boardView.createSpriteIndex(buttons)
 
                             s.currentPlayerSurface.setCurrentPlayer(
                                 s.board.getCurrentPlayer().getName()
@@ -323,14 +386,12 @@ class StartScreenState(InitialiseState):
                             s.isBoardInCheckMateTurn = IsBoardInCheckMateTurn(s.board)
                             s.movePieceCheckTurn = MovePieceCheckTurn(s.board)
                             s.undoTurn = UndoTurn(s.board)
+                            s.computerMoveTurn = ComputerMoveTurn(s.board)
 
                             for player in s.board.getPlayers():
                                 s.playerSurfacesDict[player.getName()].incrementPoints(
                                     player.getPoints()
                                 )
-                            for piece in s.board.getPieces():
-                                if not piece.getIsOnBoard():
-                                    piece.kill()
                             s.board.setIsCheck(s.board.checkIsThereCheck())
                             if s.board.isInCheck():
                                 s.eventManager.post(event=Events.CHECK_EVENT)
@@ -342,6 +403,8 @@ class StartScreenState(InitialiseState):
                                 "nextState": GameRunningState,
                             }
 
+        s.profiler.record(EVENTS, perf_counter() - eventsStart)
+        s.profiler.record(FRAME, perf_counter() - frameStart)
         s.clock.tick(60)
         s.eventManager.listen()
 
@@ -360,30 +423,37 @@ class SelectModeScreenState(InitialiseState):
     @staticmethod
     def run() -> dict:
         s = InitialiseState
+        frameStart = perf_counter()
         s.display.setBackgroundSet(s.selectModeBackground.getSet())
         s.display.setBackground(s.selectModeBackground.getBackground())
-        s.display.setSprites(s.selectModeSprites)
+        s.display.setSprites(s.selectModeSprites, s.selectModeSpriteIndex)
         s.display.updateDisplay()
         s.display.clear()
 
+        eventsStart = perf_counter()
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 return {
                     "quit": True,
                     "nextState": None,
                 }
+            if event.type == pg.KEYDOWN and event.key == PROFILER_OVERLAY_KEY:
+                s.display.toggleProfilerOverlay()
+            if event.type == pg.KEYDOWN and event.key == COMPUTER_OPPONENT_KEY:
+                if s.director.getComputerPlayers():
+                    s.director.setComputerPlayers(())
+                    s.notification.push("Two players")
+                else:
+                    s.director.setComputerPlayers((COMPUTER_OPPONENT,))
+                    s.notification.push(f"The computer plays {COMPUTER_OPPONENT}")
             if event.type == pg.MOUSEBUTTONDOWN:
                 pos = pg.mouse.get_pos()
-                clickedSprites = [
-                    spr for spr in s.display.getSprites() if spr.rect.collidepoint(pos)
-                ]
+                clickedSprites = s.display.getSpritesAt(pos)
                 for sprite in clickedSprites:
                     sprite.pressDown()
             if event.type == pg.MOUSEBUTTONUP:
                 pos = pg.mouse.get_pos()
-                clickedSprites = [
-                    spr for spr in s.display.getSprites() if spr.rect.collidepoint(pos)
-                ]
+                clickedSprites = s.display.getSpritesAt(pos)
                 for sprite in clickedSprites:
                     sprite.stopPressDown()
                     if isinstance(sprite, Button):
@@ -413,14 +483,19 @@ class SelectModeScreenState(InitialiseState):
                         if s.boardCreated:
                             s.board = s.boardBuilder.getBoard()
 
+                            s.boardView = BoardView(
+                                s.board,
+                                *s.director.getTileLayout(len(s.board.getTiles())),
+                            )
+
+                            buttons = [
+                                *s.buttonDirector.createUndoButton(),
+                                *s.buttonDirector.createBackButton(),
+                            ]
                             s.gameSprites = SpriteGroup(
-                                [
-                                    *s.board.getTiles(),
-                                    *s.board.getPieces(),
-                                    *s.buttonDirector.createUndoButton(),
-                                    *s.buttonDirector.createBackButton(),
-                                ]
+                                [*s.boardView.getSprites(), *buttons]
                             )
+                            s.gameSpriteIndex = s.boardView.createSpriteIndex(buttons)
 
                             s.currentPlayerSurface.setCurrentPlayer(
                                 s.board.getCurrentPlayer().getName()
@@ -431,6 +506,7 @@ class SelectModeScreenState(InitialiseState):
                             s.isBoardInCheckMateTurn = IsBoardInCheckMateTurn(s.board)
                             s.movePieceCheckTurn = MovePieceCheckTurn(s.board)
                             s.undoTurn = UndoTurn(s.board)
+                            s.computerMoveTurn = ComputerMoveTurn(s.board)
 
                             s.notification.push("Starting game!")
 
@@ -439,6 +515,8 @@ class SelectModeScreenState(InitialiseState):
                                 "nextState": GameRunningState,
                             }
 
+        s.profiler.record(EVENTS, perf_counter() - eventsStart)
+        s.profiler.record(FRAME, perf_counter() - frameStart)
         s.clock.tick(60)
         s.eventManager.listen()
 
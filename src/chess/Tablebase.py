@@ -0,0 +1,739 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from math import comb, prod
+from typing import Literal
+
+from .AttackTables import (
+    DIAGONAL_DIRECTIONS,
+    DIRECTIONS,
+    STRAIGHT_DIRECTIONS,
+    AttackTablesInstance,
+)
+from .constants.constants import POINTS_VALUES, TABLEBASE_DIR
+from .MoveGenerator import MoveGenerator
+from .Position import Position
+
+PIECE_LETTERS = {"K": "King", "Q": "Queen", "R": "Rook", "B": "Bishop", "N": "Knight"}
+LETTERS = {pieceType: letter for letter, pieceType in PIECE_LETTERS.items()}
+LETTER_ORDER = "KQRBN"
+SLIDER_DIRECTIONS = {
+    "Rook": STRAIGHT_DIRECTIONS,
+    "Bishop": DIAGONAL_DIRECTIONS,
+    "Queen": DIRECTIONS,
+}
+
+# one byte per position, from the point of view of the side to move
+DRAW = 0
+LOSS_OFFSET = 128
+MAX_WIN_DISTANCE = 127
+MAX_LOSS_DISTANCE = 126
+INVALID = 255
+
+WIN = "win"
+LOSS = "loss"
+DRAWN = "draw"
+
+# magic, version, board side length, number of pieces
+HEADER = struct.Struct("<4sBBBx")
+MAGIC = b"KCTB"
+VERSION = 2
+
+# positions handed to a worker process at once
+CLASSIFY_CHUNK_SIZE = 50_000
+PREDECESSOR_CHUNK_SIZE = 5_000
+
+
+def sortLetters(letters: str) -> str:
+    return "".join(sorted(letters, key=LETTER_ORDER.index))
+
+
+def getMaterialStrength(letters: str) -> tuple:
+    value = sum(
+        POINTS_VALUES[PIECE_LETTERS[letter]] for letter in letters if letter != "K"
+    )
+    return (value, len(letters), letters)
+
+
+def getCanonicalMaterial(whiteLetters: str, blackLetters: str) -> tuple[str, bool]:
+    """
+    Return the name of the table holding a material balance, such as "KNNvKN",
+    and whether the teams are swapped in it. Pawnless positions play the same
+    with the colours swapped, so only the stronger side first is stored.
+    """
+    whiteLetters = sortLetters(whiteLetters)
+    blackLetters = sortLetters(blackLetters)
+    if getMaterialStrength(whiteLetters) >= getMaterialStrength(blackLetters):
+        return f"{whiteLetters}v{blackLetters}", False
+    return f"{blackLetters}v{whiteLetters}", True
+
+
+def parseMaterial(materialName: str) -> tuple[str, str]:
+    sides = materialName.upper().split("V")
+    if len(sides) != 2:
+        raise ValueError(f"Material {materialName} is not written like KNNvKN")
+    for letters in sides:
+        if letters.count("K") != 1 or any(
+            letter not in PIECE_LETTERS for letter in letters
+        ):
+            raise ValueError(
+                f"Material {materialName} needs one king a side and no pawns"
+            )
+    return sortLetters(sides[0]), sortLetters(sides[1])
+
+
+def getTablePieces(materialName: str) -> list[tuple[str, str]]:
+    """
+    Return (team, pieceType) of every piece in the order tile numbers are
+    stored in a table's index: the first side of the name plays white.
+    """
+    whiteLetters, blackLetters = parseMaterial(materialName)
+    return [("white", PIECE_LETTERS[letter]) for letter in whiteLetters] + [
+        ("black", PIECE_LETTERS[letter]) for letter in blackLetters
+    ]
+
+
+def encodeValue(result: str, distance: int) -> int:
+    if result == WIN:
+        if distance > MAX_WIN_DISTANCE:
+            raise ValueError(f"Win in {distance} plies does not fit in a table")
+        return distance
+    if distance > MAX_LOSS_DISTANCE:
+        raise ValueError(f"Loss in {distance} plies does not fit in a table")
+    return LOSS_OFFSET + distance
+
+
+def decodeValue(value: int) -> tuple[str, int] | None:
+    """
+    Return (result, plies to mate) for the side to move, or None for a position
+    that cannot occur.
+    """
+    if value == INVALID:
+        return None
+    if value == DRAW:
+        return (DRAWN, 0)
+    if value < LOSS_OFFSET:
+        return (WIN, value)
+    return (LOSS, value - LOSS_OFFSET)
+
+
+def isCurrentTable(fileName: str) -> bool:
+    """
+    Return whether a table file exists and was written in this version's
+    format. Tables of older versions are indexed differently and are solved
+    again.
+    """
+    if not os.path.exists(fileName):
+        return False
+    with open(fileName, "rb") as tableFile:
+        header = tableFile.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return False
+    magic, version, _, _ = HEADER.unpack(header)
+    return magic == MAGIC and version == VERSION
+
+
+class Tablebase:
+    """
+    Tablebase class gives read access to one solved material set. The file is a
+    short header followed by one byte per position, in TableIndex order, so it
+    is memory-mapped and probed by offset without being parsed or read into
+    memory.
+    """
+
+    def __init__(self, fileName: str, materialName: str) -> None:
+        self.fileName = fileName
+        self.file = open(fileName, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, sideLength, pieceCount = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{fileName} is not a version {VERSION} tablebase")
+        self.sideLength = sideLength
+        self.numberOfTiles = sideLength * sideLength
+        self.pieceCount = pieceCount
+        self.index = TableIndexInstance.getInstance(materialName, sideLength)
+        if len(self.data) - HEADER.size != self.index.size:
+            self.close()
+            raise ValueError(f"{fileName} does not hold a {materialName} table")
+
+    def getIndex(self, sideIndex: int, tileNumbers: list[int]) -> int:
+        return self.index.encode(sideIndex, tileNumbers)
+
+    def getValue(self, index: int) -> int:
+        return self.data[HEADER.size + index]
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+class Tablebases:
+    """
+    Tablebases class finds and probes the tables of one board size, loading
+    each table the first time a position with its material is probed.
+    """
+
+    def __init__(self, sideLength: int, directory: str = TABLEBASE_DIR) -> None:
+        self.sideLength = sideLength
+        self.directory = os.path.join(directory, str(sideLength))
+        # material name -> table, or None when there is no file for it
+        self.tables: dict[str, Tablebase | None] = {}
+
+    def getFileName(self, materialName: str) -> str:
+        return os.path.join(self.directory, f"{materialName}.tb")
+
+    def getTable(self, materialName: str) -> Tablebase | None:
+        if materialName not in self.tables:
+            fileName = self.getFileName(materialName)
+            self.tables[materialName] = (
+                Tablebase(fileName, materialName) if isCurrentTable(fileName) else None
+            )
+        return self.tables[materialName]
+
+    def probe(
+        self, position: Position, team: Literal["black", "white"]
+    ) -> tuple[str, int] | None:
+        """
+        Return (result, plies to mate) for the team to move, or None if there is
+        no table for the position's material.
+        """
+        if position.pieceTypes["Pawn"]:
+            return None
+        pieces = {"white": [], "black": []}
+        for number in position.iterateBits(position.getOccupied()):
+            pieceTeam, pieceType = position.squares[number]
+            pieces[pieceTeam].append((LETTERS[pieceType], number))
+        for teamPieces in pieces.values():
+            teamPieces.sort(key=lambda piece: LETTER_ORDER.index(piece[0]))
+
+        whiteLetters = "".join(letter for letter, _ in pieces["white"])
+        blackLetters = "".join(letter for letter, _ in pieces["black"])
+        # bare kings can never be mated
+        if whiteLetters == "K" and blackLetters == "K":
+            return (DRAWN, 0)
+
+        materialName, swapped = getCanonicalMaterial(whiteLetters, blackLetters)
+        table = self.getTable(materialName)
+        if table is None:
+            return None
+        tableWhite = "black" if swapped else "white"
+        tableBlack = position.getOpponentTeam(tableWhite)
+        tileNumbers = [number for _, number in pieces[tableWhite]] + [
+            number for _, number in pieces[tableBlack]
+        ]
+        sideIndex = 0 if team == tableWhite else 1
+        return decodeValue(table.getValue(table.getIndex(sideIndex, tileNumbers)))
+
+    def close(self):
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables = {}
+
+
+class TablebasesInstance:
+    """
+    Declare a single instance of the Tablebases class per board side length for
+    the entire application. Uses Singleton design pattern.
+    """
+
+    objs: dict[int, Tablebases] = {}
+
+    @staticmethod
+    def getInstance(sideLength: int) -> Tablebases:
+        if sideLength not in TablebasesInstance.objs:
+            TablebasesInstance.objs[sideLength] = Tablebases(sideLength)
+        return TablebasesInstance.objs[sideLength]
+
+
+def getSymmetries(sideLength: int) -> list[list[int]]:
+    """
+    Return the tile each tile goes to under each of the 8 rotations and
+    reflections of a square board, the identity first.
+    """
+    last = sideLength - 1
+    mappings = (
+        lambda row, column: (row, column),
+        lambda row, column: (column, last - row),
+        lambda row, column: (last - row, last - column),
+        lambda row, column: (last - column, row),
+        lambda row, column: (row, last - column),
+        lambda row, column: (last - row, column),
+        lambda row, column: (column, row),
+        lambda row, column: (last - column, last - row),
+    )
+    symmetries = []
+    for mapping in mappings:
+        symmetry = []
+        for number in range(0, sideLength * sideLength):
+            row, column = mapping(*divmod(number, sideLength))
+            symmetry.append(row * sideLength + column)
+        symmetries.append(symmetry)
+    return symmetries
+
+
+class TableIndex:
+    """
+    TableIndex class numbers the positions of one material set on one board
+    size, each position once up to the board's symmetries, so tables hold a
+    fraction of every placement of every piece.
+
+    Pawnless positions play the same when the board is rotated or reflected,
+    so the white king is always put in the triangle a1-e1-e5 (for 10x10), and
+    of the positions that leaves, the one with the lowest index is used. The
+    two kings are numbered together as a pair of tiles that are not next to
+    each other. Pieces of the same team and type are interchangeable, so each
+    group of them is numbered as a combination of tiles, leaving out the
+    kings' tiles.
+
+    An index is the side to move, then the king pair, then the combination of
+    each group in getTablePieces() order, as digits of a mixed radix number.
+    Indices of placements that are not the lowest of their symmetries, or with
+    two pieces on one tile, are not positions.
+    """
+
+    def __init__(self, materialName: str, sideLength: int) -> None:
+        self.materialName = materialName
+        self.sideLength = sideLength
+        self.numberOfTiles = numberOfTiles = sideLength * sideLength
+        self.pieces = getTablePieces(materialName)
+        self.pieceCount = len(self.pieces)
+        self.whiteKingSlot = self.pieces.index(("white", "King"))
+        self.blackKingSlot = self.pieces.index(("black", "King"))
+
+        # slots of each group of interchangeable pieces, kings left out
+        self.groups: list[tuple[int, ...]] = []
+        for slot, piece in enumerate(self.pieces):
+            if piece[1] == "King":
+                continue
+            if self.groups and self.pieces[self.groups[-1][0]] == piece:
+                self.groups[-1] += (slot,)
+            else:
+                self.groups.append((slot,))
+        self.groupSizes = [comb(numberOfTiles - 2, len(group)) for group in self.groups]
+        # binomials[n][k] for ranking combinations of up to the largest group
+        largestGroup = max((len(group) for group in self.groups), default=0)
+        self.binomials = [
+            [comb(n, k) for k in range(0, largestGroup + 1)]
+            for n in range(0, numberOfTiles)
+        ]
+
+        half = (sideLength + 1) // 2
+        region = {
+            row * sideLength + column
+            for row in range(sideLength - half, sideLength)
+            for column in range(0, half)
+            if column >= sideLength - 1 - row
+        }
+        symmetries = getSymmetries(sideLength)
+        # the symmetries taking each tile into the white king's region
+        self.regionSymmetries = [
+            [symmetry for symmetry in symmetries if symmetry[number] in region]
+            for number in range(0, numberOfTiles)
+        ]
+
+        kingAttacks = AttackTablesInstance.getInstance(sideLength).kingAttacks
+        self.kingPairs = [
+            (whiteKing, blackKing)
+            for whiteKing in sorted(region)
+            for blackKing in range(0, numberOfTiles)
+            if blackKing != whiteKing and not kingAttacks[whiteKing] >> blackKing & 1
+        ]
+        self.kingPairIndices = {
+            pair: index for index, pair in enumerate(self.kingPairs)
+        }
+        self.size = 2 * len(self.kingPairs) * prod(self.groupSizes)
+
+    def encode(self, sideIndex: int, tileNumbers: list[int]) -> int | None:
+        """
+        Return the index of a position, given the tile number of every piece
+        in getTablePieces() order, or None if its kings stand next to each
+        other.
+        """
+        bestIndex = None
+        for symmetry in self.regionSymmetries[tileNumbers[self.whiteKingSlot]]:
+            index = self._encodePlacement(
+                sideIndex, [symmetry[number] for number in tileNumbers]
+            )
+            if index is None:
+                return None
+            if bestIndex is None or index < bestIndex:
+                bestIndex = index
+        return bestIndex
+
+    def _encodePlacement(self, sideIndex: int, tileNumbers: list[int]) -> int | None:
+        pairIndex = self.kingPairIndices.get(
+            (tileNumbers[self.whiteKingSlot], tileNumbers[self.blackKingSlot])
+        )
+        if pairIndex is None:
+            return None
+        firstKing, secondKing = sorted(
+            (tileNumbers[self.whiteKingSlot], tileNumbers[self.blackKingSlot])
+        )
+        binomials = self.binomials
+        index = sideIndex * len(self.kingPairs) + pairIndex
+        for group, groupSize in zip(self.groups, self.groupSizes):
+            # the rank of a tile among the tiles the kings leave free
+            ranks = sorted(
+                tileNumbers[slot]
+                - (tileNumbers[slot] > firstKing)
+                - (tileNumbers[slot] > secondKing)
+                for slot in group
+            )
+            combination = 0
+            for count, rank in enumerate(ranks, 1):
+                combination += binomials[rank][count]
+            index = index * groupSize + combination
+        return index
+
+    def decode(self, index: int) -> tuple[int, list[int]] | None:
+        """
+        Return (sideIndex, tileNumbers) of the position with an index, or None
+        if the index is not a position.
+        """
+        encodedIndex = index
+        tileNumbers = [0] * self.pieceCount
+        groupRanks = []
+        for group, groupSize in zip(reversed(self.groups), reversed(self.groupSizes)):
+            index, combination = divmod(index, groupSize)
+            groupRanks.append((group, self._decodeCombination(combination, len(group))))
+        sideIndex, pairIndex = divmod(index, len(self.kingPairs))
+        whiteKing, blackKing = self.kingPairs[pairIndex]
+        tileNumbers[self.whiteKingSlot] = whiteKing
+        tileNumbers[self.blackKingSlot] = blackKing
+
+        firstKing, secondKing = sorted((whiteKing, blackKing))
+        for group, ranks in groupRanks:
+            for slot, rank in zip(group, ranks):
+                number = rank + (rank >= firstKing)
+                number += number >= secondKing
+                tileNumbers[slot] = number
+
+        if len(set(tileNumbers)) != self.pieceCount:
+            return None
+        if self.encode(sideIndex, tileNumbers) != encodedIndex:
+            return None
+        return sideIndex, tileNumbers
+
+    def _decodeCombination(self, combination: int, count: int) -> list[int]:
+        binomials = self.binomials
+        ranks = [0] * count
+        rank = self.numberOfTiles - 3
+        for position in range(count, 0, -1):
+            while binomials[rank][position] > combination:
+                rank -= 1
+            ranks[position - 1] = rank
+            combination -= binomials[rank][position]
+            rank -= 1
+        return ranks
+
+
+class TableIndexInstance:
+    """
+    Declare a single instance of the TableIndex class per material set and
+    board side length for the entire application. Uses Singleton design
+    pattern.
+    """
+
+    objs: dict[tuple[str, int], TableIndex] = {}
+
+    @staticmethod
+    def getInstance(materialName: str, sideLength: int) -> TableIndex:
+        key = (materialName, sideLength)
+        if key not in TableIndexInstance.objs:
+            TableIndexInstance.objs[key] = TableIndex(materialName, sideLength)
+        return TableIndexInstance.objs[key]
+
+
+# tables opened by a generator worker process, kept for its later chunks
+_workerTablebases: dict[tuple, Tablebases] = {}
+
+
+def classifyChunk(arguments: tuple) -> tuple:
+    """
+    First generation pass over the positions start to stop of a table, run in a
+    worker process. Marks impossible positions, counts every position's moves
+    and resolves captures into the already solved smaller tables.
+
+    Moves reaching the same position, once symmetries are counted, are counted
+    once, as propagation finds each predecessor of a position once.
+
+    Returns the chunk's values, move counts and longest losing distances so far,
+    plus the (index, value) of positions already known to be won or lost.
+    """
+    sideLength, directory, materialName, start, stop = arguments
+    key = (sideLength, directory)
+    if key not in _workerTablebases:
+        _workerTablebases[key] = Tablebases(sideLength, directory)
+    tablebases = _workerTablebases[key]
+    tableIndex = TableIndexInstance.getInstance(materialName, sideLength)
+
+    pieces = tableIndex.pieces
+    position = Position(sideLength)
+    values = bytearray(stop - start)
+    remainingMoves = bytearray(stop - start)
+    lossDistances = bytearray(stop - start)
+    resolved = []
+
+    for index in range(start, stop):
+        offset = index - start
+        decoded = tableIndex.decode(index)
+        if decoded is None:
+            values[offset] = INVALID
+            continue
+        sideIndex, tileNumbers = decoded
+
+        position.clear()
+        for (pieceTeam, pieceType), number in zip(pieces, tileNumbers):
+            position.placePiece(number, pieceTeam, pieceType)
+        team = "white" if sideIndex == 0 else "black"
+        opponentTeam = position.getOpponentTeam(team)
+        opponentKing = position.getPieces(opponentTeam, "King")
+        # the side that just moved cannot have left its king attacked
+        if position.attackedTiles[team] & opponentKing:
+            values[offset] = INVALID
+            continue
+
+        moveGenerator = MoveGenerator(position, team)
+        moves = moveGenerator.generateLegalMoves()
+        if not moves:
+            # stalemate stays a draw
+            if moveGenerator.isInCheck():
+                resolved.append((index, encodeValue(LOSS, 0)))
+            continue
+
+        slots = {number: slot for slot, number in enumerate(tileNumbers)}
+        successors = set()
+        moveCount = 0
+        winDistance = None
+        lossDistance = 0
+        for fromNumber, toNumber in moves:
+            if position.squares[toNumber] is None:
+                successorNumbers = list(tileNumbers)
+                successorNumbers[slots[fromNumber]] = toNumber
+                successors.add(tableIndex.encode(1 - sideIndex, successorNumbers))
+                continue
+            moveCount += 1
+            undoRecord = position.makeMove(fromNumber, toNumber)
+            probeResult = tablebases.probe(position, opponentTeam)
+            position.unmakeMove(undoRecord)
+            if probeResult is None:
+                raise FileNotFoundError(
+                    f"A table needed to solve {materialName} is missing"
+                )
+            result, distance = probeResult
+            if result == LOSS:
+                if winDistance is None or distance + 1 < winDistance:
+                    winDistance = distance + 1
+            elif result == WIN:
+                moveCount -= 1
+                lossDistance = max(lossDistance, distance + 1)
+        moveCount += len(successors)
+
+        remainingMoves[offset] = moveCount
+        lossDistances[offset] = lossDistance
+        if winDistance is not None:
+            resolved.append((index, encodeValue(WIN, winDistance)))
+        elif moveCount == 0:
+            resolved.append((index, encodeValue(LOSS, lossDistance)))
+
+    return start, bytes(values), bytes(remainingMoves), bytes(lossDistances), resolved
+
+
+def findPredecessors(tableIndex: TableIndex, index: int) -> list[int]:
+    """
+    Return the index of every position that reaches this one by a move that
+    does not capture, each once. Pieces other than pawns move the same way in
+    both directions, so the moves are found from where the pieces stand now.
+    """
+    attackTables = AttackTablesInstance.getInstance(tableIndex.sideLength)
+    sideIndex, tileNumbers = tableIndex.decode(index)
+    # the side that just moved is not the side to move
+    moverTeam = "black" if sideIndex == 0 else "white"
+    moverSideIndex = 1 - sideIndex
+    occupied = 0
+    for number in tileNumbers:
+        occupied |= 1 << number
+
+    predecessors = set()
+    for slot, (pieceTeam, pieceType) in enumerate(tableIndex.pieces):
+        if pieceTeam != moverTeam:
+            continue
+        number = tileNumbers[slot]
+        if pieceType == "Knight":
+            fromTiles = attackTables.knightAttacks[number]
+        elif pieceType == "King":
+            fromTiles = attackTables.kingAttacks[number]
+        else:
+            fromTiles = 0
+            for direction in SLIDER_DIRECTIONS[pieceType]:
+                fromTiles |= attackTables.getRayAttacks(number, direction, occupied)
+        fromTiles &= ~occupied
+
+        predecessorNumbers = list(tileNumbers)
+        for fromNumber in Position.iterateBits(fromTiles):
+            predecessorNumbers[slot] = fromNumber
+            predecessor = tableIndex.encode(moverSideIndex, predecessorNumbers)
+            # a king cannot have come from next to the other king
+            if predecessor is not None:
+                predecessors.add(predecessor)
+    return sorted(predecessors)
+
+
+def findPredecessorsChunk(arguments: tuple) -> list[tuple[int, list[int]]]:
+    """
+    findPredecessors() of some positions of a table, run in a worker process.
+    """
+    sideLength, materialName, indices = arguments
+    tableIndex = TableIndexInstance.getInstance(materialName, sideLength)
+    return [(index, findPredecessors(tableIndex, index)) for index in indices]
+
+
+class TablebaseGenerator:
+    """
+    TablebaseGenerator class solves pawnless material sets by retrograde
+    analysis and writes them to disk for Tablebase to read.
+
+    Every position is first classified in parallel across worker processes,
+    which finds the checkmates and the results of captures into smaller,
+    already solved tables. Results are then spread backwards through un-moves,
+    one distance to mate at a time, so every stored distance is the shortest
+    win or the longest defence. The un-moves of the positions resolved at each
+    distance are found in parallel too. Positions never resolved are draws.
+
+    Tables hold a byte per position of TableIndex, about 2 * numberOfTiles **
+    pieces / 8 bytes, less for repeated pieces. Generation runs at thousands
+    of positions per second per worker in pure Python, so up to four pieces
+    are practical on 10x10 and five pieces on 8x8 with many workers.
+    """
+
+    def __init__(
+        self, sideLength: int, directory: str = TABLEBASE_DIR, workers: int = 1
+    ) -> None:
+        self.sideLength = sideLength
+        self.numberOfTiles = sideLength * sideLength
+        self.directory = directory
+        self.workers = workers
+        self.tablebases = Tablebases(sideLength, directory)
+
+    def getTableSize(self, materialName: str) -> int:
+        """
+        Return how many positions the table of a material set holds, the
+        largest of the tables generate() would solve for it.
+        """
+        canonicalName, _ = getCanonicalMaterial(*parseMaterial(materialName))
+        return TableIndexInstance.getInstance(canonicalName, self.sideLength).size
+
+    def generate(self, materialName: str) -> list[str]:
+        """
+        Solve a material set along with every smaller set it can capture down
+        to, skipping tables already on disk in this version's format. Returns
+        the names of the tables written.
+        """
+        whiteLetters, blackLetters = parseMaterial(materialName)
+        canonicalName, _ = getCanonicalMaterial(whiteLetters, blackLetters)
+        if canonicalName == "KvK" or isCurrentTable(
+            self.tablebases.getFileName(canonicalName)
+        ):
+            return []
+
+        generated = []
+        for sideLetters, otherLetters in (
+            (whiteLetters, blackLetters),
+            (blackLetters, whiteLetters),
+        ):
+            for letter in set(sideLetters) - {"K"}:
+                fewerLetters = sideLetters.replace(letter, "", 1)
+                generated += self.generate(f"{fewerLetters}v{otherLetters}")
+
+        self._solve(canonicalName)
+        return generated + [canonicalName]
+
+    def _solve(self, materialName: str):
+        tableIndex = TableIndexInstance.getInstance(materialName, self.sideLength)
+        size = tableIndex.size
+        values = bytearray(size)
+        remainingMoves = bytearray(size)
+        lossDistances = bytearray(size)
+        # distance to mate -> (index, value) of positions to resolve at it
+        buckets: dict[int, list[tuple[int, int]]] = {}
+
+        def addToBucket(index: int, value: int):
+            distance = value - LOSS_OFFSET if value >= LOSS_OFFSET else value
+            buckets.setdefault(distance, []).append((index, value))
+
+        chunkSize = max(1, min(CLASSIFY_CHUNK_SIZE, size // (self.workers * 4) + 1))
+        chunks = [
+            (
+                self.sideLength,
+                self.directory,
+                materialName,
+                start,
+                min(start + chunkSize, size),
+            )
+            for start in range(0, size, chunkSize)
+        ]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for start, chunkValues, chunkRemaining, chunkLosses, resolved in pool.map(
+                classifyChunk, chunks
+            ):
+                stop = start + len(chunkValues)
+                values[start:stop] = chunkValues
+                remainingMoves[start:stop] = chunkRemaining
+                lossDistances[start:stop] = chunkLosses
+                for index, value in resolved:
+                    addToBucket(index, value)
+
+            distance = 0
+            while buckets:
+                # every position resolved at this distance, before their
+                # predecessors are, as those are only resolved further out
+                isLoss = {}
+                for index, value in buckets.pop(distance, []):
+                    if values[index] != DRAW:
+                        continue
+                    values[index] = value
+                    isLoss[index] = value >= LOSS_OFFSET
+
+                indices = list(isLoss)
+                chunkSize = max(
+                    1,
+                    min(PREDECESSOR_CHUNK_SIZE, len(indices) // (self.workers * 4) + 1),
+                )
+                chunks = [
+                    (self.sideLength, materialName, indices[start : start + chunkSize])
+                    for start in range(0, len(indices), chunkSize)
+                ]
+                for chunkPredecessors in pool.map(findPredecessorsChunk, chunks):
+                    for index, predecessors in chunkPredecessors:
+                        for predecessor in predecessors:
+                            if values[predecessor] != DRAW:
+                                continue
+                            if isLoss[index]:
+                                addToBucket(predecessor, encodeValue(WIN, distance + 1))
+                                continue
+                            remainingMoves[predecessor] -= 1
+                            lossDistances[predecessor] = max(
+                                lossDistances[predecessor], distance + 1
+                            )
+                            if remainingMoves[predecessor] == 0:
+                                addToBucket(
+                                    predecessor,
+                                    encodeValue(LOSS, lossDistances[predecessor]),
+                                )
+                distance += 1
+
+        self._write(materialName, tableIndex.pieceCount, values)
+
+    def _write(self, materialName: str, pieceCount: int, values: bytearray):
+        fileName = self.tablebases.getFileName(materialName)
+        os.makedirs(os.path.dirname(fileName), exist_ok=True)
+        temporaryFileName = f"{fileName}.tmp"
+        with open(temporaryFileName, "wb") as tableFile:
+            tableFile.write(HEADER.pack(MAGIC, VERSION, self.sideLength, pieceCount))
+            tableFile.write(values)
+        os.replace(temporaryFileName, fileName)
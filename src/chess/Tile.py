@@ -5,35 +5,38 @@ from .Space import Space
 
 
 class Tile(Space):
-    def __init__(
-        self,
-        fileName: str | None = None,
-        relativeDir: str = "chess/data/tile/",
-        coord: list = [0, 0],
-        scale=1,
-        number: int = 0,
-    ):
+    def __init__(self, fileName: str | None = None, number: int = 0):
         if fileName is None:
             fileName = "black"
-        Space.__init__(self, fileName, relativeDir, scale, coord, number)
+        Space.__init__(self, number)
 
+        self.fileName = fileName
         self.colour = fileName
         self.piece = None
 
     def __str__(self):
         return str(self.number)
 
-    def placePiece(self, piece: Piece) -> bool:
+    def placePiece(self, piece: Piece, syncPosition: bool = True) -> bool:
         if not self.isOccupied() and self.piece is None:
             self.piece = piece
             self.isNowOccupied()
+            if syncPosition and self.position is not None:
+                self.position.placePiece(
+                    self.number, piece.getTeam(), piece.type, piece.isOnHomeSpace()
+                )
             return True
         raise Exception(f"Tile {self.number} is already occupied!")
 
-    def removePiece(self) -> bool:
+    def removePiece(self, syncPosition: bool = True) -> bool:
         self.piece = None
         self.isNoLongerOccupied()
+        if syncPosition and self.position is not None:
+            self.position.removePiece(self.number)
         return True
 
     def getPiece(self) -> Piece:
         return self.piece
+
+    def getFileName(self) -> str:
+        return self.fileName
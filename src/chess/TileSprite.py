@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from .engine.SpriteImage import SpriteImage
+from .Tile import Tile
+
+
+class TileSprite(SpriteImage):
+    """
+    TileSprite class draws a tile of the board, highlighted while the tile is.
+    """
+
+    def __init__(
+        self,
+        tile: Tile,
+        relativeDir: str = "chess/data/tile/",
+        coord: list = [0, 0],
+    ) -> None:
+        SpriteImage.__init__(self, tile.getFileName(), relativeDir, None, 1, coord)
+        self.tile = tile
+
+    def getTile(self) -> Tile:
+        return self.tile
+
+    def isHighlighted(self) -> bool:
+        return self.tile.isHighlighted()
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .BatchEvaluator import PIECE_CODES, BatchEvaluator, encodePosition
+from .constants.constants import PIECE_TYPES, POINTS_VALUES
+from .EvaluationParameters import EvaluationParameters, flipTileNumber
+from .MoveGenerator import MoveGenerator
+from .SelfPlay import BLACK_WINS, DRAW, SETUPS, WHITE_WINS
+
+# game result from white's point of view
+GAME_RESULTS = {WHITE_WINS: 1.0, DRAW: 0.5, BLACK_WINS: 0.0}
+# the first moves say more about move ordering than about who is better
+SKIPPED_OPENING_PLIES = 8
+# kings are never taken, so their value cannot be fitted
+TUNED_PIECE_TYPES = tuple(pieceType for pieceType in PIECE_TYPES if pieceType != "King")
+
+
+def extractQuietPositions(
+    gameRecords: list[dict],
+) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+    """
+    Replay self-play game records and collect their quiet positions, where the
+    side to move is not in check and has no captures, so a static score is not
+    taken halfway through an exchange.
+
+    Returns board side length -> (an (N, tiles) array of piece codes, the
+    result of each position's game from white's point of view).
+    """
+    positions: dict[int, tuple[list, list]] = {}
+    for gameRecord in gameRecords:
+        result = GAME_RESULTS[gameRecord["result"]]
+        position = SETUPS[gameRecord["setup"]]()
+        codes, results = positions.setdefault(position.sideLength, ([], []))
+        team = "white"
+        for ply, move in enumerate(gameRecord["moves"]):
+            if ply >= SKIPPED_OPENING_PLIES:
+                moveGenerator = MoveGenerator(position, team)
+                if (
+                    not moveGenerator.isInCheck()
+                    and not moveGenerator.generateLegalCaptures()
+                ):
+                    codes.append(encodePosition(position))
+                    results.append(result)
+            position.makeMove(*move)
+            team = position.getOpponentTeam(team)
+
+    return {
+        sideLength: (np.stack(codes), np.array(results, dtype=np.float64))
+        for sideLength, (codes, results) in positions.items()
+        if codes
+    }
+
+
+class TexelTuner:
+    """
+    TexelTuner class fits the piece values and piece-square tables of one board
+    size to game results, Texel style. A position's score s is turned into an
+    expected result 1 / (1 + 10 ** (-K * s / 400)), and the mean squared error
+    against the results of the games the positions came from is minimised by
+    gradient descent (Adam), over all positions at once.
+
+    Material and piece-square tables are linear in the parameters, so every
+    position is turned into a row of feature counts once, and the mobility term
+    the engine also scores is held fixed. K is fitted first, to the starting
+    parameters, so that only the parameters move the error afterwards.
+    Parameters are pulled towards their starting values by an L2 penalty, as
+    most tiles are seen in few positions.
+    """
+
+    def __init__(
+        self,
+        sideLength: int,
+        codes: np.ndarray,
+        results: np.ndarray,
+        parameters: EvaluationParameters,
+        regularisation: float = 1e-6,
+    ) -> None:
+        self.sideLength = sideLength
+        self.numberOfTiles = sideLength * sideLength
+        self.results = results
+        self.regularisation = regularisation
+        self.scalingConstant = 1.0
+
+        pieceValues = parameters.getPieceValues(sideLength, POINTS_VALUES)
+        pieceSquareTables = parameters.getPieceSquareTables(sideLength)
+        self.startingParameters = np.array(
+            [pieceValues[pieceType] for pieceType in TUNED_PIECE_TYPES]
+            + [
+                value
+                for pieceType in PIECE_TYPES
+                for value in pieceSquareTables[pieceType]
+            ],
+            dtype=np.float64,
+        )
+        self.parameters = self.startingParameters.copy()
+
+        self.features = self._createFeatures(codes)
+        self.fixedScores = BatchEvaluator(
+            sideLength, pieceValues={}, pieceSquareTables={}, kingSafetyWeight=0
+        ).evaluate(codes)
+
+    def _createFeatures(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Return the (N, parameters) array of how many times every parameter is
+        counted for white, less for black, in each position.
+        """
+        flippedTiles = [
+            flipTileNumber(number, self.sideLength)
+            for number in range(0, self.numberOfTiles)
+        ]
+        materialFeatures = [
+            (codes == PIECE_CODES[pieceType]).sum(axis=1)
+            - (codes == -PIECE_CODES[pieceType]).sum(axis=1)
+            for pieceType in TUNED_PIECE_TYPES
+        ]
+        tableFeatures = [
+            (codes == PIECE_CODES[pieceType]).astype(np.float32)
+            - (codes == -PIECE_CODES[pieceType])[:, flippedTiles]
+            for pieceType in PIECE_TYPES
+        ]
+        return np.concatenate(
+            [np.stack(materialFeatures, axis=1).astype(np.float32)] + tableFeatures,
+            axis=1,
+        )
+
+    def getScores(self, parameters: np.ndarray | None = None) -> np.ndarray:
+        if parameters is None:
+            parameters = self.parameters
+        return self.features @ parameters.astype(np.float32) + self.fixedScores
+
+    def _getExpectedResults(self, scores: np.ndarray, scalingConstant: float):
+        return 1 / (1 + np.power(10.0, -scalingConstant * scores / 400))
+
+    def getError(self, parameters: np.ndarray | None = None) -> float:
+        expectedResults = self._getExpectedResults(
+            self.getScores(parameters), self.scalingConstant
+        )
+        return float(np.mean((self.results - expectedResults) ** 2))
+
+    def fitScalingConstant(self) -> float:
+        """
+        Find the K that fits the starting parameters best, narrowing a grid
+        search around the best K a few times.
+        """
+        scores = self.getScores(self.startingParameters)
+        low, high = 0.01, 4.0
+        for _ in range(0, 4):
+            candidates = np.linspace(low, high, 41)
+            errors = [
+                np.mean((self.results - self._getExpectedResults(scores, k)) ** 2)
+                for k in candidates
+            ]
+            best = int(np.argmin(errors))
+            step = candidates[1] - candidates[0]
+            low, high = max(0.001, candidates[best] - step), candidates[best] + step
+        self.scalingConstant = float(candidates[best])
+        return self.scalingConstant
+
+    def tune(self, iterations: int = 1000, learningRate: float = 1.0) -> float:
+        """
+        Run Adam for a number of iterations, in centipawns per step, and return
+        the error reached.
+        """
+        beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+        firstMoment = np.zeros_like(self.parameters)
+        secondMoment = np.zeros_like(self.parameters)
+        positionCount = len(self.results)
+        for iteration in range(1, iterations + 1):
+            expectedResults = self._getExpectedResults(
+                self.getScores(), self.scalingConstant
+            )
+            # derivative of the mean squared error with respect to each score
+            scoreGradients = (
+                -2
+                * (self.results - expectedResults)
+                * expectedResults
+                * (1 - expectedResults)
+                * np.log(10)
+                * self.scalingConstant
+                / 400
+                / positionCount
+            )
+            gradient = self.features.T @ scoreGradients.astype(np.float32)
+            gradient += (
+                2 * self.regularisation * (self.parameters - self.startingParameters)
+            )
+
+            firstMoment = beta1 * firstMoment + (1 - beta1) * gradient
+            secondMoment = beta2 * secondMoment + (1 - beta2) * gradient**2
+            correctedFirst = firstMoment / (1 - beta1**iteration)
+            correctedSecond = secondMoment / (1 - beta2**iteration)
+            self.parameters -= (
+                learningRate * correctedFirst / (np.sqrt(correctedSecond) + epsilon)
+            )
+        return self.getError()
+
+    def getPieceValues(self) -> dict[str, int]:
+        return {
+            pieceType: int(round(value))
+            for pieceType, value in zip(TUNED_PIECE_TYPES, self.parameters)
+        }
+
+    def getPieceSquareTables(self) -> dict[str, list[int]]:
+        tables = self.parameters[len(TUNED_PIECE_TYPES) :].reshape(
+            len(PIECE_TYPES), self.numberOfTiles
+        )
+        return {
+            pieceType: [int(round(value)) for value in table]
+            for pieceType, table in zip(PIECE_TYPES, tables)
+        }
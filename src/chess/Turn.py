@@ -1,13 +1,22 @@
 from abc import ABC, abstractmethod
 
 from .Board import Board
+from .constants.constants import COMPUTER_MOVE_TIME_MS
+from .Engine import searchInWorker
 from .engine.EventManager import EventManagerInstance, Events
 from .engine.Notification import NotificationInstance
+from .engine.WorkerPool import Job, WorkerPoolInstance
+from .MoveGenerator import CHECKMATE, ONGOING, REPETITION, STALEMATE
 from .Piece import Piece
+from .SaveJournal import SaveJournalInstance
+from .schemas.SearchResult import SearchResult
 from .Space import Space
+from .Tablebase import LOSS, WIN, TablebasesInstance
 
 notification = NotificationInstance.getInstance()
 eventManager = EventManagerInstance.getInstance()
+workerPool = WorkerPoolInstance.getInstance()
+journal = SaveJournalInstance.getInstance()
 
 
 class Turn(ABC):
@@ -49,151 +58,95 @@ class MovePieceTurn(Turn):
     def __init__(self, board: Board) -> None:
         super().__init__(board)
 
-    def _undoMove(self):
-        lastMove = self.board.popMoveFromMoveStack()
-        if lastMove is not None:
-            lastMove.oldSpace.highlight()
-            lastMove.piece.move(lastMove.oldSpace, updatePosition=False)
-            lastMove.piece.setCoord(lastMove.oldSpace.getCoord())
-            lastMove.oldSpace.stopHighlight()
-            if lastMove.otherPiece is not None:
-                lastMove.newSpace.highlight()
-                lastMove.otherPiece.move(lastMove.newSpace, updatePosition=False)
-                lastMove.otherPiece.setCoord(lastMove.newSpace.getCoord())
-                lastMove.newSpace.stopHighlight()
-        else:
-            raise Exception("MovePieceTurn _undoMove: no move was found")
-
     def execute(self, selectedSpace: Space) -> bool:
         if self.board.isAPieceSelected():
             piece: Piece = self.board.getSelectedPiece()
             currentSpace = piece.getSpace()
             otherPiece: Piece = selectedSpace.getPiece()
-            successful_move = piece.move(selectedSpace, updatePosition=False)
-            if successful_move:
-                self.board.addMoveToMoveStack(
-                    {
-                        "piece": piece,
-                        "otherPiece": otherPiece,
-                        "oldSpace": currentSpace,
-                        "newSpace": selectedSpace,
-                    }
-                )
-                self.board.makeAllPiecesFindPotentialTiles()
-                if self.board.checkIsThereCheck():
-                    self._undoMove()
-                    self.board.makeAllPiecesFindPotentialTiles()
-                    self.board.highlightPotentialTiles()
-                    notification.push("cannot move, will put King in check")
+            if selectedSpace in piece.getPotentialSpaces():
+                # potential spaces only hold legal moves, no trial move is needed
+                move = self.board.commitMove(piece, selectedSpace)
+                if otherPiece is not None:
+                    notification.push(
+                        f"{otherPiece.getObjectNameAndTeam()} was defeated by {piece.getObjectNameAndTeam()}"
+                    )
+                    eventManager.post(
+                        event=Events.TAKE_PIECE_EVENT,
+                        data={
+                            "playerName": piece.getPlayerName(),
+                            "points": otherPiece.getPointsValue(),
+                        },
+                    )
                 else:
-                    piece.updatePosition(piece.getSpace().getCoord())
-                    if otherPiece is not None:
-                        otherPiece.kill()
-                        notification.push(
-                            f"{otherPiece.getObjectNameAndTeam()} was defeated by {piece.getObjectNameAndTeam()}"
-                        )
-                        self.board.getCurrentPlayer().incrementPoints(
-                            otherPiece.getPointsValue()
-                        )
-                        eventManager.post(
-                            event=Events.TAKE_PIECE_EVENT,
-                            data={
-                                "playerName": piece.getPlayerName(),
-                                "points": otherPiece.getPointsValue(),
-                            },
-                        )
-                    else:
-                        notification.push("successfully moved")
-                    eventManager.post(event=Events.CHANGE_PLAYER_EVENT)
-                    self.board.changeCurrentPlayer()
-                    self.board.deselectPiece()
-                    self.board.makeAllPiecesFindPotentialTiles()
-                    self.board.setIsCheck(self.board.checkIsThereCheck())
-                    if self.board.isInCheck():
-                        eventManager.post(event=Events.CHECK_EVENT)
-                    # save board after every successful turn, in case the game crashes
-                    self.board.save()
+                    notification.push("successfully moved")
+                eventManager.post(event=Events.CHANGE_PLAYER_EVENT)
+                if self.board.isInCheck():
+                    eventManager.post(event=Events.CHECK_EVENT)
+                # journal every successful turn, in case the game crashes
+                journal.recordMove(self.board, move)
+            elif piece.canReachIgnoringCheck(self.board.position, selectedSpace):
+                notification.push("cannot move, will put King in check")
             elif selectedSpace is not currentSpace:
                 notification.push(f"invalid space")
 
 
 class IsBoardInCheckMateTurn(Turn):
     """
-    Check if a player is in checkmate.
+    Check if the game has ended for the current player, by checkmate, stalemate
+    or threefold repetition.
     """
 
     def __init__(self, board: Board) -> None:
         super().__init__(board)
 
-    def _undoMove(self):
-        lastMove = self.board.popMoveFromMoveStack()
-        if lastMove is not None:
-            lastMove.oldSpace.highlight()
-            lastMove.piece.move(lastMove.oldSpace, updatePosition=False)
-            lastMove.piece.setCoord(lastMove.oldSpace.getCoord())
-            lastMove.oldSpace.stopHighlight()
-            if lastMove.otherPiece is not None:
-                lastMove.newSpace.highlight()
-                lastMove.otherPiece.move(lastMove.newSpace, updatePosition=False)
-                lastMove.otherPiece.setCoord(lastMove.newSpace.getCoord())
-                lastMove.newSpace.stopHighlight()
-        else:
-            raise Exception("IsBoardInCheckMateTurn _undoMove: no move was found")
-
-    def _checkAllPiecesForCheckmate(self) -> bool:
-        """Brute force to see if checkmate has occurred"""
-        currentPlayerPieces = self.board.getCurrentPlayersPiecesOnBoard()
-        stopLoop = False
-        for piece in currentPlayerPieces:
-            self.board.selectPiece(piece)
-            potentialSpaces = piece.getPotentialSpaces()
-            for space in potentialSpaces:
-                self.board.highlightPotentialTiles()
-                oldSpace = piece.getSpace()
-                otherPiece = space.getPiece()
-                successful_move = piece.move(space, updatePosition=False)
-                if successful_move:
-                    self.board.addMoveToMoveStack(
-                        {
-                            "piece": piece,
-                            "otherPiece": otherPiece,
-                            "oldSpace": oldSpace,
-                            "newSpace": space,
-                        }
-                    )
-                    self.board.makeAllPiecesFindPotentialTiles()
-                if not self.board.checkIsThereCheck():
-                    stopLoop = True
-                self._undoMove()
-                self.board.makeAllPiecesFindPotentialTiles()
-                if stopLoop:
-                    break
-            self.board.deselectPiece()
-            if stopLoop:
-                return False
-        return True
-
     def execute(self):
         king = self.board.getCurrentPlayersKing()
         if king.getPlayerName() == self.board.getCurrentPlayer().getName():
             if king.getIsOnBoard():
-                self.board.selectPiece(king)
-                self.board.highlightPotentialTiles()
-                # king can move
-                if self.board.areAnyTilesHighlighted():
-                    self.board.deselectPiece()
-                    return
-                # king cannot move, look at other pieces
-                self.board.deselectPiece()
-                eventManager.post(event=Events.FREEZE_DISPLAY_EVENT)
-                isCheckmate = self._checkAllPiecesForCheckmate()
-                eventManager.post(event=Events.STOP_FREEZE_DISPLAY_EVENT)
-                if isCheckmate:
+                gameStatus = self.board.getGameStatus()
+                if gameStatus == CHECKMATE:
                     otherPlayer = self.board.getOtherPlayer()
                     notification.push(
                         message=f"Game finished! {otherPlayer.getName()} ({otherPlayer.getTeam()}) won!",
                         persist=5000,
                     )
+                elif gameStatus == STALEMATE:
+                    notification.push(
+                        message="Game finished! Stalemate, it is a draw!",
+                        persist=5000,
+                    )
+                elif gameStatus == REPETITION:
+                    notification.push(
+                        message="Game finished! Threefold repetition, it is a draw!",
+                        persist=5000,
+                    )
+                elif gameStatus == ONGOING:
+                    self._notifyTablebaseResult()
+
+    def _notifyTablebaseResult(self):
+        """
+        Tell the players how the game ends with best play when a tablebase has
+        been generated for the pieces left on the board.
+        """
+        position = self.board.position
+        currentPlayer = self.board.getCurrentPlayer()
+        probeResult = TablebasesInstance.getInstance(position.sideLength).probe(
+            position, currentPlayer.getTeam()
+        )
+        if probeResult is None:
+            return
+        result, distance = probeResult
+        if result == WIN:
+            winner = currentPlayer
+        elif result == LOSS:
+            winner = self.board.getOtherPlayer()
+        else:
+            notification.push(message="Tablebase: it is a draw with best play")
+            return
+        notification.push(
+            message=f"Tablebase: {winner.getName()} ({winner.getTeam()}) mates in "
+            f"{(distance + 1) // 2} moves"
+        )
 
 
 class MovePieceCheckTurn(Turn):
@@ -201,75 +154,36 @@ class MovePieceCheckTurn(Turn):
     def __init__(self, board: Board) -> None:
         super().__init__(board)
 
-    def _undoMove(self):
-        lastMove = self.board.popMoveFromMoveStack()
-        if lastMove is not None:
-            lastMove.oldSpace.highlight()
-            lastMove.piece.move(lastMove.oldSpace, updatePosition=False)
-            lastMove.piece.setCoord(lastMove.oldSpace.getCoord())
-            lastMove.oldSpace.stopHighlight()
-            if lastMove.otherPiece is not None:
-                lastMove.newSpace.highlight()
-                lastMove.otherPiece.move(lastMove.newSpace, updatePosition=False)
-                lastMove.otherPiece.setCoord(lastMove.newSpace.getCoord())
-                lastMove.newSpace.stopHighlight()
-        else:
-            raise Exception("MovePieceCheckTurn _undoMove: no move was found")
-
     def execute(self, selectedSpace: Space) -> bool:
         isCheckmate = self.board.isInCheck()
         if self.board.isAPieceSelected() and isCheckmate:
             piece: Piece = self.board.getSelectedPiece()
             currentSpace = piece.getSpace()
             otherPiece: Piece = selectedSpace.getPiece()
-            successful_move = piece.move(selectedSpace, updatePosition=False)
-            # mock a successful turn to see if the board is still in checkmate
-            if successful_move:
-                self.board.addMoveToMoveStack(
-                    {
-                        "piece": piece,
-                        "otherPiece": otherPiece,
-                        "oldSpace": currentSpace,
-                        "newSpace": selectedSpace,
-                    }
-                )
-                self.board.makeAllPiecesFindPotentialTiles()
-                self.board.setIsCheck(self.board.checkIsThereCheck())
-                if self.board.isInCheck():
-                    self._undoMove()
-                    self.board.makeAllPiecesFindPotentialTiles()
-                    self.board.highlightPotentialTiles()
-                    notification.push("invalid space, still in checkmate")
-
+            if selectedSpace in piece.getPotentialSpaces():
+                # potential spaces only hold legal moves, no trial move is needed
+                move = self.board.commitMove(piece, selectedSpace)
+                if otherPiece is not None:
+                    notification.push(
+                        f"{otherPiece.getObjectNameAndTeam()} was defeated by {piece.getObjectNameAndTeam()}"
+                    )
+                    eventManager.post(
+                        event=Events.TAKE_PIECE_EVENT,
+                        data={
+                            "playerName": piece.getPlayerName(),
+                            "points": otherPiece.getPointsValue(),
+                        },
+                    )
                 else:
-                    if otherPiece is not None:
-                        otherPiece.kill()
-                        notification.push(
-                            f"{otherPiece.getObjectNameAndTeam()} was defeated by {piece.getObjectNameAndTeam()}"
-                        )
-                        self.board.getCurrentPlayer().incrementPoints(
-                            otherPiece.getPointsValue()
-                        )
-                        eventManager.post(
-                            event=Events.TAKE_PIECE_EVENT,
-                            data={
-                                "playerName": piece.getPlayerName(),
-                                "points": otherPiece.getPointsValue(),
-                            },
-                        )
-                    else:
-                        notification.push("successfully moved")
-                    piece.updatePosition(piece.getSpace().getCoord())
-                    eventManager.post(event=Events.STOP_CHECK_EVENT)
-                    eventManager.post(event=Events.CHANGE_PLAYER_EVENT)
-                    self.board.changeCurrentPlayer()
-                    self.board.deselectPiece()
-                    self.board.makeAllPiecesFindPotentialTiles()
-                    self.board.setIsCheck(self.board.checkIsThereCheck())
-                    if self.board.isInCheck():
-                        eventManager.post(event=Events.CHECK_EVENT)
-                    # save board after every successful turn, in case the game crashes
-                    self.board.save()
+                    notification.push("successfully moved")
+                eventManager.post(event=Events.STOP_CHECK_EVENT)
+                eventManager.post(event=Events.CHANGE_PLAYER_EVENT)
+                if self.board.isInCheck():
+                    eventManager.post(event=Events.CHECK_EVENT)
+                # journal every successful turn, in case the game crashes
+                journal.recordMove(self.board, move)
+            elif piece.canReachIgnoringCheck(self.board.position, selectedSpace):
+                notification.push("invalid space, still in checkmate")
             elif selectedSpace is not currentSpace:
                 notification.push(f"invalid space")
 
@@ -279,50 +193,103 @@ class UndoTurn(Turn):
     def __init__(self, board: Board) -> None:
         super().__init__(board)
 
-    def _undoMove(self) -> bool:
-        lastMove = self.board.popMoveFromMoveStack()
-        if lastMove is not None:
-            lastMove.oldSpace.highlight()
-            lastMove.piece.move(lastMove.oldSpace)
-            # lastMove.piece.setCoord(lastMove.oldSpace.getCoord())
-            lastMove.oldSpace.stopHighlight()
-            if lastMove.otherPiece is not None:
-                lastMove.newSpace.highlight()
-                lastMove.otherPiece.move(lastMove.newSpace, updatePosition=False)
-                lastMove.otherPiece.setCoord(lastMove.newSpace.getCoord())
-                lastMove.newSpace.stopHighlight()
-                self.board.getOtherPlayer().decreasePoints(
-                    lastMove.otherPiece.getPointsValue()
-                )
-                eventManager.post(
-                    event=Events.UNDO_MOVE_REPLACE_SPRITE_EVENT,
-                    data={
-                        "otherPiece": lastMove.otherPiece,
-                        "playerName": lastMove.piece.getPlayerName(),
-                        "points": lastMove.otherPiece.getPointsValue(),
-                    },
-                )
-            eventManager.post(event=Events.UNDO_MOVE_EVENT)
-            return True
-        return False
-
     def execute(self) -> bool:
         if not self.board.isAPieceSelected():
-            undo_successful = self._undoMove()
-            if undo_successful:
+            lastMove = self.board.takeBackMove()
+            if lastMove is not None:
+                if lastMove.otherPiece is not None:
+                    eventManager.post(
+                        event=Events.UNDO_MOVE_REPLACE_SPRITE_EVENT,
+                        data={
+                            "otherPiece": lastMove.otherPiece,
+                            "playerName": lastMove.piece.getPlayerName(),
+                            "points": lastMove.otherPiece.getPointsValue(),
+                        },
+                    )
+                eventManager.post(event=Events.UNDO_MOVE_EVENT)
                 notification.push("undo last move")
                 eventManager.post(event=Events.CHANGE_PLAYER_EVENT)
-                self.board.changeCurrentPlayer()
-                self.board.deselectPiece()
-                self.board.makeAllPiecesFindPotentialTiles()
-                self.board.setIsCheck(self.board.checkIsThereCheck())
                 if self.board.isInCheck():
                     eventManager.post(event=Events.CHECK_EVENT)
                 else:
                     eventManager.post(event=Events.STOP_CHECK_EVENT)
-                # save board after every successful turn, in case the game crashes
-                self.board.save()
+                # journal every successful turn, in case the game crashes
+                journal.recordUndo(self.board)
             else:
                 notification.push("cannot undo, no move left to undo")
         else:
             notification.push("cannot undo, deselect piece first")
+
+
+class ComputerMoveTurn(Turn):
+    """
+    Let the engine pick and play a move for the current player, if it is a
+    computer player. The search runs in the worker pool, execute() only starts
+    it and playMove() is called with the result once
+    COMPUTER_MOVE_FOUND_EVENT arrives.
+    """
+
+    def __init__(self, board: Board, timeBudgetMs: int = COMPUTER_MOVE_TIME_MS) -> None:
+        super().__init__(board)
+        self.timeBudgetMs = timeBudgetMs
+        self.pointsValues = self.board.getPointsValues()
+        self.job: Job | None = None
+        self.movePieceTurn = MovePieceTurn(board)
+        self.movePieceCheckTurn = MovePieceCheckTurn(board)
+
+    def isThinking(self) -> bool:
+        return self.job is not None
+
+    def cancel(self):
+        """
+        Stop waiting for the search in progress, its move will not be played.
+        """
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+
+    def execute(self) -> bool:
+        if self.isThinking():
+            return False
+        player = self.board.getCurrentPlayer()
+        if not player.isComputerPlayer():
+            return False
+        if self.board.getGameStatus() != ONGOING:
+            return False
+
+        self.job = workerPool.submit(
+            Events.COMPUTER_MOVE_FOUND_EVENT,
+            searchInWorker,
+            self.pointsValues,
+            self.timeBudgetMs,
+            self.board.position.copy(),
+            player.getTeam(),
+            data={"positionHash": self.board.getHash()},
+        )
+        notification.push(f"{player.getName()} is thinking...")
+        return True
+
+    def playMove(self, result: SearchResult | None, positionHash: int) -> bool:
+        self.job = None
+        # the board changed while the engine was thinking
+        if result is None or positionHash != self.board.getHash():
+            return False
+        if result.bestMove is None:
+            return False
+
+        player = self.board.getCurrentPlayer()
+        message = (
+            f"{player.getName()} searched {result.nodes} nodes to depth "
+            f"{result.depth} ({result.nodesPerSecond:.0f} nodes/s)"
+        )
+
+        fromNumber, toNumber = result.bestMove
+        tiles = self.board.getTiles()
+        self.board.deselectPiece()
+        self.board.selectPiece(tiles[fromNumber].getPiece())
+        if self.board.isInCheck():
+            self.movePieceCheckTurn.execute(tiles[toNumber])
+        else:
+            self.movePieceTurn.execute(tiles[toNumber])
+        notification.push(message)
+        return True
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from random import Random
+
+from .constants.constants import PIECE_TYPES, TEAMS
+
+
+class ZobristKeys:
+    """
+    ZobristKeys class holds the random 64 bit keys that are XORed together to
+    hash a position: one per piece type, team and tile, one per tile for a pawn
+    still on its home tile and one for black being the side to move. Keys are
+    drawn from a generator seeded with the board side length, so a position
+    hashes to the same value in every run and can be used as a stable key.
+    """
+
+    def __init__(self, sideLength: int) -> None:
+        self.sideLength = sideLength
+        self.numberOfTiles = sideLength * sideLength
+
+        generator = Random(sideLength)
+        self.pieceKeys: dict[tuple[str, str], list[int]] = {
+            (team, pieceType): [
+                generator.getrandbits(64) for _ in range(0, self.numberOfTiles)
+            ]
+            for team in TEAMS
+            for pieceType in PIECE_TYPES
+        }
+        self.pawnHomeKeys: list[int] = [
+            generator.getrandbits(64) for _ in range(0, self.numberOfTiles)
+        ]
+        self.blackToMoveKey: int = generator.getrandbits(64)
+
+    def getSideToMoveKey(self, team: str) -> int:
+        return self.blackToMoveKey if team == "black" else 0
+
+
+class ZobristKeysInstance:
+    """
+    Declare a single instance of the ZobristKeys class per board side length for
+    the entire application. Uses Singleton design pattern.
+    """
+
+    objs: dict[int, ZobristKeys] = {}
+
+    @staticmethod
+    def getInstance(sideLength: int) -> ZobristKeys:
+        if sideLength not in ZobristKeysInstance.objs:
+            ZobristKeysInstance.objs[sideLength] = ZobristKeys(sideLength)
+        return ZobristKeysInstance.objs[sideLength]
@@ -7,3 +7,40 @@ blackFontColour = (0, 0, 0)
 
 PLAYER_1 = "Player1"
 PLAYER_2 = "Player2"
+
+# players moved by the engine in a new game, and how long it may think per move.
+# The select mode screen lets COMPUTER_OPPONENT be played by the engine instead.
+COMPUTER_PLAYERS = ()
+COMPUTER_OPPONENT = PLAYER_2
+COMPUTER_MOVE_TIME_MS = 1000
+
+# "thread" or "process", where expensive work such as engine searches runs
+WORKER_POOL_MODE = "process"
+
+# directory holding the endgame tablebases, one subdirectory per board side length
+TABLEBASE_DIR = "tablebases"
+
+TEAMS = ("white", "black")
+PIECE_TYPES = ("Pawn", "Knight", "Bishop", "Rook", "Queen", "King")
+# points a player is awarded for taking a piece
+POINTS_VALUES = {
+    "Pawn": 1,
+    "Knight": 3,
+    "Bishop": 3,
+    "Rook": 5,
+    "Queen": 9,
+    "King": 999,
+}
+
+# positional weights of the engine's evaluation, in centipawns
+MOBILITY_WEIGHT = 3
+CENTRE_WEIGHT = 4
+CENTRALISED_PIECE_TYPES = ("Knight", "Bishop")
+# tuned piece values and piece-square tables per board size, written by tune.py
+EVALUATION_PARAMETERS_FILE = "evaluation_parameters.json"
+
+# where the game is saved, and the .cfg save written before the binary format
+SAVE_FILE = "save.kcs"
+LEGACY_SAVE_FILE = "save.cfg"
+# moves journalled after a save before the save is rewritten with them
+JOURNAL_COMPACTION_RECORDS = 64
@@ -1,5 +1,5 @@
 from ..constants.constants import PLAYER_1, PLAYER_2, blackFontColour, windowSize
-from .utilities import load_image, resource_path
+from .utilities import load_image, render_text, resource_path
 
 currentPlayerBackgroundScale = (windowSize[1] + 150) / 1280
 
@@ -13,6 +13,8 @@ class CurrentPlayerSurface:
         self.playerSurface = None
         self.backGroundSurface = None
         self.textSurface = None
+        # message textSurface was rendered from
+        self.renderedMessage = None
         self.font_size = 30
         self.font = None
         self.message = "turn"
@@ -42,9 +44,15 @@ class CurrentPlayerSurface:
 
     def _setTextSurface(self):
         """
-        Set text surface based on font. Call this after pygame.init()
+        Set text surface based on font, if the message changed since it was
+        last set. Call this after pygame.init()
         """
-        self.textSurface = self.font.render(self.message, False, blackFontColour)
+        if self.textSurface is not None and self.renderedMessage == self.message:
+            return
+        self.textSurface = render_text(
+            self.font, self.font_size, self.message, blackFontColour
+        )
+        self.renderedMessage = self.message
 
     def _setBackgroundSurface(self):
         """
@@ -99,6 +107,8 @@ class PlayerPointsSurface:
         self.playerSurface = None
         self.backGroundSurface = None
         self.textSurface = None
+        # message textSurface was rendered from
+        self.renderedMessage = None
         self.font_size = 30
         self.font = None
         self.message = "turn"
@@ -131,9 +141,15 @@ class PlayerPointsSurface:
 
     def _setTextSurface(self):
         """
-        Set text surface based on font. Call this after pygame.init()
+        Set text surface based on font, if the message changed since it was
+        last set. Call this after pygame.init()
         """
-        self.textSurface = self.font.render(self.message, False, blackFontColour)
+        if self.textSurface is not None and self.renderedMessage == self.message:
+            return
+        self.textSurface = render_text(
+            self.font, self.font_size, self.message, blackFontColour
+        )
+        self.renderedMessage = self.message
 
     def _setBackgroundSurface(self):
         """
@@ -1,6 +1,10 @@
 import pygame as pg
 
+from .HoverTracker import HoverTracker
+from .Profiler import DRAW, FLIP, SPRITES, ProfilerInstance
+from .ProfilerOverlay import ProfilerOverlay
 from .SpriteGroup import SpriteGroup
+from .SpriteIndex import SpriteIndex
 
 
 class DisplayInstance:
@@ -22,6 +26,12 @@ class Display:
     Display class allows for screen updates at different places in the codebase.
     Main use case is to allow for screen updates to occur within a Turn.execute()
     method without needing to expose logic in the main game loop.
+
+    Only the parts of the screen that changed are redrawn and updated. The
+    background set (background and HUD panels) is drawn onto a composite
+    surface that sprites are drawn over, and a panel is only redrawn on it when
+    its surface, position or alpha changes. The whole screen is redrawn when
+    the sprites or the background set are swapped for another screen's.
     """
 
     def __init__(self) -> None:
@@ -29,37 +39,123 @@ class Display:
         self.backgroundSet = None
         self.background = None
         self.sprites: SpriteGroup = None
+        # finds the sprites under the mouse, every sprite when not given
+        self.spriteIndex: SpriteIndex | None = None
+        self.hoverTracker = HoverTracker()
+        self.profiler = ProfilerInstance.getInstance()
+        # drawn over the background set while toggled on
+        self.profilerOverlay = ProfilerOverlay(self.profiler)
+        # background set drawn onto a surface of the screen's size
+        self.composite: pg.Surface | None = None
+        # (surface, topleft, alpha) of every background set piece on composite
+        self.drawnBackgroundSet: list[tuple] | None = None
+        self.drawnSprites: SpriteGroup | None = None
+        # background set and overlay pieces of the frame being drawn
+        self.backgroundPieces: list[tuple] = []
 
     def setup(self, screen, backgroundSet, background, sprites):
         self.screen = screen
         self.backgroundSet = backgroundSet
         self.background = background
         self.sprites = sprites
+        self.composite = pg.Surface(screen.get_size()).convert()
+        self.profilerOverlay.setup(pg.font.Font)
+        self.drawnBackgroundSet = None
+        self.drawnSprites = None
 
-    def setSprites(self, sprites: SpriteGroup):
+    def setSprites(self, sprites: SpriteGroup, spriteIndex: SpriteIndex | None = None):
         self.sprites = sprites
+        self.spriteIndex = spriteIndex
 
     def getSprites(self):
         return self.sprites
 
+    def getSpritesAt(self, pos: tuple) -> list:
+        """
+        Return the sprites on screen under a position, bottom layer first.
+        """
+        if self.spriteIndex is not None:
+            return self.spriteIndex.getSpritesAt(pos)
+        if self.sprites is None:
+            return []
+        return [sprite for sprite in self.sprites if sprite.rect.collidepoint(pos)]
+
     def setBackgroundSet(self, backgroundSet):
         self.backgroundSet = backgroundSet
 
     def setBackground(self, background):
         self.background = background
 
+    def toggleProfilerOverlay(self):
+        self.profilerOverlay.toggle()
+
     def updateSprites(self):
         if self.sprites is not None:
             self.sprites.update()
 
     def clear(self):
-        self.sprites.clear(self.screen, self.background)
+        self.sprites.clear(self.screen, self.composite)
+
+    def _getBackgroundSetKeys(self) -> list[tuple]:
+        return [
+            (surface, (int(coord[0]), int(coord[1])), surface.get_alpha())
+            for surface, coord in self.backgroundPieces
+        ]
+
+    def _drawBackgroundSet(self, area: pg.Rect | None = None):
+        """
+        Draw the background set onto the composite surface, only inside area
+        when it is given.
+        """
+        self.composite.set_clip(area)
+        for backgroundPiece in self.backgroundPieces:
+            self.composite.blit(*backgroundPiece)
+        self.composite.set_clip(None)
+
+    def _updateBackground(self) -> list[pg.Rect]:
+        """
+        Bring the composite surface up to date with the background set, and
+        return the screen areas that changed.
+        """
+        self.backgroundPieces = [*self.backgroundSet, *self.profilerOverlay.render()]
+        keys = self._getBackgroundSetKeys()
+        drawnKeys = self.drawnBackgroundSet
+        self.drawnBackgroundSet = keys
+        if (
+            drawnKeys is None
+            or len(drawnKeys) != len(keys)
+            or self.sprites is not self.drawnSprites
+        ):
+            self.drawnSprites = self.sprites
+            self._drawBackgroundSet()
+            return [self.screen.get_rect()]
+
+        changedAreas = []
+        for key, drawnKey in zip(keys, drawnKeys):
+            if key != drawnKey:
+                # the old area is uncovered and the new one covered
+                area = key[0].get_rect(topleft=key[1])
+                drawnArea = drawnKey[0].get_rect(topleft=drawnKey[1])
+                changedAreas.append(area)
+                if drawnArea != area:
+                    changedAreas.append(drawnArea)
+        for area in changedAreas:
+            self._drawBackgroundSet(area)
+        return changedAreas
 
     def updateDisplay(self):
-        self.updateSprites()
-        for backgroundPiece in self.backgroundSet:
-            self.screen.blit(*backgroundPiece)
-        if self.sprites is not None:
-            self.sprites.draw(self.screen)
-        pg.display.flip()
-        # flip() the display to put your work on screen / update screen
+        with self.profiler.measure(SPRITES):
+            self.hoverTracker.update(self.getSpritesAt(pg.mouse.get_pos()))
+            self.updateSprites()
+        with self.profiler.measure(DRAW):
+            changedAreas = self._updateBackground()
+            if self.sprites is None:
+                self.screen.blit(self.composite, (0, 0))
+            else:
+                for area in changedAreas:
+                    self.sprites.repaint_rect(area)
+                changedAreas = self.sprites.draw(self.screen, self.composite)
+        # only the changed areas are copied to the screen
+        with self.profiler.measure(FLIP):
+            pg.display.update(changedAreas)
+        self.profiler.markFrameShown()
@@ -9,8 +9,7 @@ class Events:
     STOP_CHECK_EVENT = pg.event.custom_type()
     UNDO_MOVE_EVENT = pg.event.custom_type()
     UNDO_MOVE_REPLACE_SPRITE_EVENT = pg.event.custom_type()
-    FREEZE_DISPLAY_EVENT = pg.event.custom_type()
-    STOP_FREEZE_DISPLAY_EVENT = pg.event.custom_type()
+    COMPUTER_MOVE_FOUND_EVENT = pg.event.custom_type()
 
 
 class EventManagerInstance:
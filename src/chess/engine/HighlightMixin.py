@@ -0,0 +1,16 @@
+class HighlightMixin:
+    """
+    Highlight state of a piece or tile of the board model. Sprites show it, but
+    it is kept in the model so selecting pieces works without a display.
+    """
+
+    _highlighted = False
+
+    def isHighlighted(self) -> bool:
+        return self._highlighted
+
+    def highlight(self):
+        self._highlighted = True
+
+    def stopHighlight(self):
+        self._highlighted = False
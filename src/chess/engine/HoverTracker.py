@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+
+class HoverTracker:
+    """
+    HoverTracker class follows which sprites are under the mouse, and only
+    tells the sprites the mouse enters or leaves, so sprites do not look for
+    the mouse themselves every frame.
+    """
+
+    def __init__(self) -> None:
+        self.hoveredSprites: set = set()
+
+    def update(self, spritesUnderMouse: list):
+        hoveredSprites = set(spritesUnderMouse)
+        for sprite in self.hoveredSprites - hoveredSprites:
+            sprite.stopHover()
+        for sprite in hoveredSprites - self.hoveredSprites:
+            sprite.hover()
+        self.hoveredSprites = hoveredSprites
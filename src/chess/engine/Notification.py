@@ -1,7 +1,7 @@
 import pygame as pg
 
 from ..constants.constants import blackFontColour, windowSize
-from .utilities import load_image, resource_path
+from .utilities import load_image, render_text, resource_path
 
 notificationTextCoord = (windowSize[0] * 0.02, windowSize[1] * 0.93)
 notificationBackgroundCoord = (windowSize[0] * 0.005, windowSize[1] * 0.92)
@@ -87,22 +87,29 @@ class Notification:
         """
         Set text surface based on font. Call this after pygame.init()
         """
-        self.textSurface = self.font.render(self.message, False, blackFontColour)
+        self.textSurface = render_text(
+            self.font, self.font_size, self.message, blackFontColour
+        )
 
     def _setBackgroundSurface(self):
         """
         Set text box for messages. Call this after pygame.init()
         """
-        self.backgroundSurface, _ = load_image(
+        backgroundSurface, _ = load_image(
             "notifications/notification_window.png",
             scale=notificationBackgroundScale,
         )
+        # the fade changes the surface's alpha, keep it off the cached surface
+        self.backgroundSurface = backgroundSurface.copy()
 
     def push(self, message: str, persist: int = 1000):
         self.messageQueue.append(NotificationHolder(msg=message, persist=persist))
 
     def _renderMessage(self, message):
-        self.textSurface = self.font.render(message, False, blackFontColour)
+        # the fade changes the surface's alpha, keep it off the cached surface
+        self.textSurface = render_text(
+            self.font, self.font_size, message, blackFontColour
+        ).copy()
 
     def _fadeOutText(self, persist: int):
         """
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from time import perf_counter
+
+# frame phases, "turns" is measured within "events"
+FRAME = "frame"
+EVENTS = "events"
+TURNS = "turns"
+SPRITES = "sprites"
+DRAW = "draw"
+FLIP = "flip"
+# from handling a click on the board to the frame showing its result
+CLICK_LATENCY = "click"
+# writing the save file and journal, on the save thread
+SAVE = "save"
+PHASES = (FRAME, EVENTS, TURNS, SPRITES, DRAW, FLIP, CLICK_LATENCY, SAVE)
+
+# samples kept per phase, ten seconds at 60 frames per second
+PROFILER_SAMPLES = 600
+
+
+class RingBuffer:
+    """
+    RingBuffer class keeps the latest samples in a fixed size list, the
+    oldest sample being overwritten once it is full.
+    """
+
+    def __init__(self, capacity: int = PROFILER_SAMPLES) -> None:
+        self.capacity = capacity
+        self.samples = [0.0] * capacity
+        self.index = 0
+        self.count = 0
+
+    def append(self, value: float):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def getSamples(self) -> list[float]:
+        """
+        Return the samples held, in no particular order.
+        """
+        return self.samples[: self.count]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class Profiler:
+    """
+    Profiler class times the phases of each frame, and how long a click on the
+    board takes to show on screen. The latest samples of every phase are kept
+    in a RingBuffer, and getStats() summarises them in milliseconds.
+    """
+
+    def __init__(self, capacity: int = PROFILER_SAMPLES) -> None:
+        self.capacity = capacity
+        self.buffers: dict[str, RingBuffer] = {}
+        self.clickTime: float | None = None
+
+    def record(self, phase: str, seconds: float):
+        if phase not in self.buffers:
+            self.buffers[phase] = RingBuffer(self.capacity)
+        self.buffers[phase].append(seconds)
+
+    @contextmanager
+    def measure(self, phase: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, perf_counter() - start)
+
+    def markClick(self, clickTime: float | None = None):
+        """
+        Note that a click was handled, its latency is recorded once the next
+        frame is on screen. clickTime is the perf_counter() when handling the
+        click began, now if not given, so the turn it ran is counted too.
+        """
+        self.clickTime = perf_counter() if clickTime is None else clickTime
+
+    def markFrameShown(self):
+        if self.clickTime is not None:
+            self.record(CLICK_LATENCY, perf_counter() - self.clickTime)
+            self.clickTime = None
+
+    def getStats(self) -> dict[str, dict[str, float]]:
+        """
+        Return phase -> count, mean, p50, p95, p99 and max of its samples, in
+        milliseconds, for the phases with samples.
+        """
+        stats = {}
+        # phases can be added by other threads while the stats are worked out
+        for phase, buffer in list(self.buffers.items()):
+            samples = sorted(buffer.getSamples())
+            if not samples:
+                continue
+            count = len(samples)
+            stats[phase] = {
+                "count": count,
+                "mean": sum(samples) / count * 1000,
+                "p50": self._getPercentile(samples, 50) * 1000,
+                "p95": self._getPercentile(samples, 95) * 1000,
+                "p99": self._getPercentile(samples, 99) * 1000,
+                "max": samples[-1] * 1000,
+            }
+        return stats
+
+    @staticmethod
+    def _getPercentile(sortedSamples: list[float], percent: float) -> float:
+        # nearest rank
+        rank = max(1, -(-len(sortedSamples) * percent // 100))
+        return sortedSamples[int(rank) - 1]
+
+    def reset(self):
+        self.buffers = {}
+        self.clickTime = None
+
+
+class ProfilerInstance:
+    """
+    Declare a single instance of the Profiler class for the entire application.
+    Uses Singleton design pattern.
+    """
+
+    obj = None
+
+    @staticmethod
+    def getInstance() -> Profiler:
+        if not ProfilerInstance.obj:
+            ProfilerInstance.obj = Profiler()
+        return ProfilerInstance.obj
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pygame as pg
+
+from .Profiler import PHASES, Profiler
+from .utilities import TextCache, resource_path
+
+overlayCoord = (935, 90)
+overlayFontSize = 18
+overlayFontColour = (255, 255, 255)
+overlayBackgroundColour = (0, 0, 0, 170)
+# how often the numbers are redrawn, redrawing every frame would be measured too
+overlayRefreshMs = 500
+# lines the overlay keeps rendered, about two refreshes' worth
+overlayCachedLines = 32
+
+
+class ProfilerOverlay:
+    """
+    ProfilerOverlay class shows the profiler's frame phase and click latency
+    percentiles on screen, while it is toggled on.
+    """
+
+    def __init__(self, profiler: Profiler, coord: tuple = overlayCoord) -> None:
+        self.profiler = profiler
+        self.coord = coord
+        self.font = None
+        self.font_size = overlayFontSize
+        self.visible = False
+        self.surface = None
+        self.lastRefreshTime = None
+        # the numbers change on nearly every refresh, so lines are kept apart
+        # from the shared TextCache, where they would push out the HUD's text
+        self.textCache = TextCache(overlayCachedLines)
+
+    def setup(self, font):
+        """
+        Pass in pygame.font.Font function. Call this after pygame.init()
+        """
+        self.font = font(
+            resource_path("chess/data/font/BerlinSansFB.TTF"), self.font_size
+        )
+
+    def isVisible(self) -> bool:
+        return self.visible
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.lastRefreshTime = None
+
+    def _getLines(self) -> list[str]:
+        stats = self.profiler.getStats()
+        lines = ["ms       p50     p95     p99"]
+        for phase in PHASES:
+            if phase in stats:
+                phaseStats = stats[phase]
+                lines.append(
+                    f"{phase:<8} {phaseStats['p50']:6.2f}  {phaseStats['p95']:6.2f}"
+                    f"  {phaseStats['p99']:6.2f}"
+                )
+        return lines
+
+    def _setSurface(self):
+        textSurfaces = [
+            self.textCache.getTextSurface(
+                self.font, self.font_size, line, overlayFontColour
+            )
+            for line in self._getLines()
+        ]
+        lineHeight = self.font.get_linesize()
+        width = max(textSurface.get_width() for textSurface in textSurfaces) + 20
+        self.surface = pg.Surface(
+            (width, lineHeight * len(textSurfaces) + 20), pg.SRCALPHA
+        )
+        self.surface.fill(overlayBackgroundColour)
+        for number, textSurface in enumerate(textSurfaces):
+            self.surface.blit(textSurface, (10, 10 + number * lineHeight))
+
+    def render(self) -> list[tuple]:
+        """
+        Return the overlay as background set pieces, none while it is hidden.
+        """
+        if not self.visible:
+            return []
+        currentTime = pg.time.get_ticks()
+        if (
+            self.lastRefreshTime is None
+            or currentTime - self.lastRefreshTime >= overlayRefreshMs
+        ):
+            self._setSurface()
+            self.lastRefreshTime = currentTime
+        return [(self.surface, self.coord)]
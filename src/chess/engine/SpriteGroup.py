@@ -1,10 +1,11 @@
 import pygame as pg
 
 
-class SpriteGroup(pg.sprite.RenderPlain):
+class SpriteGroup(pg.sprite.LayeredDirty):
     """
     SpriteGroup class holds a list of sprites to organise sprites when changing
-    between different sets of sprites.
+    between different sets of sprites. Sprites are drawn in order of their
+    _layer, and only the ones marked dirty are redrawn.
     """
 
     def __init__(self, sprites: list) -> None:
@@ -1,11 +1,14 @@
 import pygame as pg
 
-from .utilities import load_image
+from .utilities import SurfaceCacheInstance, load_image, load_optional_image
 
 
-class SpriteImage(pg.sprite.Sprite):
+class SpriteImage(pg.sprite.DirtySprite):
     """
     Class which concerns itself with displaying objects on screen.
+
+    Sprites are only redrawn when marked dirty, which they do themselves when
+    their image changes or they move.
     """
 
     def __init__(
@@ -23,34 +26,38 @@ class SpriteImage(pg.sprite.Sprite):
         self.colorkey = colorkey
         self.scale = scale
 
-        pg.sprite.Sprite.__init__(self)
+        pg.sprite.DirtySprite.__init__(self)
         self.image, self.rect = load_image(
             f"{fileName}.png", relativeDir, colorkey, scale
         )
-        try:
-            self.hover_image, _ = load_image(
-                f"{fileName}-hover.png", relativeDir, colorkey, scale
-            )
-        except:
-            self.hover_image = self.image
-
-        try:
-            self.highlighted_image, _ = load_image(
+        # variants fall back to the plain image, missing files are remembered
+        # by the surface cache so they are only looked for once
+        self.hover_image = (
+            load_optional_image(f"{fileName}-hover.png", relativeDir, colorkey, scale)
+            or self.image
+        )
+        self.highlighted_image = (
+            load_optional_image(
                 f"{fileName}-highlighted.png", relativeDir, colorkey, scale
             )
-        except:
-            self.highlighted_image = self.image
-
-        try:
-            self.pressdown_image, _ = load_image(
+            or self.image
+        )
+        self.pressdown_image = (
+            load_optional_image(
                 f"{fileName}-pressdown.png", relativeDir, colorkey, scale
             )
-        except:
-            self.pressdown_image = self.image
+            or self.image
+        )
 
         self.original_image = self.image
         self._highlighted = False
         self._pressedDown = False
+        # set by the display's HoverTracker
+        self._hovered = False
+        # visual state -> surface at the sprite's size, see createStateImages()
+        self.stateImages: dict[str, pg.Surface] = {}
+        self.state = None
+        self.createStateImages()
         self.coord = None
         self.setCoord(coord)
 
@@ -64,6 +71,7 @@ class SpriteImage(pg.sprite.Sprite):
         vec = pg.math.Vector2
         vector = vec(self.coord) - vec(self.rect.topleft)
         self.rect.move_ip(*vector)
+        self.dirty = 1
 
     def getCoord(self):
         return self.coord
@@ -75,9 +83,31 @@ class SpriteImage(pg.sprite.Sprite):
         return self.rect.height
 
     def resizeSprite(self, width):
-        size = (width, width)
-        self.image = pg.transform.scale(self.image, size)
+        self.createStateImages((width, width))
         self.rect = self.image.get_rect()
+        self.dirty = 1
+
+    def createStateImages(self, size: tuple | None = None):
+        """
+        Scale the image of every visual state to the given size, or to the
+        current size, once. Sprites of the same kind share the scaled surfaces
+        through the surface cache. Call again after changing the state images.
+        """
+        if size is None:
+            size = self.image.get_size()
+        surfaceCache = SurfaceCacheInstance.getInstance()
+        self.stateImages = {
+            state: surfaceCache.getScaledSurface(image, size)
+            for state, image in (
+                ("original", self.original_image),
+                ("hover", self.hover_image),
+                ("highlighted", self.highlighted_image),
+                ("pressdown", self.pressdown_image),
+            )
+        }
+        self.state = "original"
+        self.image = self.stateImages[self.state]
+        self.dirty = 1
 
     def updatePosition(self, coord):
         """
@@ -95,7 +125,11 @@ class SpriteImage(pg.sprite.Sprite):
         vector = vec(self.coord) - vec(self.rect.topleft)
         if vector.length() > self.movementSpeed:
             vector.scale_to_length(self.movementSpeed)
+        topleft = self.rect.topleft
         self.rect.move_ip(*vector)
+        # tile coordinates can be fractional, the rect stops short of them
+        if self.rect.topleft != topleft:
+            self.dirty = 1
 
     def isHighlighted(self) -> bool:
         return self._highlighted
@@ -106,6 +140,15 @@ class SpriteImage(pg.sprite.Sprite):
     def stopHighlight(self):
         self._highlighted = False
 
+    def isHovered(self) -> bool:
+        return self._hovered
+
+    def hover(self):
+        self._hovered = True
+
+    def stopHover(self):
+        self._hovered = False
+
     def isPressedDown(self):
         return self._pressedDown
 
@@ -115,19 +158,20 @@ class SpriteImage(pg.sprite.Sprite):
     def stopPressDown(self):
         self._pressedDown = False
 
-    def update(self):
-        pos = pg.mouse.get_pos()
-        hit = self.rect.collidepoint(pos)
-        size = self.image.get_size()
-
-        if hit:
-            self.image = pg.transform.scale(self.hover_image, size)
-        elif self.isHighlighted():
-            self.image = pg.transform.scale(self.highlighted_image, size)
-        else:
-            self.image = pg.transform.scale(self.original_image, size)
-
+    def getState(self) -> str:
         if self.isPressedDown():
-            self.image = pg.transform.scale(self.pressdown_image, size)
+            return "pressdown"
+        if self.isHovered():
+            return "hover"
+        if self.isHighlighted():
+            return "highlighted"
+        return "original"
+
+    def update(self):
+        state = self.getState()
+        if state != self.state:
+            self.state = state
+            self.image = self.stateImages[state]
+            self.dirty = 1
 
         self.animate()
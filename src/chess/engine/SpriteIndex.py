@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Callable
+
+
+class SpriteGrid:
+    """
+    SpriteGrid class finds the tile under a screen position with arithmetic,
+    for a square grid of tiles laid out edge to edge from a top left corner.
+    """
+
+    def __init__(
+        self,
+        origin: tuple,
+        tileWidth: float,
+        sideLength: int,
+        getSprites: Callable[[int], list],
+    ) -> None:
+        self.origin = origin
+        self.tileWidth = tileWidth
+        self.sideLength = sideLength
+        # tile number -> sprites drawn on that tile, bottom first
+        self.getSprites = getSprites
+
+    def getTileNumber(self, pos: tuple) -> int | None:
+        column = int((pos[0] - self.origin[0]) // self.tileWidth)
+        row = int((pos[1] - self.origin[1]) // self.tileWidth)
+        if 0 <= column < self.sideLength and 0 <= row < self.sideLength:
+            return row * self.sideLength + column
+        return None
+
+
+class SpriteIndex:
+    """
+    SpriteIndex class answers which sprites are under a screen position without
+    testing every sprite on screen. Sprites on a grid, like the board's, are
+    found by SpriteGrid arithmetic, and the few others, like buttons, are kept
+    in a list and tested by rect.
+    """
+
+    def __init__(self, sprites: list | None = None) -> None:
+        self.sprites = list(sprites) if sprites is not None else []
+        self.grids: list[SpriteGrid] = []
+
+    def addSprites(self, sprites: list):
+        self.sprites += sprites
+
+    def addGrid(
+        self,
+        origin: tuple,
+        tileWidth: float,
+        sideLength: int,
+        getSprites: Callable[[int], list],
+    ):
+        self.grids.append(SpriteGrid(origin, tileWidth, sideLength, getSprites))
+
+    def getSpritesAt(self, pos: tuple) -> list:
+        hitSprites = []
+        for grid in self.grids:
+            number = grid.getTileNumber(pos)
+            if number is not None:
+                hitSprites += grid.getSprites(number)
+        hitSprites += [
+            sprite for sprite in self.sprites if sprite.rect.collidepoint(pos)
+        ]
+        return hitSprites
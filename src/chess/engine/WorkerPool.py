@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import count
+from typing import Callable, Literal
+
+from ..constants.constants import WORKER_POOL_MODE
+from .EventManager import EventManagerInstance
+
+
+class WorkerPoolInstance:
+    """
+    Declare a single instance of the WorkerPool class for the entire application.
+    Uses Singleton design pattern.
+    """
+
+    obj = None
+
+    @staticmethod
+    def getInstance():
+        if not WorkerPoolInstance.obj:
+            WorkerPoolInstance.obj = WorkerPool(mode=WORKER_POOL_MODE)
+        return WorkerPoolInstance.obj
+
+
+class Job:
+    """
+    A piece of work submitted to the WorkerPool. Cancelling a job that has
+    already started does not stop it, but its result is thrown away instead of
+    being posted.
+    """
+
+    def __init__(self, jobId: int, future: Future, event: int, data: dict) -> None:
+        self.jobId = jobId
+        self.future = future
+        self.event = event
+        self.data = data
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.future.cancel()
+
+    def isCancelled(self) -> bool:
+        return self.cancelled
+
+    def isDone(self) -> bool:
+        return self.future.done()
+
+
+class WorkerPool:
+    """
+    Run expensive work, such as an engine search, away from the pygame thread so
+    the game loop keeps drawing at full frame rate. Work runs in a pool of
+    threads or of processes. Processes avoid sharing the interpreter lock with
+    the game loop, but the function and its arguments must be picklable.
+
+    When a job finishes, its result is posted as an EventManager event carrying
+    the job's data along with "jobId", "result" and "error". poll() has to be
+    called every frame for that to happen.
+    """
+
+    def __init__(
+        self, mode: Literal["thread", "process"] = "thread", maxWorkers: int = 1
+    ) -> None:
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool mode {mode}")
+        self.mode = mode
+        self.maxWorkers = maxWorkers
+        # the executor is only started once there is work, so no processes are
+        # spawned for games that never need them
+        self.executor: Executor | None = None
+        self.jobs: list[Job] = []
+        self._jobIds = count()
+        self.eventManager = EventManagerInstance.getInstance()
+
+    def _getExecutor(self) -> Executor:
+        if self.executor is None:
+            if self.mode == "process":
+                self.executor = ProcessPoolExecutor(max_workers=self.maxWorkers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers)
+        return self.executor
+
+    def submit(
+        self, event: int, function: Callable, *args, data: dict | None = None
+    ) -> Job:
+        """
+        Run function(*args) in the pool and post event when it is done.
+        """
+        future = self._getExecutor().submit(function, *args)
+        job = Job(next(self._jobIds), future, event, data or {})
+        self.jobs.append(job)
+        return job
+
+    def poll(self):
+        """
+        Post an event for every job that finished since the last poll.
+        """
+        if not self.jobs:
+            return
+        unfinishedJobs = []
+        for job in self.jobs:
+            if not job.isDone():
+                unfinishedJobs.append(job)
+                continue
+            if job.isCancelled():
+                continue
+
+            result = None
+            error = None
+            try:
+                result = job.future.result()
+            except Exception as exception:
+                error = exception
+            self.eventManager.post(
+                event=job.event,
+                data={**job.data, "jobId": job.jobId, "result": result, "error": error},
+            )
+        self.jobs = unfinishedJobs
+
+    def cancelAll(self):
+        for job in self.jobs:
+            job.cancel()
+        self.jobs = []
+
+    def shutdown(self):
+        self.cancelAll()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
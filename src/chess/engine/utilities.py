@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import sys
+from collections import OrderedDict
 
 import pygame as pg
 
@@ -20,25 +21,191 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
+class SurfaceCache:
+    """
+    SurfaceCache class keeps every image loaded by load_image(), keyed by its
+    path, scale and colorkey, so each image is read from disk and scaled once
+    and sprites of the same kind share their surfaces. Images that do not exist
+    are remembered too, as sprites look for optional variants of every image.
+
+    Surfaces are shared: copy one before changing it in place.
+    """
+
+    def __init__(self) -> None:
+        # (path, scale, colorkey) -> surface, or None when the file is missing
+        self.surfaces: dict[tuple, pg.Surface | None] = {}
+        # (surface, size) -> the surface scaled to a sprite's size
+        self.scaledSurfaces: dict[tuple, pg.Surface] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def getSurface(self, fullname, colorkey=None, scale=1) -> pg.Surface | None:
+        """
+        Return the image at fullname, scaled and with its colorkey set, or None
+        if there is no such file.
+        """
+        key = (fullname, scale, colorkey)
+        if key in self.surfaces:
+            self.hits += 1
+            return self.surfaces[key]
+
+        self.misses += 1
+        try:
+            image = pg.image.load(fullname)
+        except FileNotFoundError:
+            self.surfaces[key] = None
+            return None
+
+        size = image.get_size()
+        size = (size[0] * scale, size[1] * scale)
+        image = pg.transform.scale(image, size)
+
+        if colorkey is not None:
+            if colorkey == -1:
+                colorkey = image.get_at((0, 0))
+            image.set_colorkey(colorkey, pg.RLEACCEL)
+        self.surfaces[key] = image
+        return image
+
+    def getScaledSurface(self, surface: pg.Surface, size: tuple) -> pg.Surface:
+        """
+        Return a surface scaled to size, the same one for every sprite asking
+        for the same surface at the same size.
+        """
+        size = (int(size[0]), int(size[1]))
+        if surface.get_size() == size:
+            return surface
+        key = (surface, size)
+        if key in self.scaledSurfaces:
+            self.hits += 1
+            return self.scaledSurfaces[key]
+        self.misses += 1
+        scaledSurface = pg.transform.scale(surface, size)
+        self.scaledSurfaces[key] = scaledSurface
+        return scaledSurface
+
+    def getStats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "images": sum(1 for image in self.surfaces.values() if image is not None),
+            "missingImages": sum(
+                1 for image in self.surfaces.values() if image is None
+            ),
+        }
+
+    def clear(self):
+        self.surfaces = {}
+        self.scaledSurfaces = {}
+        self.hits = 0
+        self.misses = 0
+
+
+class SurfaceCacheInstance:
+    """
+    Declare a single instance of the SurfaceCache class for the entire
+    application.
+    Uses Singleton design pattern.
+    """
+
+    obj = None
+
+    @staticmethod
+    def getInstance():
+        if not SurfaceCacheInstance.obj:
+            SurfaceCacheInstance.obj = SurfaceCache()
+        return SurfaceCacheInstance.obj
+
+
+class TextCache:
+    """
+    TextCache class keeps rendered text surfaces, keyed by font, font size,
+    text and colour, so text that is shown again is not rasterized again. Only
+    the most recently used surfaces are kept, as notifications show a lot of
+    different text.
+
+    Surfaces are shared: copy one before changing it in place.
+    """
+
+    def __init__(self, maxSurfaces: int = 256) -> None:
+        self.maxSurfaces = maxSurfaces
+        # (font, size, text, colour) -> surface, least recently used first
+        self.surfaces: OrderedDict[tuple, pg.Surface] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def getTextSurface(self, font, size: int, text: str, colour) -> pg.Surface:
+        key = (font, size, text, tuple(colour))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, False, colour)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxSurfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def getStats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "surfaces": len(self.surfaces),
+        }
+
+    def clear(self):
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+class TextCacheInstance:
+    """
+    Declare a single instance of the TextCache class for the entire
+    application.
+    Uses Singleton design pattern.
+    """
+
+    obj = None
+
+    @staticmethod
+    def getInstance():
+        if not TextCacheInstance.obj:
+            TextCacheInstance.obj = TextCache()
+        return TextCacheInstance.obj
+
+
+def render_text(font, size, text, colour):
+    """
+    Return text rendered in font, from the shared TextCache.
+    """
+    return TextCacheInstance.getInstance().getTextSurface(font, size, text, colour)
+
+
 def load_image(name, relative_dir="chess/data/", colorkey=None, scale=1):
     """
     Must wrap the relative path of an image with this function,
     otherwise the game cannot be exported into an executable file.
+
+    Images come from the shared SurfaceCache. Raises FileNotFoundError if the
+    image does not exist.
     """
-    # fullname = os.path.join(data_dir, name)
     fullname = resource_path(relative_dir + name)
-    image = pg.image.load(fullname)
-    # image = image.convert()
+    image = SurfaceCacheInstance.getInstance().getSurface(fullname, colorkey, scale)
+    if image is None:
+        raise FileNotFoundError(f"No file '{fullname}' found")
+    return image, image.get_rect()
 
-    size = image.get_size()
-    size = (size[0] * scale, size[1] * scale)
-    image = pg.transform.scale(image, size)
 
-    if colorkey is not None:
-        if colorkey == -1:
-            colorkey = image.get_at((0, 0))
-        image.set_colorkey(colorkey, pg.RLEACCEL)
-    return image, image.get_rect()
+def load_optional_image(name, relative_dir="chess/data/", colorkey=None, scale=1):
+    """
+    Return an image like load_image(), or None if it does not exist.
+    """
+    fullname = resource_path(relative_dir + name)
+    return SurfaceCacheInstance.getInstance().getSurface(fullname, colorkey, scale)
 
 
 class colors:
@@ -0,0 +1,26 @@
+from typing import Literal, Optional
+
+
+class PositionSetup:
+    """
+    A position as written in a position string: the (team, pieceType) on each
+    tile, the team to move, the tiles of pawns still on their home tile, and
+    the move counters.
+    """
+
+    __slots__ = (
+        "sideLength",
+        "squares",
+        "team",
+        "pawnHomes",
+        "halfmoveClock",
+        "fullmoveNumber",
+    )
+
+    def __init__(self, **kwargs):
+        self.sideLength: int = kwargs["sideLength"]
+        self.squares: list[Optional[tuple[str, str]]] = kwargs["squares"]
+        self.team: Literal["black", "white"] = kwargs["team"]
+        self.pawnHomes: list[int] = kwargs["pawnHomes"]
+        self.halfmoveClock: int = kwargs["halfmoveClock"]
+        self.fullmoveNumber: int = kwargs["fullmoveNumber"]
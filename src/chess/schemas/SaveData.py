@@ -0,0 +1,27 @@
+class SaveData:
+    """
+    Everything a save file holds, whichever format it was read from.
+
+    Pieces are configs in BoardConfig's shape, with a pawn's homeSpace, in the
+    board's order. Players are {name, team, points, isComputer}. Moves are
+    (piece, otherPiece, oldSpace, newSpace), the pieces as indices into pieces
+    and otherPiece None when nothing was captured. startingMoveCounters are the
+    halfmove clock and fullmove number the game started from.
+    """
+
+    __slots__ = (
+        "numberOfTiles",
+        "pieces",
+        "players",
+        "currentPlayer",
+        "moves",
+        "startingMoveCounters",
+    )
+
+    def __init__(self, **kwargs):
+        self.numberOfTiles: int = kwargs["numberOfTiles"]
+        self.pieces: list[dict] = kwargs["pieces"]
+        self.players: list[dict] = kwargs["players"]
+        self.currentPlayer: str = kwargs["currentPlayer"]
+        self.moves: list[tuple[int, int | None, int, int]] = kwargs["moves"]
+        self.startingMoveCounters: tuple[int, int] = kwargs["startingMoveCounters"]
@@ -0,0 +1,25 @@
+from typing import Optional
+
+
+class SearchResult:
+    """
+    What Engine.search() found: the move to play as (fromNumber, toNumber), its
+    score in centipawns for the searching team and the work it took.
+    """
+
+    __slots__ = (
+        "bestMove",
+        "score",
+        "depth",
+        "nodes",
+        "seconds",
+        "nodesPerSecond",
+    )
+
+    def __init__(self, **kwargs):
+        self.bestMove: Optional[tuple[int, int]] = kwargs["bestMove"]
+        self.score: int = kwargs["score"]
+        self.depth: int = kwargs["depth"]
+        self.nodes: int = kwargs["nodes"]
+        self.seconds: float = kwargs["seconds"]
+        self.nodesPerSecond: float = kwargs["nodesPerSecond"]
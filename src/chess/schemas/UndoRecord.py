@@ -0,0 +1,31 @@
+from typing import Optional
+
+from ..Piece import TPiece
+from ..Tile import Tile
+
+
+class UndoRecord:
+    """
+    Everything Board.unmakeMove() needs to reverse Board.makeMove().
+    """
+
+    __slots__ = (
+        "piece",
+        "capturedPiece",
+        "oldSpace",
+        "newSpace",
+        "timesMoved",
+        "claimedPieces",
+        "wasOnHomeSpace",
+        "capturedWasOnHomeSpace",
+    )
+
+    def __init__(self, **kwargs):
+        self.piece: TPiece = kwargs["piece"]
+        self.capturedPiece: Optional[TPiece] = kwargs["capturedPiece"]
+        self.oldSpace: Tile = kwargs["oldSpace"]
+        self.newSpace: Tile = kwargs["newSpace"]
+        self.timesMoved: int = kwargs["timesMoved"]
+        self.claimedPieces: int = kwargs["claimedPieces"]
+        self.wasOnHomeSpace: bool = kwargs["wasOnHomeSpace"]
+        self.capturedWasOnHomeSpace: bool = kwargs["capturedWasOnHomeSpace"]
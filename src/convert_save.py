@@ -0,0 +1,43 @@
+"""
+Convert .cfg saves to the binary save format.
+
+Saves written before the binary format are .cfg files. The game still loads
+them, but converting once makes loading them fast. Each converted save is
+written next to the .cfg file, with the binary save's extension, unless an
+output file is given for a single save.
+
+Run from the src directory:
+
+    python convert_save.py ../save_examples/*.cfg
+"""
+
+import argparse
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from chess.constants.constants import SAVE_FILE
+from chess.SaveFile import readSaveFile, writeSaveFile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("saves", nargs="+", help=".cfg save files")
+    parser.add_argument("--output", help="binary save file, for a single save")
+    args = parser.parse_args()
+    if args.output is not None and len(args.saves) > 1:
+        parser.error("--output needs a single save")
+
+    extension = os.path.splitext(SAVE_FILE)[1]
+    for fileName in args.saves:
+        outputFileName = args.output or os.path.splitext(fileName)[0] + extension
+        saveData = readSaveFile(fileName)
+        writeSaveFile(outputFileName, saveData)
+        print(
+            f"{fileName} -> {outputFileName}: {len(saveData.pieces)} pieces, "
+            f"{len(saveData.moves)} moves, {os.path.getsize(outputFileName)} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
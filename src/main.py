@@ -1,3 +1,5 @@
+from multiprocessing import freeze_support
+
 from chess.State import InitialiseState, StartScreenState
 
 
@@ -15,4 +17,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # lets the worker pool start processes from a pyinstaller executable
+    freeze_support()
     main()
@@ -0,0 +1,174 @@
+"""
+Headless perft benchmark and move generation regression check.
+
+Counts the legal move tree of the standard start, the knights only start and
+every save file in save_examples/ to the given depth, then compares the node
+counts and nodes per second against a baseline JSON file. Exits with status 1
+if any count changed or throughput at the deepest depth of a board dropped by
+more than the tolerance. Nodes per second depend on the machine, so record
+the baseline on the machine the check runs on.
+
+Run from the src directory:
+
+    python perft.py                     compare against the baseline
+    python perft.py --update-baseline   record a new baseline
+    python perft.py --divide standard   print the count below every move
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+from chess.Board import Board
+from chess.BoardBuilder import StandardBoardBuilder
+from chess.Director import Director
+from chess.Perft import Perft
+
+DEFAULT_BASELINE = "perft_baseline.json"
+SAVE_EXAMPLES_DIR = os.path.join("..", "save_examples")
+# searches with fewer nodes finish too fast to time reliably
+MIN_TIMED_NODES = 1000
+
+
+def createBoards(depth: int) -> dict[str, tuple[Board, int]]:
+    """
+    Build every board perft is run on, keyed by name, with the depth to search
+    it to. The knights only board is one ply shallower as it branches so much.
+    """
+    director = Director()
+    builders = {
+        "standard": (director.createNewStandardBoardFromConfig, depth),
+        "knights": (director.createNewStandardBoardWithKnightsOnly, depth - 1),
+    }
+    for fileName in sorted(glob.glob(os.path.join(SAVE_EXAMPLES_DIR, "*.cfg"))):
+        name = f"save_examples/{os.path.basename(fileName)}"
+        builders[name] = (
+            lambda boardBuilder, fileName=fileName: (
+                director.createStandardBoardFromSaveData(boardBuilder, fileName)
+            ),
+            depth,
+        )
+
+    boards = {}
+    for name, (create, boardDepth) in builders.items():
+        boardBuilder = StandardBoardBuilder()
+        # the director reports every board it creates
+        with contextlib.redirect_stdout(io.StringIO()):
+            create(boardBuilder)
+        boards[name] = (boardBuilder.getBoard(), max(boardDepth, 1))
+    return boards
+
+
+def runPerft(boards: dict[str, tuple[Board, int]]) -> dict:
+    results = {}
+    for name, (board, depth) in boards.items():
+        perft = Perft(board.position)
+        team = board.getCurrentPlayer().getTeam()
+        results[name] = {}
+        for currentDepth in range(1, depth + 1):
+            measurement = perft.measure(team, currentDepth)
+            results[name][str(currentDepth)] = {
+                "nodes": measurement["nodes"],
+                "nodesPerSecond": round(measurement["nodesPerSecond"]),
+            }
+            print(
+                f"{name:<50} depth {currentDepth}  "
+                f"nodes {measurement['nodes']:>10}  "
+                f"nodes/s {measurement['nodesPerSecond']:>10.0f}"
+            )
+    return results
+
+
+def compareToBaseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Return a description of every node count change and throughput regression.
+    Throughput is only compared at the deepest depth of each board, as the
+    shallow ones take microseconds and their nodes per second are noise.
+    """
+    failures = []
+    for name, depths in baseline.items():
+        comparedDepths = [depth for depth in depths if depth in results.get(name, {})]
+        for depth in comparedDepths:
+            actual, expected = results[name][depth], depths[depth]
+            if actual["nodes"] != expected["nodes"]:
+                failures.append(
+                    f"{name} depth {depth}: nodes {actual['nodes']}, "
+                    f"expected {expected['nodes']}"
+                )
+        if not comparedDepths:
+            continue
+        depth = max(comparedDepths, key=int)
+        actual, expected = results[name][depth], depths[depth]
+        if actual["nodes"] < MIN_TIMED_NODES:
+            continue
+        minimumSpeed = expected["nodesPerSecond"] * (1 - tolerance)
+        if actual["nodesPerSecond"] < minimumSpeed:
+            failures.append(
+                f"{name} depth {depth}: {actual['nodesPerSecond']} nodes/s, "
+                f"baseline {expected['nodesPerSecond']} nodes/s"
+            )
+    return failures
+
+
+def divide(boards: dict[str, tuple[Board, int]], name: str):
+    if name not in boards:
+        print(f"no board called {name}, choose from: {', '.join(boards)}")
+        sys.exit(1)
+    board, depth = boards[name]
+    team = board.getCurrentPlayer().getTeam()
+    counts = Perft(board.position).divide(team, depth)
+    for (fromNumber, toNumber), nodes in sorted(counts.items()):
+        print(f"{fromNumber:>3} -> {toNumber:>3}: {nodes}")
+    print(f"moves {len(counts)}  nodes {sum(counts.values())}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="fraction of baseline nodes/s that may be lost before failing",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--divide", metavar="BOARD")
+    args = parser.parse_args()
+
+    pg.init()
+    boards = createBoards(args.depth)
+
+    if args.divide is not None:
+        divide(boards, args.divide)
+        return
+
+    results = runPerft(boards)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as baselineFile:
+            json.dump(results, baselineFile, indent=4)
+        print(f"baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline) as baselineFile:
+        baseline = json.load(baselineFile)
+    failures = compareToBaseline(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("perft matches baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Generate endgame tablebases by retrograde analysis.
+
+Solves pawnless material sets, written like KRvK or KNNvKN, for the board sizes
+the game is played on, along with every smaller set they can capture down to.
+Tables already on disk are reused. Positions are classified, and the results
+spread back through un-moves, in parallel across worker processes.
+
+Each position is stored once up to the board's symmetries, but tables still
+grow about a hundredfold per piece on 10x10. Material sets whose table would
+hold more than --max-positions positions are refused: pure Python solves a few
+thousand positions per second per worker, and solving needs three bytes of
+memory per position. Four pieces are practical on both boards, five pieces on
+8x8 with many workers, and five pieces on 10x10 (over a billion positions) are
+out of reach.
+
+Run from the src directory:
+
+    python tablebase.py KQvK KRvK --tiles 64 --workers 4
+"""
+
+import argparse
+import os
+from multiprocessing import cpu_count
+from time import perf_counter
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from chess.constants.constants import TABLEBASE_DIR
+from chess.Tablebase import TablebaseGenerator
+
+# largest table solved unless --max-positions says otherwise, about 2 hours on
+# 8 workers
+MAX_POSITIONS = 200_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("material", nargs="+", help="material set, such as KRvK")
+    parser.add_argument(
+        "--tiles",
+        type=int,
+        choices=(64, 100),
+        action="append",
+        help="board size in tiles, default: 64 and 100",
+    )
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    parser.add_argument("--directory", default=TABLEBASE_DIR)
+    parser.add_argument(
+        "--max-positions",
+        type=int,
+        default=MAX_POSITIONS,
+        help="largest table to solve, in positions",
+    )
+    args = parser.parse_args()
+
+    for numberOfTiles in args.tiles or [64, 100]:
+        sideLength = int(numberOfTiles**0.5)
+        generator = TablebaseGenerator(sideLength, args.directory, args.workers)
+        for materialName in args.material:
+            try:
+                size = generator.getTableSize(materialName)
+            except ValueError as error:
+                parser.error(str(error))
+            if size > args.max_positions:
+                print(
+                    f"{numberOfTiles} tiles: {materialName} has {size:,} positions, "
+                    f"more than --max-positions {args.max_positions:,}, skipped"
+                )
+                continue
+            start = perf_counter()
+            generated = generator.generate(materialName)
+            seconds = perf_counter() - start
+            if generated:
+                print(
+                    f"{numberOfTiles} tiles: solved {', '.join(generated)} "
+                    f"in {seconds:.1f}s"
+                )
+            else:
+                print(f"{numberOfTiles} tiles: {materialName} already on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Headless self-play tournament between two engine configurations.
+
+Plays games on the standard and knights only setups across a pool of worker
+processes. The engines are deterministic, so every game starts with a few
+random plies, and each of these openings is played twice with the colours
+swapped. Openings reaching the same position are not used twice. Every
+finished game is appended to a JSON lines results file as it comes in, and the
+win/draw/loss record of the first engine is summarised with 95% confidence
+intervals at the end.
+
+Run from the src directory:
+
+    python tournament.py --engine deep:200 --engine shallow:200:2 --games 500
+"""
+
+import argparse
+import json
+import os
+from multiprocessing import Pool, cpu_count
+from time import perf_counter
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from chess.SelfPlay import (
+    OPENING_PLIES,
+    SETUPS,
+    EngineConfig,
+    createOpenings,
+    playGameFromArguments,
+    summariseResults,
+)
+
+
+def formatInterval(interval: tuple[float, float], scale: float = 100) -> str:
+    return f"[{interval[0] * scale:.1f}, {interval[1] * scale:.1f}]"
+
+
+def printSummary(title: str, summary: dict, engineName: str):
+    print(f"{title}: {summary['games']} games from {summary['openings']} openings")
+    if summary["games"] == 0:
+        return
+    print(
+        f"  {engineName} +{summary['wins']} ={summary['draws']} "
+        f"-{summary['losses']}"
+    )
+    for outcome, countKey in (("win", "wins"), ("draw", "draws"), ("loss", "losses")):
+        rate = summary[countKey] / summary["games"]
+        print(
+            f"  {outcome:<5} {rate * 100:5.1f}% "
+            f"95% CI {formatInterval(summary[f'{outcome}Rate'])}"
+        )
+    print(
+        f"  score {summary['score'] * 100:.1f}% "
+        f"95% CI {formatInterval(summary['scoreInterval'])}"
+    )
+    print(
+        f"  elo {summary['elo']:+.0f} "
+        f"95% CI {formatInterval(summary['eloInterval'], scale=1)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--engine",
+        action="append",
+        metavar="NAME:TIME_MS[:DEPTH]",
+        help="engine configuration, given twice",
+    )
+    parser.add_argument(
+        "--games", type=int, default=100, help="games per setup, an even number"
+    )
+    parser.add_argument(
+        "--opening-plies",
+        type=int,
+        default=OPENING_PLIES,
+        help="random plies at the start of every game",
+    )
+    parser.add_argument(
+        "--setup", action="append", choices=list(SETUPS), help="default: all setups"
+    )
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--results", default="tournament_results.jsonl")
+    args = parser.parse_args()
+
+    engineStrings = args.engine or ["deep:100", "shallow:100:2"]
+    if len(engineStrings) != 2:
+        parser.error("exactly two --engine configurations are needed")
+    firstEngine, secondEngine = [
+        EngineConfig.fromString(engineString) for engineString in engineStrings
+    ]
+    if firstEngine.name == secondEngine.name:
+        parser.error("engine configurations need different names")
+    if args.games % 2 != 0:
+        parser.error("--games must be even, each opening is played twice")
+    setups = args.setup or list(SETUPS)
+
+    games = []
+    for setup in setups:
+        try:
+            openings = createOpenings(setup, args.games // 2, args.opening_plies)
+        except ValueError as error:
+            parser.error(str(error))
+        for openingNumber, opening in openings:
+            # both engines play each opening as white, so neither gets the better
+            # side of a lopsided opening
+            for white, black in (
+                (firstEngine, secondEngine),
+                (secondEngine, firstEngine),
+            ):
+                games.append(
+                    (
+                        len(games),
+                        setup,
+                        white,
+                        black,
+                        args.max_plies,
+                        openingNumber,
+                        opening,
+                    )
+                )
+
+    print(
+        f"playing {len(games)} games of {firstEngine.name} against "
+        f"{secondEngine.name} on {args.workers} workers"
+    )
+    gameRecords = []
+    start = perf_counter()
+    with open(args.results, "w") as resultsFile, Pool(args.workers) as pool:
+        for gameRecord in pool.imap_unordered(playGameFromArguments, games):
+            resultsFile.write(json.dumps(gameRecord) + "\n")
+            resultsFile.flush()
+            gameRecords.append(gameRecord)
+            print(
+                f"game {len(gameRecords)}/{len(games)} {gameRecord['setup']} "
+                f"{gameRecord['white']} - {gameRecord['black']} "
+                f"{gameRecord['result']} ({gameRecord['reason']}, "
+                f"{gameRecord['plies']} plies)"
+            )
+    minutes = (perf_counter() - start) / 60
+
+    print()
+    for setup in setups:
+        printSummary(
+            setup,
+            summariseResults(
+                [record for record in gameRecords if record["setup"] == setup],
+                firstEngine.name,
+            ),
+            firstEngine.name,
+        )
+    printSummary(
+        "all", summariseResults(gameRecords, firstEngine.name), firstEngine.name
+    )
+    print(f"{len(gameRecords) / minutes:.1f} games per minute")
+    print(f"results written to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Tune the engine's evaluation to recorded games, Texel style.
+
+Reads the JSON lines game records written by tournament.py, collects their
+quiet positions and fits piece values and piece-square tables for every board
+size found. The results are written to the parameter file the game and the
+engine load at startup. Existing parameters are the starting point, so tuning
+can be repeated as more games are played.
+
+Run from the src directory:
+
+    python tune.py tournament_results.jsonl --iterations 2000
+"""
+
+import argparse
+import json
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from chess.constants.constants import EVALUATION_PARAMETERS_FILE
+from chess.EvaluationParameters import EvaluationParameters
+from chess.Tuner import TexelTuner, extractQuietPositions
+
+
+def readGameRecords(fileNames: list[str]) -> list[dict]:
+    gameRecords = []
+    for fileName in fileNames:
+        with open(fileName, "r") as resultsFile:
+            gameRecords += [json.loads(line) for line in resultsFile if line.strip()]
+    return gameRecords
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("results", nargs="+", help="tournament results files")
+    parser.add_argument("--output", default=EVALUATION_PARAMETERS_FILE)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--learning-rate", type=float, default=1.0)
+    parser.add_argument("--regularisation", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    gameRecords = readGameRecords(args.results)
+    positions = extractQuietPositions(gameRecords)
+    print(f"read {len(gameRecords)} games")
+
+    parameters = EvaluationParameters(args.output)
+    parameters.load()
+    for sideLength, (codes, results) in sorted(positions.items()):
+        if results.min() == results.max():
+            print(f"{sideLength}x{sideLength}: every game has the same result, skipped")
+            continue
+        tuner = TexelTuner(sideLength, codes, results, parameters, args.regularisation)
+        scalingConstant = tuner.fitScalingConstant()
+        startingError = tuner.getError()
+        error = tuner.tune(args.iterations, args.learning_rate)
+        print(
+            f"{sideLength}x{sideLength}: {len(results)} quiet positions, "
+            f"K {scalingConstant:.3f}, error {startingError:.5f} -> {error:.5f}"
+        )
+        print(f"  piece values {tuner.getPieceValues()}")
+        parameters.setParameters(
+            sideLength, tuner.getPieceValues(), tuner.getPieceSquareTables()
+        )
+
+    parameters.save()
+    print(f"parameters written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()